@@ -0,0 +1,74 @@
+from collections import Counter
+
+from modules.risk import UNRESOLVED_OWNER_NAMES
+
+PRIORITY_LIMIT = 25
+REPORTED_FIELDS = ("risk", "carrier", "geo", "owner")
+
+
+def owner_resolved(result):
+    owner = result.get("owner") or {}
+    return str(owner.get("name", "Unknown")).strip().lower() not in UNRESOLVED_OWNER_NAMES
+
+
+def owner_circuit_skipped(result):
+    return bool((result.get("owner") or {}).get("circuit_skipped"))
+
+
+def _priority_entry(result):
+    return {
+        "number": result.get("number", "Unknown"),
+        "carrier": result.get("carrier", "Unknown"),
+        "owner": (result.get("owner") or {}).get("name", "Unknown"),
+    }
+
+
+class DatasetAggregates:
+    def __init__(self, results=None):
+        self.clear()
+        for result in results or ():
+            self.add(result)
+
+    def __len__(self):
+        return self.total
+
+    def covers(self, name):
+        # A field left out by every row's field selection was never computed,
+        # so reports skip it instead of showing it as Unknown.
+        return not self.total or self.fields[name] > 0
+
+    def clear(self):
+        self.total = 0
+        self.fields = Counter()
+        self.risks = Counter()
+        self.carriers = Counter()
+        self.countries = Counter()
+        self.owner_resolved = 0
+        self.circuit_skipped = 0
+        self.priority = []
+
+    def add(self, result):
+        self.total += 1
+        self.fields.update(name for name in REPORTED_FIELDS if name in result)
+        if "risk" in result:
+            self.risks[str(result.get("risk", "Unknown"))] += 1
+        if "carrier" in result:
+            self.carriers[str(result.get("carrier", "Unknown"))] += 1
+        if "geo" in result:
+            self.countries[str((result.get("geo") or {}).get("Country", "Unknown"))] += 1
+        if "owner" in result:
+            if owner_resolved(result):
+                self.owner_resolved += 1
+            if owner_circuit_skipped(result):
+                self.circuit_skipped += 1
+        if result.get("risk") == "High" and len(self.priority) < PRIORITY_LIMIT:
+            self.priority.append(_priority_entry(result))
+
+
+def aggregate_results(results):
+    if isinstance(results, DatasetAggregates):
+        return results
+    maintained = getattr(results, "aggregates", None)
+    if isinstance(maintained, DatasetAggregates):
+        return maintained
+    return DatasetAggregates(results)
@@ -0,0 +1,165 @@
+import bz2
+import csv
+import gzip
+import io
+import lzma
+import os
+import sys
+from collections import deque
+from itertools import chain
+
+DEDUPE_WINDOW = 1000000
+READ_CHUNK = 1 << 16
+NUMBER_HEADERS = ("number", "phone", "phone_number", "msisdn", "e164", "mobile", "tel")
+DELIMITERS = {".csv": ",", ".tsv": "\t", ".tab": "\t"}
+COMPRESSED = (
+    (b"\x1f\x8b", ".gz", lambda stream: gzip.GzipFile(fileobj=stream)),
+    (b"BZh", ".bz2", bz2.BZ2File),
+    (b"\xfd7zXZ\x00", ".xz", lzma.LZMAFile),
+)
+
+
+class BulkInputError(ValueError):
+    pass
+
+
+class _CountingReader(io.RawIOBase):
+    def __init__(self, raw):
+        self._readinto = getattr(raw, "readinto1", None) or raw.readinto
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = self._readinto(buffer)
+        self.count += size or 0
+        return size
+
+
+def _decompressor(buffered):
+    head = buffered.peek(8)[:8]
+    for magic, extension, opener in COMPRESSED:
+        if head.startswith(magic):
+            return opener(buffered), extension
+    return buffered, None
+
+
+class BulkInput:
+    def __init__(self, path, column=None):
+        self.path = str(path)
+        self.column = str(column).strip() if column else None
+        self.error = None
+        self._owned = None
+
+        if self.path == "-":
+            raw = sys.stdin.buffer
+            self.size = None
+        else:
+            raw = self._owned = open(self.path, "rb", buffering=0)
+            self.size = os.fstat(raw.fileno()).st_size
+
+        # Counting below the decompressor keeps progress in bytes of the
+        # file on disk, which is what `size` measures.
+        self._counter = _CountingReader(raw)
+        buffered = io.BufferedReader(self._counter, READ_CHUNK)
+        stream, extension = _decompressor(buffered)
+        name = self.path.lower()
+        if extension and name.endswith(extension):
+            name = name[: -len(extension)]
+        self.delimiter = DELIMITERS.get(os.path.splitext(name)[1])
+        self._text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+
+    @property
+    def bytes_read(self):
+        return self._counter.count
+
+    def progress_label(self):
+        read = self.bytes_read / 1048576
+        if not self.size:
+            return f"{read:.1f} MB read"
+        return f"{read:.1f}/{self.size / 1048576:.1f} MB read"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        if self._owned is not None:
+            self._text.close()
+            self._owned.close()
+
+    def __iter__(self):
+        try:
+            if self.delimiter is None and self.column is None:
+                yield from self._lines()
+            else:
+                yield from self._cells()
+        except (OSError, EOFError, lzma.LZMAError, csv.Error, BulkInputError) as exc:
+            # Truncated or corrupt input ends the stream; numbers read so far
+            # are still scanned and the caller reports the error.
+            self.error = str(exc) or type(exc).__name__
+
+    def _lines(self):
+        for line in self._text:
+            number = line.strip()
+            if number:
+                yield number
+
+    def _cells(self):
+        first = self._text.readline()
+        if not first:
+            return
+        delimiter = self.delimiter or ("\t" if "\t" in first else ",")
+        rows = csv.reader(chain([first], self._text), delimiter=delimiter)
+        header = next(rows)
+        index = self._column_index(header)
+        if index < len(header) and any(char.isdigit() for char in header[index]):
+            rows = chain([header], rows)
+
+        for row in rows:
+            if index < len(row):
+                number = row[index].strip()
+                if number:
+                    yield number
+
+    def _column_index(self, header):
+        names = [cell.strip().lower() for cell in header]
+        if self.column is None:
+            for name in NUMBER_HEADERS:
+                if name in names:
+                    return names.index(name)
+            return 0
+        if self.column.isdigit() and int(self.column) > 0:
+            return int(self.column) - 1
+        if self.column.lower() in names:
+            return names.index(self.column.lower())
+        raise BulkInputError(f"Column '{self.column}' not found in header of {self.path}.")
+
+
+def peek_numbers(numbers):
+    numbers = iter(numbers)
+    first = next(numbers, None)
+    if first is None:
+        return None
+    return chain([first], numbers)
+
+
+def dedupe_numbers(numbers, stats, window=DEDUPE_WINDOW):
+    # Keys past the window are forgotten oldest first, so memory stays
+    # bounded on huge inputs; repeats that far apart fall through to the
+    # scan cache instead of being dropped here.
+    seen = set()
+    order = deque()
+    for number in numbers:
+        key = number.strip()
+        if key in seen:
+            stats["removed"] += 1
+            continue
+        seen.add(key)
+        order.append(key)
+        if len(order) > window:
+            seen.discard(order.popleft())
+        yield number
@@ -1,12 +1,25 @@
-from collections import Counter
+import heapq
+import json
+from pathlib import Path
 
-RISK_ORDER = {"High": 3, "Medium": 2, "Low": 1}
+from core.aggregates import aggregate_results
+from core.number_history import diff_snapshots, snapshot
+from core.query import is_structured_query, query_count, query_rows
+from core.result_store import ResultStore, ResultView
+from modules.risk import triage_score
 
 
 def search_results(results, query, limit=25):
     needle = str(query or "").strip().lower()
     if not needle:
         return []
+    if is_structured_query(query):
+        if isinstance(results, ResultView):
+            return [results.row(index) for index in query_rows(results, query, limit)]
+        results = list(results)
+        return [results[index] for index in query_rows(ResultStore(results), query, limit)]
+    if isinstance(results, ResultView):
+        return _search_store(results, needle, limit)
 
     matched = []
     for item in results:
@@ -26,28 +39,44 @@ def search_results(results, query, limit=25):
     return matched
 
 
-def top_risks(results, limit=10):
-    scored = []
-    for item in results:
-        risk = str(item.get("risk", "Low"))
-        base_score = RISK_ORDER.get(risk, 0) * 100
+def _search_store(store, needle, limit):
+    return [store.row(index) for index in store.search(needle, limit)]
 
-        owner = item.get("owner") or {}
-        owner_name = str(owner.get("name", "Unknown")).strip().lower()
-        if owner_name in {"unknown", "lookup disabled", ""}:
-            base_score += 20
 
-        carrier = str(item.get("carrier", ""))
-        if carrier.lower() == "unknown":
-            base_score += 15
+def count_results(results, query):
+    needle = str(query or "").strip().lower()
+    if not needle:
+        return 0
+    if not isinstance(results, ResultView):
+        results = ResultStore(results)
+    if is_structured_query(query):
+        return query_count(results, query)
+    return len(results.search(needle))
+
+
+def iter_result_file(path):
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".jsonl":
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(handle)
+    if not isinstance(data, list):
+        raise ValueError(f"{path} does not contain a list of results.")
+    yield from data
 
-        if item.get("voip"):
-            base_score += 20
 
-        scored.append((base_score, item))
+def top_risks(results, limit=10):
+    limit = max(1, int(limit))
+    if isinstance(results, ResultView):
+        return [results.row(index) for index in results.top(limit)]
 
-    scored.sort(key=lambda pair: pair[0], reverse=True)
-    return [item for _, item in scored[: max(1, int(limit))]]
+    # A bounded heap keeps memory at O(limit) for streamed input, and
+    # nlargest is stable, so equal scores keep their input order.
+    scored = ((triage_score(item), item) for item in results)
+    return [item for _, item in heapq.nlargest(limit, scored, key=lambda pair: pair[0])]
 
 
 def diff_number_history(results, number):
@@ -55,31 +84,14 @@ def diff_number_history(results, number):
     if not target:
         return None
 
-    history = [item for item in results if str(item.get("number", "")).strip() == target]
+    if isinstance(results, ResultView):
+        history = [results.row(index) for index in reversed(results.recent_rows(target))]
+    else:
+        history = [item for item in results if str(item.get("number", "")).strip() == target]
     if len(history) < 2:
         return None
 
-    previous = history[-2]
-    current = history[-1]
-
-    changes = {}
-    keys = ["carrier", "line_type", "risk", "voip"]
-    for key in keys:
-        old = previous.get(key)
-        new = current.get(key)
-        if old != new:
-            changes[key] = {"old": old, "new": new}
-
-    old_owner = (previous.get("owner") or {}).get("name")
-    new_owner = (current.get("owner") or {}).get("name")
-    if old_owner != new_owner:
-        changes["owner.name"] = {"old": old_owner, "new": new_owner}
-
-    old_country = (previous.get("geo") or {}).get("Country")
-    new_country = (current.get("geo") or {}).get("Country")
-    if old_country != new_country:
-        changes["geo.Country"] = {"old": old_country, "new": new_country}
-
+    changes = diff_snapshots(snapshot(history[-2]), snapshot(history[-1]))
     return {
         "number": target,
         "changed": bool(changes),
@@ -88,9 +100,8 @@ def diff_number_history(results, number):
 
 
 def quick_distribution(results):
-    risks = Counter(str(item.get("risk", "Unknown")) for item in results)
-    countries = Counter(str((item.get("geo") or {}).get("Country", "Unknown")) for item in results)
+    aggregates = aggregate_results(results)
     return {
-        "risks": dict(risks),
-        "countries": dict(countries),
+        "risks": dict(aggregates.risks),
+        "countries": dict(aggregates.countries),
     }
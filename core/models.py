@@ -1,4 +1,4 @@
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 
 
 @dataclass
@@ -13,6 +13,11 @@ class ScanResult:
     owner: dict[str, object]
     reputation: dict[str, str]
     osint: dict[str, str]
+    fields: tuple[str, ...] | None = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> dict[str, object]:
-        return asdict(self)
+        payload = asdict(self)
+        selected = payload.pop("fields")
+        if selected is None:
+            return payload
+        return {key: value for key, value in payload.items() if key == "number" or key in selected}
@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import phonenumbers
+from phonenumbers import NumberParseException, PhoneNumberFormat, format_number
+
+from utils.sqlite_store import SQLiteConnections
+
+DEFAULT_HISTORY_PATH = os.environ.get("NUMBREACHER_HISTORY", "output/number_history.sqlite3")
+FLUSH_BATCH = 256
+TRACKED_FIELDS = ("carrier", "line_type", "risk", "voip", "owner.name", "geo.Country")
+TIMELINE_FIELDS = ("carrier", "risk", "line_type", "owner.name")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS number_history (
+    number TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    recorded REAL NOT NULL,
+    snapshot TEXT NOT NULL,
+    PRIMARY KEY (number, seq)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_number(result):
+    e164 = (result.get("formats") or {}).get("E164")
+    if e164:
+        return e164
+    number = str(result.get("number") or "").strip()
+    try:
+        return format_number(phonenumbers.parse(number), PhoneNumberFormat.E164)
+    except NumberParseException:
+        return number
+
+
+def snapshot(result):
+    # Partial scans only carry the fields they computed, so absent fields
+    # are left out rather than recorded as None.
+    values = {}
+    for key in ("carrier", "line_type", "risk", "voip"):
+        if key in result:
+            values[key] = result[key]
+    if "owner" in result:
+        values["owner.name"] = (result.get("owner") or {}).get("name")
+    if "geo" in result:
+        values["geo.Country"] = (result.get("geo") or {}).get("Country")
+    return values
+
+
+def diff_snapshots(previous, current, fields=TRACKED_FIELDS):
+    changes = {}
+    for key in fields:
+        if key in previous and key in current and previous[key] != current[key]:
+            changes[key] = {"old": previous[key], "new": current[key]}
+    return changes
+
+
+class NumberHistory:
+    def __init__(self, path=DEFAULT_HISTORY_PATH, enabled=True):
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(path, SCHEMA)
+        self._pending = []
+        self.enabled = bool(enabled)
+
+    @property
+    def path(self):
+        return self._db.path
+
+    def configure(self, path=None, enabled=None):
+        self.flush()
+        with self._lock:
+            if path is not None:
+                self._db.set_path(path)
+            if enabled is not None:
+                self.enabled = bool(enabled)
+
+    def record(self, result, recorded=None):
+        if not self.enabled:
+            return
+        entry = (
+            normalize_number(result),
+            time.time() if recorded is None else recorded,
+            json.dumps(snapshot(result)),
+        )
+        with self._lock:
+            self._pending.append(entry)
+            due = len(self._pending) >= FLUSH_BATCH
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        connection = self._db.connection()
+        # IMMEDIATE takes the write lock before reading the next sequence
+        # number, so two sessions cannot claim the same point.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for number, recorded, payload in pending:
+                (last,) = connection.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM number_history WHERE number = ?",
+                    (number,),
+                ).fetchone()
+                connection.execute(
+                    "INSERT INTO number_history (number, seq, recorded, snapshot) "
+                    "VALUES (?, ?, ?, ?)",
+                    (number, last + 1, recorded, payload),
+                )
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+        return len(pending)
+
+    def count(self, number):
+        self.flush()
+        (total,) = self._db.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM number_history WHERE number = ?",
+            (number,),
+        ).fetchone()
+        return total
+
+    def point(self, number, position):
+        total = self.count(number)
+        seq = total + position + 1 if position < 0 else position
+        if not 1 <= seq <= total:
+            return None
+        recorded, payload = self._db.execute(
+            "SELECT recorded, snapshot FROM number_history WHERE number = ? AND seq = ?",
+            (number, seq),
+        ).fetchone()
+        return {"seq": seq, "recorded": recorded, "snapshot": json.loads(payload)}
+
+    def diff(self, number, old=-2, new=-1):
+        previous = self.point(number, old)
+        current = self.point(number, new)
+        if previous is None or current is None:
+            return None
+        changes = diff_snapshots(previous["snapshot"], current["snapshot"])
+        return {
+            "number": number,
+            "old": previous,
+            "new": current,
+            "changed": bool(changes),
+            "changes": changes,
+        }
+
+    def timeline(self, number, fields=TIMELINE_FIELDS):
+        self.flush()
+        rows = self._db.execute(
+            "SELECT seq, recorded, snapshot FROM number_history WHERE number = ? ORDER BY seq",
+            (number,),
+        )
+        events = []
+        state = {}
+        for seq, recorded, payload in rows:
+            current = json.loads(payload)
+            changes = diff_snapshots(state, current, fields)
+            if not events or changes:
+                events.append(
+                    {
+                        "seq": seq,
+                        "recorded": recorded,
+                        "snapshot": current,
+                        "changes": changes,
+                    }
+                )
+            state.update(current)
+        return events
+
+    def purge(self):
+        with self._lock:
+            self._pending = []
+        return self._db.execute("DELETE FROM number_history", commit=True).rowcount
+
+    def stats(self):
+        self.flush()
+        points, numbers = self._db.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT number) FROM number_history"
+        ).fetchone()
+        return {"path": self.path, "points": points, "numbers": numbers}
+
+
+NUMBER_HISTORY = NumberHistory()
@@ -0,0 +1,220 @@
+import shlex
+from fnmatch import fnmatchcase
+
+QUERY_FIELDS = {
+    "risk": "risk",
+    "carrier": "carrier",
+    "line_type": "line_type",
+    "line": "line_type",
+    "country": "country",
+    "region": "region",
+    "timezone": "timezone",
+    "tz": "timezone",
+    "owner": "owner_name",
+    "confidence": "owner_confidence",
+    "voip": "voip",
+    "number": "number",
+}
+KEYWORDS = {"AND", "OR", "NOT"}
+TRUE_VALUES = {"true", "yes", "on", "1"}
+FALSE_VALUES = {"false", "no", "off", "0"}
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _tokens(text):
+    lexer = shlex.shlex(text, posix=True, punctuation_chars="()")
+    lexer.whitespace_split = True
+    try:
+        return list(lexer)
+    except ValueError as exc:
+        raise QueryError(f"Query error: {exc}") from exc
+
+
+def _field_token(token):
+    name, separator, value = token.lstrip("-").partition(":")
+    if separator and name.lower() in QUERY_FIELDS:
+        return QUERY_FIELDS[name.lower()], value
+    return None
+
+
+def is_structured_query(text):
+    try:
+        tokens = _tokens(str(text or ""))
+    except QueryError:
+        return False
+    # Parentheses alone are ordinary text, e.g. "acme (uk)"; only a field
+    # term or a boolean keyword switches a search to query syntax.
+    return any(token in KEYWORDS or _field_token(token) is not None for token in tokens)
+
+
+def parse_query(text):
+    tokens = _tokens(str(text or ""))
+    if not tokens:
+        raise QueryError("Query error: empty query.")
+
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == "OR":
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nodes = [parse_unary()]
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            nodes.append(parse_unary())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_unary():
+        token = peek()
+        if token is None or token in {"AND", "OR", ")"}:
+            raise QueryError(f"Query error: expected a term, got {token or 'end of query'}.")
+        take()
+        if token == "NOT":
+            return ("not", parse_unary())
+        if token == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise QueryError("Query error: missing ')'.")
+            take()
+            return node
+        if token.startswith("-") and len(token) > 1:
+            return ("not", _term(token[1:]))
+        return _term(token)
+
+    node = parse_or()
+    if peek() is not None:
+        raise QueryError(f"Query error: unexpected {peek()}.")
+    return node
+
+
+def _term(token):
+    field = _field_token(token)
+    if field is None:
+        if not token.strip():
+            raise QueryError("Query error: empty search term.")
+        return ("text", token.lower())
+    name, value = field
+    if name == "voip":
+        flag = value.lower()
+        if flag not in TRUE_VALUES | FALSE_VALUES:
+            raise QueryError(f"Query error: voip expects true or false, got '{value}'.")
+        return ("voip", flag in TRUE_VALUES)
+    return ("field", name, value.lower())
+
+
+def _matches(value, pattern):
+    text = str(value or "").lower()
+    if any(char in pattern for char in "*?["):
+        return fnmatchcase(text, pattern)
+    return text == pattern
+
+
+def _rows(store, node, start, stop):
+    kind = node[0]
+    if kind == "text":
+        return set(store.search(node[1])), False
+    if kind == "voip":
+        return set(store.voip_rows(start, stop)), not node[1]
+    if kind == "field":
+        _, name, pattern = node
+        if name == "number":
+            return set(store.number_rows(pattern, start, stop)), False
+        column = store.column(name)
+        codes = {code for code, value in enumerate(column.values) if _matches(value, pattern)}
+        return set(column.positions(codes, start, stop)), False
+    if kind == "not":
+        rows, negated = _rows(store, node[1], start, stop)
+        return rows, not negated
+
+    # Negated sets stay as "everything except", so NOT never builds the
+    # full row universe.
+    results = [_rows(store, child, start, stop) for child in node[1]]
+    rows, negated = results[0]
+    for other, other_negated in results[1:]:
+        if kind == "and":
+            if not negated and not other_negated:
+                rows = rows & other
+            elif not negated:
+                rows = rows - other
+            elif not other_negated:
+                rows, negated = other - rows, False
+            else:
+                rows = rows | other
+        else:
+            if negated and other_negated:
+                rows = rows & other
+            elif negated:
+                rows = rows - other
+            elif other_negated:
+                rows, negated = other - rows, True
+            else:
+                rows = rows | other
+    return rows, negated
+
+
+def query_count(store, text):
+    rows, negated = _rows(store, parse_query(text), *store.bounds())
+    return len(store) - len(rows) if negated else len(rows)
+
+
+def query_rows(store, text, limit=None):
+    start, stop = store.bounds()
+    rows, negated = _rows(store, parse_query(text), start, stop)
+    if not negated:
+        return sorted(rows)[:limit]
+
+    matched = []
+    for index in range(start, stop):
+        if index not in rows:
+            matched.append(index)
+            if limit is not None and len(matched) >= limit:
+                break
+    return matched
+
+
+def _sql(node):
+    kind = node[0]
+    if kind == "text":
+        return "instr(search_text, ?) > 0", [node[1]]
+    if kind == "voip":
+        return "voip = ?", [1 if node[1] else 0]
+    if kind == "field":
+        _, name, pattern = node
+        if name == "number":
+            return "instr(lower(number), ?) > 0", [pattern]
+        if any(char in pattern for char in "*?["):
+            return f"{name} GLOB ?", [pattern.replace("[!", "[^")]
+        return f"{name} = ?", [pattern]
+    if kind == "not":
+        clause, params = _sql(node[1])
+        return f"NOT ({clause})", params
+
+    clauses = []
+    params = []
+    for child in node[1]:
+        clause, child_params = _sql(child)
+        clauses.append(f"({clause})")
+        params.extend(child_params)
+    return f" {kind.upper()} ".join(clauses), params
+
+
+def query_sql(text):
+    # Compiles a query for tables whose filter columns hold the lower-cased
+    # values the in-memory store compares against.
+    return _sql(parse_query(text))
@@ -0,0 +1,259 @@
+import json
+import os
+import threading
+import time
+
+from core.number_history import normalize_number
+from core.query import is_structured_query, query_sql
+from core.result_store import SEARCH_COLUMNS
+from utils.sqlite_store import SQLiteConnections
+
+DEFAULT_ARCHIVE_PATH = os.environ.get("NUMBREACHER_ARCHIVE", "output/results.sqlite3")
+FLUSH_BATCH = 500
+SESSION_LABEL = "interactive"
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+RUN_ABORTED = "aborted"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL NOT NULL,
+    results INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run INTEGER NOT NULL,
+    recorded REAL NOT NULL,
+    number TEXT NOT NULL,
+    e164 TEXT NOT NULL,
+    risk TEXT NOT NULL,
+    carrier TEXT NOT NULL,
+    line_type TEXT NOT NULL,
+    country TEXT NOT NULL,
+    region TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    owner_name TEXT NOT NULL,
+    owner_confidence TEXT NOT NULL,
+    voip INTEGER NOT NULL,
+    search_text TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_run ON results (run, id);
+CREATE INDEX IF NOT EXISTS results_recorded ON results (recorded);
+CREATE INDEX IF NOT EXISTS results_e164 ON results (e164);
+CREATE INDEX IF NOT EXISTS results_risk ON results (risk);
+CREATE INDEX IF NOT EXISTS results_carrier ON results (carrier);
+CREATE INDEX IF NOT EXISTS results_country ON results (country);
+"""
+
+INSERT_RESULT = (
+    "INSERT INTO results (run, recorded, number, e164, risk, carrier, line_type, country, "
+    "region, timezone, owner_name, owner_confidence, voip, search_text, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _text(value):
+    return str(value or "").lower()
+
+
+def archive_row(result):
+    # Filter columns hold the lower-cased text the in-memory query engine
+    # compares against, so equality terms can use the column indexes.
+    geo = result.get("geo") if isinstance(result.get("geo"), dict) else {}
+    owner = result.get("owner") if isinstance(result.get("owner"), dict) else {}
+    values = {
+        "carrier": result.get("carrier"),
+        "risk": result.get("risk"),
+        "country": geo.get("Country"),
+        "region": geo.get("Region"),
+        "owner_name": owner.get("name"),
+    }
+    search_text = " ".join(
+        [_text(result.get("number"))] + [_text(values[name]) for name in SEARCH_COLUMNS]
+    )
+    return (
+        str(result.get("number") or ""),
+        normalize_number(result),
+        _text(result.get("risk")),
+        _text(result.get("carrier")),
+        _text(result.get("line_type")),
+        _text(geo.get("Country")),
+        _text(geo.get("Region")),
+        _text(geo.get("Timezone")),
+        _text(owner.get("name")),
+        _text(owner.get("confidence")),
+        1 if result.get("voip") is True else 0,
+        search_text,
+        json.dumps(result, default=str),
+    )
+
+
+class ResultArchive:
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH, enabled=True):
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(path, SCHEMA)
+        self._pending = []
+        self._run = None
+        self._label = SESSION_LABEL
+        self._status = ""
+        self.enabled = bool(enabled)
+
+    @property
+    def path(self):
+        return self._db.path
+
+    def configure(self, path=None, enabled=None):
+        self.flush()
+        with self._lock:
+            if path is not None:
+                self._db.set_path(path)
+                self._run = None
+            if enabled is not None:
+                self.enabled = bool(enabled)
+
+    def begin_run(self, label, status=RUN_RUNNING):
+        self.flush()
+        with self._lock:
+            self._run = None
+            self._label = str(label)
+            self._status = status
+
+    def end_run(self, status=RUN_COMPLETED):
+        # Runs stay marked running until closed here, so a run interrupted
+        # mid-way is recorded as failed or aborted rather than left open.
+        self.flush()
+        with self._lock:
+            run = self._run
+        if run is not None:
+            self._db.execute("UPDATE runs SET status = ? WHERE id = ?", (status, run), commit=True)
+        self.begin_run(SESSION_LABEL, status="")
+
+    def record(self, result, recorded=None):
+        if not self.enabled:
+            return
+        entry = (time.time() if recorded is None else recorded,) + archive_row(result)
+        with self._lock:
+            self._pending.append(entry)
+            due = len(self._pending) >= FLUSH_BATCH
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            run, label, status = self._run, self._label, self._status
+        if not pending:
+            return 0
+
+        # Runs are created on their first write, so commands that record
+        # nothing leave no empty runs behind.
+        connection = self._db.connection()
+        with connection:
+            if run is None:
+                run = connection.execute(
+                    "INSERT INTO runs (label, started, finished, status) VALUES (?, ?, ?, ?)",
+                    (label, pending[0][0], pending[0][0], status),
+                ).lastrowid
+            connection.executemany(INSERT_RESULT, [(run,) + entry for entry in pending])
+            connection.execute(
+                "UPDATE runs SET results = results + ?, finished = MAX(finished, ?) "
+                "WHERE id = ?",
+                (len(pending), pending[-1][0], run),
+            )
+        with self._lock:
+            if self._run is None and self._label == label:
+                self._run = run
+        return len(pending)
+
+    def runs(self, limit=20):
+        self.flush()
+        rows = self._db.execute(
+            "SELECT id, label, started, finished, results, status FROM runs "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        return [
+            {
+                "id": run,
+                "label": label,
+                "started": started,
+                "finished": finished,
+                "results": count,
+                "status": status,
+            }
+            for run, label, started, finished, count, status in rows
+        ]
+
+    def latest_run(self):
+        self.flush()
+        row = self._db.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def load_run(self, run):
+        self.flush()
+        rows = self._db.execute("SELECT payload FROM results WHERE run = ? ORDER BY id", (run,))
+        for (payload,) in rows:
+            yield json.loads(payload)
+
+    def search(self, query, limit=25):
+        # Matches come back newest first with their run and timestamp.
+        self.flush()
+        if is_structured_query(query):
+            where, params = query_sql(query)
+        else:
+            where, params = "instr(search_text, ?) > 0", [str(query or "").strip().lower()]
+        (total,) = self._db.execute(
+            f"SELECT COUNT(*) FROM results WHERE {where}", params
+        ).fetchone()
+        rows = self._db.execute(
+            f"SELECT run, recorded, payload FROM results WHERE {where} "
+            "ORDER BY id DESC LIMIT ?",
+            params + [limit],
+        )
+        matches = [
+            {"run": run, "recorded": recorded, "result": json.loads(payload)}
+            for run, recorded, payload in rows
+        ]
+        return total, matches
+
+    def prune(self, older_than_days):
+        self.flush()
+        cutoff = time.time() - float(older_than_days) * 86400
+        connection = self._db.connection()
+        with connection:
+            removed = connection.execute(
+                "DELETE FROM results WHERE recorded < ?", (cutoff,)
+            ).rowcount
+            connection.execute(
+                "UPDATE runs SET results = "
+                "(SELECT COUNT(*) FROM results WHERE results.run = runs.id)"
+            )
+            connection.execute("DELETE FROM runs WHERE results = 0")
+            remaining = {run for (run,) in connection.execute("SELECT id FROM runs")}
+        with self._lock:
+            if self._run not in remaining:
+                self._run = None
+        return removed
+
+    def stats(self):
+        self.flush()
+        runs, results, oldest, newest = self._db.execute(
+            "SELECT (SELECT COUNT(*) FROM runs), COUNT(*), MIN(recorded), MAX(recorded) "
+            "FROM results"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "runs": runs,
+            "results": results,
+            "oldest": oldest,
+            "newest": newest,
+        }
+
+
+RESULT_ARCHIVE = ResultArchive()
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import phonenumbers
+from phonenumbers import PhoneNumberFormat, format_number
+
+from config.metadata import VERSION
+from core.models import ScanResult
+from core.scanner import SCANNER_VERSION, scan_number
+from modules.owner_cache import is_cacheable, is_negative
+from modules.owner_osint import OWNER_CACHE
+from utils.sqlite_store import SQLiteConnections
+
+DEFAULT_RESULT_CACHE_PATH = os.environ.get(
+    "NUMBREACHER_RESULT_CACHE", "output/scan_cache.sqlite3"
+)
+DEFAULT_RESULT_TTL = 24 * 3600.0
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_cache (
+    number TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (number, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS scan_cache_expires ON scan_cache (expires);
+"""
+
+
+@lru_cache(maxsize=1)
+def _static_fingerprint():
+    digest = hashlib.sha256()
+    for part in (SCANNER_VERSION, VERSION, phonenumbers.__version__):
+        digest.update(f"{part}\0".encode("utf-8"))
+    for path in sorted(DATA_DIR.glob("*.json")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def scan_fingerprint(enable_owner_lookup=True):
+    seed = f"{_static_fingerprint()}|owner={int(bool(enable_owner_lookup))}"
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+
+def e164_number(parsed):
+    return format_number(parsed, PhoneNumberFormat.E164)
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_RESULT_CACHE_PATH, ttl=DEFAULT_RESULT_TTL, enabled=True):
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(path, SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.configure(ttl=ttl, enabled=enabled)
+
+    @property
+    def path(self):
+        return self._db.path
+
+    def configure(self, path=None, ttl=None, enabled=None):
+        with self._lock:
+            if path is not None:
+                self._db.set_path(path)
+            if ttl is not None:
+                self.ttl = max(0.0, float(ttl))
+            if enabled is not None:
+                self.enabled = bool(enabled)
+
+    def config(self):
+        with self._lock:
+            return {"path": self.path, "ttl": self.ttl, "enabled": self.enabled}
+
+    def get(self, parsed, enable_owner_lookup=True):
+        if not self.enabled:
+            return None
+
+        row = self._db.execute(
+            "SELECT payload FROM scan_cache "
+            "WHERE number = ? AND fingerprint = ? AND expires > ?",
+            (e164_number(parsed), scan_fingerprint(enable_owner_lookup), time.time()),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, parsed, enable_owner_lookup, result):
+        if not self.enabled or self.ttl <= 0:
+            return False
+
+        ttl = self.ttl
+        if enable_owner_lookup:
+            owner = result.get("owner") or {}
+            if not is_cacheable(owner):
+                return False
+            # Never keep a weak owner answer longer than the owner cache would.
+            if is_negative(owner):
+                ttl = min(ttl, OWNER_CACHE.negative_ttl)
+
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO scan_cache "
+            "(number, fingerprint, payload, created, expires) VALUES (?, ?, ?, ?, ?)",
+            (
+                e164_number(parsed),
+                scan_fingerprint(enable_owner_lookup),
+                json.dumps(result),
+                now,
+                now + ttl,
+            ),
+            commit=True,
+        )
+        return True
+
+    def purge(self, expired_only=False):
+        if expired_only:
+            cursor = self._db.execute(
+                "DELETE FROM scan_cache WHERE expires <= ?",
+                (time.time(),),
+                commit=True,
+            )
+        else:
+            cursor = self._db.execute("DELETE FROM scan_cache", commit=True)
+        return cursor.rowcount
+
+    def stats(self):
+        entries, expired = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(CASE WHEN expires <= ? THEN 1 ELSE 0 END), 0) "
+            "FROM scan_cache",
+            (time.time(),),
+        ).fetchone()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "expired": expired,
+            "ttl": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+SCAN_RESULT_CACHE = ResultCache()
+
+
+def configure_result_cache(config):
+    SCAN_RESULT_CACHE.configure(**config)
+
+
+def cached_scan_result(parsed, original_number, enable_owner_lookup=True, fields=None):
+    # Only full results are stored, so a hit satisfies any field selection.
+    cached = SCAN_RESULT_CACHE.get(parsed, enable_owner_lookup)
+    if cached is None:
+        return None
+    cached["number"] = original_number or cached["number"]
+    return ScanResult(**cached, fields=fields)
+
+
+def scan_with_cache(
+    parsed,
+    original_number=None,
+    enable_owner_lookup=True,
+    timings=None,
+    fields=None,
+):
+    cached = cached_scan_result(parsed, original_number, enable_owner_lookup, fields)
+    if cached is not None:
+        return cached, True
+
+    result = scan_number(
+        parsed,
+        original_number=original_number,
+        enable_owner_lookup=enable_owner_lookup,
+        timings=timings,
+        fields=fields,
+    )
+    if fields is None:
+        SCAN_RESULT_CACHE.put(parsed, enable_owner_lookup, result.to_dict())
+    return result, False
@@ -0,0 +1,504 @@
+import copy
+import heapq
+import json
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from itertools import islice
+
+import phonenumbers
+from phonenumbers import COUNTRY_CODE_TO_REGION_CODE
+
+from core.aggregates import DatasetAggregates
+from core.search_index import NgramIndex
+from modules.intel import get_number_formats
+from modules.osint import get_osint_links
+from modules.reputation import get_reputation_links
+from modules.risk import triage_score
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+GEO_COLUMNS = {"Country": "country", "Region": "region", "Timezone": "timezone"}
+FORMAT_KEYS = ("E164", "International", "National", "RFC3966")
+CATEGORICAL_COLUMNS = (
+    "risk",
+    "carrier",
+    "line_type",
+    "country",
+    "region",
+    "timezone",
+    "owner_name",
+    "owner_confidence",
+    "owner",
+)
+SEARCH_COLUMNS = ("carrier", "risk", "country", "region", "owner_name")
+
+_NON_DIGITS = re.compile(r"\D")
+_Digits = namedtuple("_Digits", "country_code national_number")
+
+
+class CategoricalColumn:
+    def __init__(self, postings=True, searchable=False):
+        self._postings = postings
+        self._searchable = searchable
+        self.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.values[self.data[index]]
+
+    def code(self, value):
+        return self._codes.get(value)
+
+    def append(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+            if self.postings is not None:
+                self.postings.append(array("I"))
+            if self.text_index is not None:
+                text = str(value or "").lower()
+                self.texts.append(text)
+                self.text_index.add(code, text)
+        if self.postings is not None:
+            self.postings[code].append(len(self.data))
+        self.data.append(code)
+
+    def rows(self, code, start=0, stop=None):
+        postings = self.postings[code]
+        stop = len(self.data) if stop is None else stop
+        return postings[bisect_left(postings, start) : bisect_left(postings, stop)]
+
+    def search(self, needle):
+        candidates = self.text_index.candidates(needle)
+        if candidates is None:
+            candidates = range(len(self.values))
+        return [code for code in candidates if needle in self.texts[code]]
+
+    def code_counts(self, start=0, stop=None):
+        if np is not None and len(self.data):
+            # frombuffer pins the array until the view is dropped, and a
+            # pinned array cannot grow, so keep the view local.
+            codes = np.frombuffer(self.data, dtype=np.uint32)[start:stop]
+            counts = np.bincount(codes, minlength=len(self.values)).tolist()
+            del codes
+            return dict(enumerate(counts))
+        return Counter(self.data[start:stop])
+
+    def positions(self, codes, start=0, stop=None):
+        if not codes:
+            return []
+        if self.postings is not None:
+            return list(heapq.merge(*(self.rows(code, start, stop) for code in sorted(codes))))
+        if np is not None and len(self.data):
+            view = np.frombuffer(self.data, dtype=np.uint32)[start:stop]
+            hits = (np.flatnonzero(np.isin(view, sorted(codes))) + start).tolist()
+            del view
+            return hits
+        return [
+            index
+            for index, code in enumerate(self.data[start:stop], start)
+            if code in codes
+        ]
+
+    def clear(self):
+        self.values = []
+        self.data = array("I")
+        self._codes = {}
+        self.postings = [] if self._postings else None
+        self.texts = [] if self._searchable else None
+        self.text_index = NgramIndex() if self._searchable else None
+
+
+class ResultView:
+    def __init__(self, store, start=0, stop=None):
+        self._store = store
+        self._start = start
+        self._stop = stop
+
+    def bounds(self):
+        stop = len(self._store._numbers) if self._stop is None else self._stop
+        return self._start, stop
+
+    def __len__(self):
+        start, stop = self.bounds()
+        return max(0, stop - start)
+
+    def __iter__(self):
+        start, stop = self.bounds()
+        for index in range(start, stop):
+            yield self._store.row(index)
+
+    def __getitem__(self, index):
+        start, stop = self.bounds()
+        if isinstance(index, slice):
+            return [self._store.row(position) for position in range(start, stop)[index]]
+        return self._store.row(range(start, stop)[index])
+
+    def window(self, start=0, stop=None):
+        lower, upper = self.bounds()
+        start = min(upper, lower + start)
+        stop = upper if stop is None else min(upper, lower + stop)
+        return ResultView(self._store, start, stop)
+
+    def row(self, index):
+        return self._store.row(index)
+
+    def column(self, name):
+        return self._store.columns[name]
+
+    def value(self, name, index):
+        return self._store.value(name, index)
+
+    def counts(self, name, default="Unknown"):
+        start, stop = self.bounds()
+        column = self.column(name)
+        counts = Counter()
+        for code, count in column.code_counts(start, stop).items():
+            if count:
+                value = self._store.decode(name, column.values[code])
+                counts[default if value is None else value] += count
+        return counts
+
+    def matching_codes(self, name, predicate):
+        column = self.column(name)
+        return {
+            code
+            for code, value in enumerate(column.values)
+            if predicate(self._store.decode(name, value))
+        }
+
+    def count_where(self, name, predicate):
+        start, stop = self.bounds()
+        column = self.column(name)
+        codes = self.matching_codes(name, predicate)
+        counts = column.code_counts(start, stop)
+        return sum(counts.get(code, 0) for code in codes)
+
+    def search(self, needle, limit=None):
+        # Fields are joined with single spaces, so each space-free piece of
+        # the needle sits inside one field. The piece with the fewest
+        # indexed hits narrows the rows before the joined text is checked.
+        start, stop = self.bounds()
+        pieces = [piece for piece in needle.split(" ") if piece]
+        _, hits = min(
+            (self._store.text_hits(piece, start, stop) for piece in pieces),
+            key=lambda pair: pair[0],
+        )
+        if pieces != [needle]:
+            hits = (index for index in hits if needle in self._store.text(index))
+        return list(islice(hits, limit))
+
+    def top(self, limit):
+        # Rows are bucketed by triage score as they are recorded, so the
+        # top k walks the buckets from the highest score down and touches
+        # about k rows. Buckets keep insertion order, which breaks ties.
+        start, stop = self.bounds()
+        buckets = self._store._score_rows
+        ranked = []
+        for score in sorted(buckets, reverse=True):
+            rows = buckets[score]
+            lower = bisect_left(rows, start)
+            upper = min(bisect_left(rows, stop), lower + limit - len(ranked))
+            ranked.extend(rows[lower:upper])
+            if len(ranked) >= limit:
+                break
+        return ranked
+
+    def recent_rows(self, number, count=2):
+        # Each row links to the previous row for the same number, so the
+        # latest scans of a number are found without a scan of the store.
+        start, stop = self.bounds()
+        rows = []
+        index = self._store._latest.get(str(number or "").strip(), -1)
+        while index >= start and len(rows) < count:
+            if index < stop:
+                rows.append(index)
+            index = self._store._previous[index]
+        return rows
+
+    def voip_rows(self, start=None, stop=None):
+        lower, upper = self.bounds()
+        rows = self._store._voip_rows
+        start = lower if start is None else start
+        stop = upper if stop is None else stop
+        return rows[bisect_left(rows, start) : bisect_left(rows, stop)]
+
+    def number_rows(self, needle, start=None, stop=None):
+        lower, upper = self.bounds()
+        return list(
+            self._store.number_hits(
+                needle, lower if start is None else start, upper if stop is None else stop
+            )
+        )
+
+    def rows_where(self, name, predicate):
+        start, stop = self.bounds()
+        if name == "number":
+            numbers = self._store._numbers
+            return [index for index in range(start, stop) if predicate(numbers[index])]
+        return self.column(name).positions(
+            self.matching_codes(name, predicate), start, stop
+        )
+
+
+class ResultStore(ResultView):
+    def __init__(self, results=None):
+        super().__init__(self)
+        self.columns = {
+            name: CategoricalColumn(postings=name != "owner", searchable=name in SEARCH_COLUMNS)
+            for name in CATEGORICAL_COLUMNS
+        }
+        self._layouts = CategoricalColumn(postings=False)
+        self._number_index = NgramIndex()
+        self._numbers = []
+        self._e164 = []
+        self._voip = bytearray()
+        self._voip_rows = array("I")
+        self._scores = array("H")
+        self._score_rows = {}
+        self._overrides = {}
+        self._previous = array("i")
+        self._latest = {}
+        self.aggregates = DatasetAggregates()
+        if results:
+            self.extend(results)
+
+    def append(self, result):
+        index = len(self._numbers)
+        extra = {}
+
+        number = result.get("number")
+        self._numbers.append(number)
+        key = str(number or "").strip()
+        self._previous.append(self._latest.get(key, -1))
+        self._latest[key] = index
+        self._number_index.add(index, str(number or "").lower())
+
+        formats = result.get("formats")
+        e164 = _formats_e164(formats)
+        digits = _split_e164(e164)
+        if digits is None:
+            e164 = None
+        elif e164 == number:
+            e164 = number
+        self._e164.append(e164)
+        if "formats" in result and e164 is None:
+            extra["formats"] = formats
+
+        for key, builder in (("osint", get_osint_links), ("reputation", get_reputation_links)):
+            if key in result and (digits is None or builder(digits) != result[key]):
+                extra[key] = result[key]
+
+        for key in ("risk", "carrier", "line_type"):
+            value = result.get(key)
+            if value is None or isinstance(value, str):
+                self.columns[key].append(value)
+            else:
+                self.columns[key].append(None)
+                extra[key] = value
+
+        voip = result.get("voip", False)
+        self._voip.append(1 if voip is True else 0)
+        if voip is True:
+            self._voip_rows.append(index)
+        if "voip" in result and not isinstance(voip, bool):
+            extra["voip"] = voip
+
+        geo = result.get("geo")
+        geo_keys = None
+        if isinstance(geo, dict) and _plain_geo(geo):
+            geo_keys = tuple(geo)
+        elif "geo" in result:
+            extra["geo"] = geo
+            geo = None
+        for key, column in GEO_COLUMNS.items():
+            self.columns[column].append((geo or {}).get(key))
+
+        owner = result.get("owner")
+        if not self._append_owner(owner) and "owner" in result:
+            extra["owner"] = owner
+
+        for key in result:
+            if key not in extra and key not in _STORED_KEYS:
+                extra[key] = result[key]
+
+        score = triage_score(result)
+        self._scores.append(score)
+        bucket = self._score_rows.get(score)
+        if bucket is None:
+            bucket = self._score_rows[score] = array("I")
+        bucket.append(index)
+
+        self.aggregates.add(result)
+        self._layouts.append((tuple(result), geo_keys))
+        if extra:
+            self._overrides[index] = copy.deepcopy(extra)
+
+    def _append_owner(self, owner):
+        encoded = None
+        name = confidence = None
+        if isinstance(owner, dict):
+            try:
+                text = json.dumps(owner)
+            except (TypeError, ValueError):
+                text = None
+            if text is not None and json.loads(text) == owner:
+                encoded = text
+            name = _label(owner.get("name"))
+            confidence = _label(owner.get("confidence"))
+        self.columns["owner"].append(encoded)
+        self.columns["owner_name"].append(name)
+        self.columns["owner_confidence"].append(confidence)
+        return encoded is not None
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def _number_candidates(self, needle, start, stop):
+        candidates = self._number_index.candidates(needle)
+        if candidates is None:
+            return range(start, stop)
+        return candidates[bisect_left(candidates, start) : bisect_left(candidates, stop)]
+
+    def number_hits(self, needle, start, stop, candidates=None):
+        if candidates is None:
+            candidates = self._number_candidates(needle, start, stop)
+        numbers = self._numbers
+        return (index for index in candidates if needle in str(numbers[index] or "").lower())
+
+    def text_hits(self, needle, start, stop):
+        candidates = self._number_candidates(needle, start, stop)
+        streams = [self.number_hits(needle, start, stop, candidates)]
+        estimate = len(candidates)
+        for name in SEARCH_COLUMNS:
+            column = self.columns[name]
+            for code in column.search(needle):
+                rows = column.rows(code, start, stop)
+                streams.append(rows)
+                estimate += len(rows)
+        return estimate, _unique(heapq.merge(*streams))
+
+    def text(self, index):
+        values = [self._numbers[index]]
+        values.extend(self.columns[name][index] for name in SEARCH_COLUMNS)
+        return " ".join(str(value or "") for value in values).lower()
+
+    def decode(self, name, value):
+        if name == "owner" and value is not None:
+            return json.loads(value)
+        return value
+
+    def value(self, name, index):
+        if name == "number":
+            return self._numbers[index]
+        if name == "score":
+            return self._scores[index]
+        if name == "voip":
+            return bool(self._voip[index])
+        return self.decode(name, self.columns[name][index])
+
+    def row(self, index):
+        keys, geo_keys = self._layouts[index]
+        extra = self._overrides.get(index, {})
+        item = {}
+        for key in keys:
+            if key in extra:
+                item[key] = copy.deepcopy(extra[key])
+            elif key == "geo":
+                item[key] = {
+                    name: self.columns[GEO_COLUMNS[name]][index] for name in geo_keys
+                }
+            elif key == "formats":
+                item[key] = get_number_formats(phonenumbers.parse(self._e164[index]))
+            elif key in ("osint", "reputation"):
+                digits = _split_e164(self._e164[index])
+                builder = get_osint_links if key == "osint" else get_reputation_links
+                item[key] = builder(digits)
+            else:
+                item[key] = self.value(key, index)
+        return item
+
+    def clear(self):
+        for column in self.columns.values():
+            column.clear()
+        self._layouts.clear()
+        self._number_index.clear()
+        self._numbers = []
+        self._e164 = []
+        self._voip = bytearray()
+        self._voip_rows = array("I")
+        self._scores = array("H")
+        self._score_rows = {}
+        self._overrides = {}
+        self._previous = array("i")
+        self._latest = {}
+        self.aggregates.clear()
+
+
+_STORED_KEYS = {
+    "number",
+    "geo",
+    "carrier",
+    "line_type",
+    "formats",
+    "voip",
+    "risk",
+    "owner",
+    "reputation",
+    "osint",
+}
+
+
+def _unique(indexes):
+    previous = None
+    for index in indexes:
+        if index != previous:
+            previous = index
+            yield index
+
+
+def _label(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _plain_geo(geo):
+    return all(key in GEO_COLUMNS and isinstance(value, str) for key, value in geo.items())
+
+
+def _formats_e164(formats):
+    if not isinstance(formats, dict) or tuple(formats) != FORMAT_KEYS:
+        return None
+    # Formats are rebuilt from E164 on read. Extensions survive in RFC3966
+    # but not in E164, so those rows (and anything hand-edited) keep their
+    # formats verbatim.
+    e164 = formats["E164"]
+    if not isinstance(e164, str) or ";" in str(formats["RFC3966"]):
+        return None
+    if _NON_DIGITS.sub("", str(formats["International"])) != e164[1:]:
+        return None
+    return e164
+
+
+def _split_e164(e164):
+    if not e164 or not e164.startswith("+") or not e164[1:].isdigit():
+        return None
+    digits = e164[1:]
+    for length in range(1, 4):
+        country_code = int(digits[:length])
+        if country_code in COUNTRY_CODE_TO_REGION_CODE:
+            rest = digits[length:]
+            if not rest:
+                return None
+            return _Digits(country_code, int(rest))
+    return None
@@ -1,3 +1,7 @@
+from time import perf_counter
+
+from phonenumbers import number_type
+
 from modules.geo import get_geo_info
 from modules.carrier import get_carrier_info
 from modules.osint import get_osint_links
@@ -8,40 +12,158 @@ from modules.reputation import get_reputation_links
 from modules.risk import calculate_risk
 from core.models import ScanResult
 
+SCANNER_VERSION = 1
+
+SCAN_FIELDS = (
+    "geo",
+    "carrier",
+    "line_type",
+    "formats",
+    "voip",
+    "risk",
+    "owner",
+    "reputation",
+    "osint",
+)
+
+FIELD_DEPENDENCIES = {
+    "risk": ("voip", "carrier", "line_type", "owner"),
+}
+
+NUMBER_TYPE_FIELDS = {"geo", "carrier", "line_type", "voip"}
+
+EMPTY_FIELDS = {
+    "geo": {},
+    "carrier": "",
+    "line_type": "",
+    "formats": {},
+    "voip": False,
+    "risk": "",
+    "owner": {},
+    "reputation": {},
+    "osint": {},
+}
+
+SCAN_STAGES = (
+    "number_type",
+    "geo",
+    "carrier",
+    "line_type",
+    "formats",
+    "voip",
+    "reputation",
+    "osint",
+    "owner",
+    "risk",
+)
+
+
+def timed_stage(timings, stage, func, *args, **kwargs):
+    if timings is None:
+        return func(*args, **kwargs)
+
+    start = perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + (perf_counter() - start)
+
+
+def resolve_fields(fields):
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.replace(",", " ").split()
+
+    requested = {str(name).strip().lower() for name in fields if str(name).strip()}
+    if not requested or "all" in requested:
+        return None
+    unknown = sorted(requested - set(SCAN_FIELDS))
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(SCAN_FIELDS)}"
+        )
 
-def scan_number(parsed, original_number=None, enable_owner_lookup=True):
+    for name in list(requested):
+        requested.update(FIELD_DEPENDENCIES.get(name, ()))
+    if requested == set(SCAN_FIELDS):
+        return None
+    return tuple(name for name in SCAN_FIELDS if name in requested)
+
+
+def disabled_owner_profile():
+    return {
+        "name": "Lookup disabled",
+        "confidence": "Low",
+        "method": "Disabled by user setting",
+        "notes": "Enable owner lookup with `ownerlookup on`.",
+        "sources": [],
+        "candidates": [],
+    }
+
+
+def scan_telecom(parsed, timings=None, fields=None):
+    selected = SCAN_FIELDS if fields is None else fields
+    # Line type, VoIP, carrier and geo all depend on the number type, which
+    # is the most expensive metadata match, so it is worked out once.
+    ntype = None
+    if NUMBER_TYPE_FIELDS.intersection(selected):
+        ntype = timed_stage(timings, "number_type", number_type, parsed)
+
+    telecom = {}
+    if "geo" in selected:
+        telecom["geo"] = timed_stage(timings, "geo", get_geo_info, parsed, ntype)
+    if "carrier" in selected:
+        telecom["carrier"] = timed_stage(timings, "carrier", get_carrier_info, parsed, ntype)
+    if "line_type" in selected:
+        telecom["line_type"] = timed_stage(timings, "line_type", get_line_type, parsed, ntype)
+    if "formats" in selected:
+        telecom["formats"] = timed_stage(timings, "formats", get_number_formats, parsed)
+    if "voip" in selected:
+        telecom["voip"] = timed_stage(timings, "voip", is_voip, parsed, ntype)
+    if "reputation" in selected:
+        telecom["reputation"] = timed_stage(
+            timings, "reputation", get_reputation_links, parsed
+        )
+    if "osint" in selected:
+        telecom["osint"] = timed_stage(timings, "osint", get_osint_links, parsed)
+    return telecom
+
+
+def build_scan_result(number, telecom, owner, timings=None, fields=None):
+    selected = SCAN_FIELDS if fields is None else fields
+    values = dict(EMPTY_FIELDS, **telecom)
+    if "owner" in selected:
+        values["owner"] = owner
+    if "risk" in selected:
+        values["risk"] = timed_stage(
+            timings,
+            "risk",
+            calculate_risk,
+            values["voip"],
+            values["carrier"],
+            line_type=values["line_type"],
+            owner_profile=owner,
+        )
+
+    return ScanResult(number=number, fields=fields, **values)
+
+
+def scan_number(
+    parsed,
+    original_number=None,
+    enable_owner_lookup=True,
+    timings=None,
+    fields=None,
+):
     normalized_number = original_number or f"+{parsed.country_code}{parsed.national_number}"
-    geo = get_geo_info(parsed)
-    carrier = get_carrier_info(parsed)
-    line_type = get_line_type(parsed)
-    formats = get_number_formats(parsed)
-    voip = is_voip(parsed)
-
-    if enable_owner_lookup:
-        owner = lookup_owner_name(parsed)
+    telecom = scan_telecom(parsed, timings=timings, fields=fields)
+
+    if fields is not None and "owner" not in fields:
+        owner = {}
+    elif enable_owner_lookup:
+        owner = timed_stage(timings, "owner", lookup_owner_name, parsed)
     else:
-        owner = {
-            "name": "Lookup disabled",
-            "confidence": "Low",
-            "method": "Disabled by user setting",
-            "notes": "Enable owner lookup with `ownerlookup on`.",
-            "sources": [],
-            "candidates": [],
-        }
-
-    risk = calculate_risk(voip, carrier, line_type=line_type, owner_profile=owner)
-    reputation = get_reputation_links(parsed)
-    osint = get_osint_links(parsed)
-
-    return ScanResult(
-        number=normalized_number,
-        geo=geo,
-        carrier=carrier,
-        line_type=line_type,
-        formats=formats,
-        voip=voip,
-        risk=risk,
-        owner=owner,
-        reputation=reputation,
-        osint=osint,
-    )
+        owner = disabled_owner_profile()
+
+    return build_scan_result(normalized_number, telecom, owner, timings=timings, fields=fields)
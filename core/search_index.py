@@ -0,0 +1,49 @@
+from array import array
+from bisect import bisect_left
+
+GRAM_SIZE = 3
+
+
+def ngrams(text, size=GRAM_SIZE):
+    return {text[position : position + size] for position in range(len(text) - size + 1)}
+
+
+def _contains(postings, key):
+    position = bisect_left(postings, key)
+    return position < len(postings) and postings[position] == key
+
+
+class NgramIndex:
+    # Keys must be added in increasing order so every posting list stays
+    # sorted without re-sorting on insert.
+    def __init__(self, size=GRAM_SIZE):
+        self.size = size
+        self._postings = {}
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add(self, key, text):
+        for gram in ngrams(text, self.size):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("I")
+            postings.append(key)
+
+    def candidates(self, needle):
+        grams = ngrams(needle, self.size)
+        if not grams:
+            return None
+
+        lists = []
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if not postings:
+                return []
+            lists.append(postings)
+        lists.sort(key=len)
+        smallest, others = lists[0], lists[1:]
+        return [key for key in smallest if all(_contains(postings, key) for postings in others)]
+
+    def clear(self):
+        self._postings = {}
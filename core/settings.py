@@ -9,9 +9,33 @@ class FrameworkSettings:
     owner_lookup_enabled: bool = True
     engine_name: str = "threading"
     max_workers: int = 8
+    auto_workers: bool = False
+    queue_depth: int = 0
+    # Owner limits follow the worker count: the burst covers both query
+    # variants for every worker at once, and the sustained rate is half a
+    # request per second per worker, so a full engine is paced rather than
+    # left waiting past its lookup deadlines.
+    owner_rate_limit: float = 4.0
+    owner_rate_burst: int = 16
+    http_pool_size: int = 32
+    http_idle_timeout: float = 30.0
+    owner_cache_enabled: bool = True
+    owner_cache_path: str = ""
+    owner_cache_ttl_hours: float = 168.0
+    owner_cache_negative_ttl_hours: float = 6.0
+    owner_cache_max_entries: int = 100000
+    scan_cache_enabled: bool = True
+    scan_cache_ttl_hours: float = 24.0
+    prefix_index_enabled: bool = True
+    history_enabled: bool = True
+    archive_enabled: bool = True
     auto_summary_after_bulk: bool = True
     dedupe_bulk_numbers: bool = True
+    bulk_dedupe_window: int = 1000000
     bulk_output_mode: str = "full"
+    bulk_ordered_output: bool = True
+    scan_fields: str = ""
+    stage_timing: bool = False
     runbook_stop_on_error: bool = False
     show_beginner_tips: bool = True
 
@@ -57,9 +81,13 @@ PROFILE_PRESETS = {
         "owner_lookup_enabled": True,
         "engine_name": "threading",
         "max_workers": 6,
+        "auto_workers": False,
+        "owner_rate_limit": 3.0,
+        "owner_rate_burst": 12,
         "auto_summary_after_bulk": True,
         "dedupe_bulk_numbers": True,
         "bulk_output_mode": "full",
+        "bulk_ordered_output": True,
         "runbook_stop_on_error": False,
         "show_beginner_tips": True,
     },
@@ -67,9 +95,13 @@ PROFILE_PRESETS = {
         "owner_lookup_enabled": True,
         "engine_name": "async",
         "max_workers": 16,
+        "auto_workers": False,
+        "owner_rate_limit": 8.0,
+        "owner_rate_burst": 32,
         "auto_summary_after_bulk": True,
         "dedupe_bulk_numbers": True,
         "bulk_output_mode": "compact",
+        "bulk_ordered_output": True,
         "runbook_stop_on_error": True,
         "show_beginner_tips": False,
     },
@@ -77,9 +109,13 @@ PROFILE_PRESETS = {
         "owner_lookup_enabled": False,
         "engine_name": "async",
         "max_workers": 24,
+        "auto_workers": False,
+        "owner_rate_limit": 12.0,
+        "owner_rate_burst": 48,
         "auto_summary_after_bulk": False,
         "dedupe_bulk_numbers": True,
         "bulk_output_mode": "silent",
+        "bulk_ordered_output": False,
         "runbook_stop_on_error": True,
         "show_beginner_tips": False,
     },
@@ -87,9 +123,13 @@ PROFILE_PRESETS = {
         "owner_lookup_enabled": True,
         "engine_name": "threading",
         "max_workers": 10,
+        "auto_workers": False,
+        "owner_rate_limit": 5.0,
+        "owner_rate_burst": 20,
         "auto_summary_after_bulk": True,
         "dedupe_bulk_numbers": False,
         "bulk_output_mode": "full",
+        "bulk_ordered_output": True,
         "runbook_stop_on_error": True,
         "show_beginner_tips": False,
     },
@@ -0,0 +1,75 @@
+import random
+import threading
+
+from core.scanner import SCAN_STAGES
+
+
+class StageTimingCollector:
+    def __init__(self, sample_size=10000, seed=None):
+        self.sample_size = max(1, int(sample_size))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self.records = 0
+        self._counts = {}
+        self._totals = {}
+        self._samples = {}
+
+    def record(self, timings):
+        if not timings:
+            return
+
+        with self._lock:
+            self.records += 1
+            for stage, seconds in timings.items():
+                seconds = float(seconds)
+                count = self._counts.get(stage, 0) + 1
+                self._counts[stage] = count
+                self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+
+                samples = self._samples.setdefault(stage, [])
+                if len(samples) < self.sample_size:
+                    samples.append(seconds)
+                else:
+                    slot = self._random.randrange(count)
+                    if slot < self.sample_size:
+                        samples[slot] = seconds
+
+    def summary(self):
+        with self._lock:
+            grand_total = sum(self._totals.values())
+            ordered = [stage for stage in SCAN_STAGES if stage in self._counts]
+            ordered.extend(sorted(stage for stage in self._counts if stage not in SCAN_STAGES))
+
+            rows = []
+            for stage in ordered:
+                samples = sorted(self._samples.get(stage, []))
+                total = self._totals[stage]
+                rows.append(
+                    {
+                        "stage": stage,
+                        "count": self._counts[stage],
+                        "total_seconds": total,
+                        "p50": _percentile(samples, 50),
+                        "p95": _percentile(samples, 95),
+                        "p99": _percentile(samples, 99),
+                        "share": (total / grand_total) if grand_total else 0.0,
+                    }
+                )
+            return {"records": self.records, "total_seconds": grand_total, "stages": rows}
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * (percent / 100.0)
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = rank - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
@@ -1,12 +1,109 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+
 import phonenumbers
-from phonenumbers import NumberParseException
+from phonenumbers import NumberParseException, SUPPORTED_REGIONS, region_code_for_country_code
+
+MIN_DIGITS = 3
+MAX_INPUT_LENGTH = 250
+MEMO_LIMIT = 65536
+
+# phonenumbers rejects anything with fewer than three digits or longer than
+# 250 characters, so these rows can be dropped without parsing them.
+_PLAUSIBLE = re.compile(r"(?:\D*\d){%d}" % MIN_DIGITS)
+
+
+@dataclass
+class ValidatedNumber:
+    number: str
+    valid: bool
+    parsed: object = None
+    reason: str = ""
 
-def validate_number(number):
+
+def normalize_region(region):
+    code = str(region or "").strip().upper()
+    if not code:
+        return None
+    if code not in SUPPORTED_REGIONS:
+        raise ValueError(f"Unknown region '{region}'. Use a two-letter code such as US or GB.")
+    return code
+
+
+def validate_number(number, region=None):
     if not number or not number.strip():
         return False, None
 
     try:
-        parsed = phonenumbers.parse(number)
+        parsed = phonenumbers.parse(number, region)
         return phonenumbers.is_valid_number(parsed), parsed
     except NumberParseException:
         return False, None
+
+
+def prefilter_reason(number):
+    if not number:
+        return "empty"
+    if len(number) > MAX_INPUT_LENGTH or _PLAUSIBLE.match(number) is None:
+        return "junk"
+    return ""
+
+
+def iter_validated(numbers, default_region=None):
+    region = normalize_region(default_region)
+    memo = {}
+    for raw in numbers:
+        number = str(raw).strip()
+        reason = prefilter_reason(number)
+        if reason:
+            yield ValidatedNumber(number, False, reason=reason)
+            continue
+
+        known = memo.get(number)
+        if known is None:
+            try:
+                parsed = phonenumbers.parse(number, region)
+            except NumberParseException:
+                known = (False, None, "unparseable")
+            else:
+                if phonenumbers.is_valid_number(parsed):
+                    known = (True, parsed, "")
+                else:
+                    known = (False, None, "invalid")
+            if len(memo) >= MEMO_LIMIT:
+                memo.clear()
+            memo[number] = known
+        yield ValidatedNumber(number, *known)
+
+
+def validate_numbers(numbers, default_region=None):
+    return list(iter_validated(numbers, default_region=default_region))
+
+
+def validation_summary(results, samples=0):
+    rejected = Counter()
+    countries = Counter()
+    rejected_samples = []
+    for item in results:
+        if item.valid:
+            countries[item.parsed.country_code] += 1
+            continue
+        rejected[item.reason] += 1
+        if len(rejected_samples) < samples:
+            rejected_samples.append((item.number, item.reason))
+
+    return {
+        "total": sum(countries.values()) + sum(rejected.values()),
+        "valid": sum(countries.values()),
+        "rejected": dict(rejected),
+        "rejected_samples": rejected_samples,
+        "countries": [
+            {
+                "country_code": code,
+                "region": region_code_for_country_code(code),
+                "count": count,
+            }
+            for code, count in countries.most_common()
+        ],
+    }
@@ -1,3 +1,3 @@
-from engines.factory import available_engines, create_engine
+from engines.factory import available_engines, create_engine, engine_pool_status, shutdown_engines
 
-__all__ = ["create_engine", "available_engines"]
+__all__ = ["create_engine", "available_engines", "engine_pool_status", "shutdown_engines"]
@@ -1,30 +1,106 @@
 import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from engines.common import (
+    DEFAULT_QUEUE_FACTOR,
+    OrderedEmitter,
+    engine_error,
+    indexed_tasks,
+    resolve_queue_depth,
+)
+from engines.workers import resolve_async_worker
+from utils.async_http import close_pooled_connections
 
 
 class AsyncEngine:
     name = "async"
 
-    async def _run_async(self, worker, tasks, max_workers):
-        semaphore = asyncio.Semaphore(max(1, int(max_workers)))
-        results = [None] * len(tasks)
-
-        async def execute(index, task):
-            async with semaphore:
-                try:
-                    results[index] = await asyncio.to_thread(worker, task)
-                except Exception as exc:
-                    number = task.get("number") if isinstance(task, dict) else None
-                    results[index] = {
-                        "ok": False,
-                        "number": number,
-                        "error": f"Async engine error: {exc}",
-                    }
-
-        await asyncio.gather(*(execute(i, task) for i, task in enumerate(tasks)))
-        return results
-
-    def run(self, worker, tasks, max_workers=8):
-        if not tasks:
-            return []
-
-        return asyncio.run(self._run_async(worker, tasks, max_workers))
+    async def _execute(self, worker, async_worker, task, executor):
+        try:
+            if async_worker is not None:
+                return await async_worker(task, executor)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, worker, task)
+        except Exception as exc:
+            return engine_error(task, "Async", exc)
+
+    def run(self, worker, tasks, max_workers=8, queue_depth=None, controller=None):
+        return list(
+            self.run_iter(
+                worker,
+                tasks,
+                max_workers=max_workers,
+                ordered=True,
+                queue_depth=queue_depth,
+                controller=controller,
+            )
+        )
+
+    def run_iter(
+        self,
+        worker,
+        tasks,
+        max_workers=8,
+        ordered=False,
+        queue_depth=None,
+        controller=None,
+    ):
+        task_iter = indexed_tasks(tasks)
+        if task_iter is None:
+            return
+
+        max_workers = max(1, int(max_workers))
+        depth = resolve_queue_depth(queue_depth, max_workers * DEFAULT_QUEUE_FACTOR)
+        async_worker = resolve_async_worker(worker)
+        if async_worker is not None:
+            # Native workers only hand their CPU-bound stages to the executor;
+            # network waits stay on the event loop, so a small pool is enough.
+            executor_size = min(max_workers, os.cpu_count() or 1)
+        else:
+            executor_size = max_workers
+
+        emitter = OrderedEmitter() if ordered else None
+        executor = ThreadPoolExecutor(max_workers=executor_size)
+        loop = asyncio.new_event_loop()
+        pending = {}
+        exhausted = False
+
+        def fill():
+            nonlocal exhausted
+            buffered = emitter.buffered if emitter is not None else 0
+            limit = controller.limit if controller is not None else max_workers
+            while not exhausted and len(pending) < limit and len(pending) + buffered < depth:
+                item = next(task_iter, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, task = item
+                coroutine = self._execute(worker, async_worker, task, executor)
+                pending[loop.create_task(coroutine)] = (index, time.perf_counter())
+
+        try:
+            fill()
+            while pending:
+                done, _ = loop.run_until_complete(
+                    asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                )
+                for finished in done:
+                    index, started = pending.pop(finished)
+                    result = finished.result()
+                    if controller is not None:
+                        controller.record_result(time.perf_counter() - started, result)
+                    if emitter is None:
+                        yield result
+                    else:
+                        yield from emitter.push(index, result)
+                fill()
+        finally:
+            for leftover in pending:
+                leftover.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(close_pooled_connections())
+            loop.close()
+            executor.shutdown(wait=True, cancel_futures=True)
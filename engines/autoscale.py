@@ -0,0 +1,93 @@
+import threading
+
+
+def is_source_failure(result):
+    if not isinstance(result, dict):
+        return False
+
+    owner = result.get("owner")
+    if owner is None:
+        owner = (result.get("result") or {}).get("owner")
+    return bool((owner or {}).get("failed_queries"))
+
+
+class ConcurrencyController:
+    def __init__(
+        self,
+        initial=4,
+        minimum=1,
+        maximum=64,
+        error_threshold=0.1,
+        latency_factor=2.0,
+        decrease_factor=0.5,
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = max(self.minimum, min(self.maximum, int(initial)))
+        self.error_threshold = error_threshold
+        self.latency_factor = latency_factor
+        self.decrease_factor = decrease_factor
+        self.increases = 0
+        self.decreases = 0
+        self.last_error_rate = 0.0
+        self.last_latency = 0.0
+        self._baseline_latency = None
+        self._samples = 0
+        self._errors = 0
+        self._latency_total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_seconds, failed=False):
+        with self._lock:
+            self._samples += 1
+            self._latency_total += max(0.0, float(latency_seconds))
+            if failed:
+                self._errors += 1
+
+            # One adjustment per "round": roughly one sample per active slot.
+            if self._samples >= max(4, self.limit):
+                self._adjust()
+
+    def record_result(self, latency_seconds, result):
+        self.record(latency_seconds, failed=is_source_failure(result))
+
+    def resize(self, maximum):
+        with self._lock:
+            self.maximum = max(self.minimum, int(maximum))
+            self.limit = min(self.limit, self.maximum)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "error_rate": self.last_error_rate,
+                "latency": self.last_latency,
+            }
+
+    def _adjust(self):
+        error_rate = self._errors / self._samples
+        latency = self._latency_total / self._samples
+        self._samples = 0
+        self._errors = 0
+        self._latency_total = 0.0
+        self.last_error_rate = error_rate
+        self.last_latency = latency
+
+        if self._baseline_latency is None or latency < self._baseline_latency:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency = 0.9 * self._baseline_latency + 0.1 * latency
+
+        congested = latency > self._baseline_latency * self.latency_factor
+        if error_rate > self.error_threshold or congested:
+            reduced = max(self.minimum, int(self.limit * self.decrease_factor))
+            if reduced < self.limit:
+                self.limit = reduced
+                self.decreases += 1
+        elif self.limit < self.maximum:
+            self.limit += 1
+            self.increases += 1
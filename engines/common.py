@@ -0,0 +1,56 @@
+from itertools import chain
+
+DEFAULT_QUEUE_FACTOR = 4
+
+
+def task_number(task):
+    return task.get("number") if isinstance(task, dict) else None
+
+
+def engine_error(task, engine_label, exc):
+    return {
+        "ok": False,
+        "number": task_number(task),
+        "error": f"{engine_label} engine error: {exc}",
+    }
+
+
+def indexed_tasks(tasks):
+    iterator = enumerate(tasks)
+    first = next(iterator, None)
+    if first is None:
+        return None
+    return chain([first], iterator)
+
+
+def known_length(tasks):
+    try:
+        return len(tasks)
+    except TypeError:
+        return None
+
+
+def resolve_queue_depth(queue_depth, default_depth):
+    try:
+        depth = int(queue_depth or 0)
+    except (TypeError, ValueError):
+        depth = 0
+    if depth > 0:
+        return depth
+    return max(1, int(default_depth))
+
+
+class OrderedEmitter:
+    def __init__(self):
+        self._pending = {}
+        self._next_index = 0
+
+    @property
+    def buffered(self):
+        return len(self._pending)
+
+    def push(self, index, result):
+        self._pending[index] = result
+        while self._next_index in self._pending:
+            yield self._pending.pop(self._next_index)
+            self._next_index += 1
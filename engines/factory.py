@@ -1,11 +1,14 @@
 from engines.async_engine import AsyncEngine
-from engines.parallel_engine import ParallelEngine
+from engines.hybrid_engine import HybridEngine
+from engines.parallel_engine import ParallelEngine, process_pool_info, shutdown_process_pool
 from engines.threading_engine import ThreadingEngine
+from utils.http_session import close_http_sessions
 
 ENGINE_MAP = {
     "threading": ThreadingEngine,
     "parallel": ParallelEngine,
     "async": AsyncEngine,
+    "hybrid": HybridEngine,
 }
 
 
@@ -18,3 +21,16 @@ def create_engine(name):
     if normalized not in ENGINE_MAP:
         raise ValueError(f"Unknown engine '{name}'. Available: {', '.join(available_engines())}")
     return ENGINE_MAP[normalized]()
+
+
+def engine_pool_status():
+    info = process_pool_info()
+    if info is None:
+        return "idle"
+    workers = info["workers"]
+    return f"warm ({workers} process{'' if workers == 1 else 'es'})"
+
+
+def shutdown_engines():
+    shutdown_process_pool()
+    close_http_sessions()
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from engines.common import (
+    DEFAULT_QUEUE_FACTOR,
+    OrderedEmitter,
+    engine_error,
+    indexed_tasks,
+    known_length,
+    resolve_queue_depth,
+)
+from engines.parallel_engine import (
+    ChunkSizer,
+    ParallelEngine,
+    _run_chunk,
+    get_process_pool,
+    shutdown_process_pool,
+)
+from engines.workers import resolve_hybrid_stages
+from utils.async_http import close_pooled_connections
+
+
+class HybridEngine:
+    name = "hybrid"
+
+    def run(self, worker, tasks, max_workers=8, queue_depth=None, controller=None):
+        return list(
+            self.run_iter(
+                worker,
+                tasks,
+                max_workers=max_workers,
+                ordered=True,
+                queue_depth=queue_depth,
+                controller=controller,
+            )
+        )
+
+    def run_iter(
+        self,
+        worker,
+        tasks,
+        max_workers=8,
+        ordered=False,
+        queue_depth=None,
+        controller=None,
+    ):
+        stages = resolve_hybrid_stages(worker)
+        if stages is None:
+            yield from ParallelEngine().run_iter(
+                worker,
+                tasks,
+                max_workers,
+                ordered=ordered,
+                queue_depth=queue_depth,
+                controller=controller,
+            )
+            return
+
+        total = known_length(tasks)
+        task_iter = indexed_tasks(tasks)
+        if task_iter is None:
+            return
+
+        cpu_worker, io_worker = stages
+        max_workers = max(1, int(max_workers))
+        processes = min(max_workers, os.cpu_count() or 1)
+        sizer = ChunkSizer(processes)
+        depth = resolve_queue_depth(queue_depth, max_workers * DEFAULT_QUEUE_FACTOR)
+        emitter = OrderedEmitter() if ordered else None
+        loop = asyncio.new_event_loop()
+        chunk_futures = {}
+        io_tasks = {}
+        waiting = deque()
+        chunk_tasks = 0
+        submitted = 0
+        exhausted = False
+
+        async def finish(task, stage):
+            try:
+                return await io_worker(task, stage)
+            except Exception as exc:
+                return engine_error(task, "Hybrid", exc)
+
+        def start_io():
+            limit = controller.limit if controller is not None else max_workers
+            while waiting and len(io_tasks) < limit:
+                index, task, stage = waiting.popleft()
+                coroutine = finish(task, stage)
+                io_tasks[loop.create_task(coroutine)] = (index, time.perf_counter())
+
+        def submit_chunks():
+            nonlocal chunk_tasks, submitted, exhausted
+            buffered = emitter.buffered if emitter is not None else 0
+            while not exhausted and len(chunk_futures) < processes * 2:
+                room = depth - chunk_tasks - len(io_tasks) - len(waiting) - buffered
+                if room <= 0:
+                    break
+
+                remaining = total - submitted if total is not None else None
+                size = min(sizer.next_size(remaining), room)
+                chunk = list(islice(task_iter, size))
+                if len(chunk) < size:
+                    exhausted = True
+                if not chunk:
+                    break
+
+                pool = get_process_pool(processes)
+                future = loop.run_in_executor(
+                    pool,
+                    _run_chunk,
+                    cpu_worker,
+                    [task for _, task in chunk],
+                )
+                chunk_futures[future] = (chunk, pool)
+                chunk_tasks += len(chunk)
+                submitted += len(chunk)
+
+        try:
+            submit_chunks()
+
+            while chunk_futures or io_tasks:
+                done, _ = loop.run_until_complete(
+                    asyncio.wait(
+                        set(chunk_futures) | set(io_tasks),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                )
+
+                ready = []
+                for finished in done:
+                    if finished in io_tasks:
+                        index, started = io_tasks.pop(finished)
+                        result = finished.result()
+                        if controller is not None:
+                            controller.record_result(time.perf_counter() - started, result)
+                        ready.append((index, result))
+                        continue
+
+                    chunk, pool = chunk_futures.pop(finished)
+                    chunk_tasks -= len(chunk)
+                    try:
+                        stage_results, elapsed = finished.result()
+                        sizer.observe(len(chunk), elapsed)
+                    except Exception as exc:
+                        if isinstance(exc, BrokenProcessPool):
+                            shutdown_process_pool(pool)
+                        stage_results = [engine_error(task, "Hybrid", exc) for _, task in chunk]
+
+                    for (index, task), stage in zip(chunk, stage_results):
+                        if stage.get("ok"):
+                            waiting.append((index, task, stage))
+                        else:
+                            ready.append((index, stage))
+
+                for index, result in ready:
+                    if emitter is None:
+                        yield result
+                    else:
+                        yield from emitter.push(index, result)
+
+                start_io()
+                submit_chunks()
+        finally:
+            leftovers = list(chunk_futures) + list(io_tasks)
+            for leftover in leftovers:
+                leftover.cancel()
+            if leftovers:
+                loop.run_until_complete(asyncio.gather(*leftovers, return_exceptions=True))
+            loop.run_until_complete(close_pooled_connections())
+            loop.close()
@@ -1,31 +1,237 @@
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import atexit
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from engines.common import (
+    OrderedEmitter,
+    engine_error,
+    indexed_tasks,
+    known_length,
+    resolve_queue_depth,
+)
+from utils.http_session import configure_http_pool, http_pool_config
+from utils.rate_limiter import (
+    install_shared_limiters,
+    limiter_state_version,
+    shared_limiter_state,
+)
+
+_POOL_LOCK = threading.Lock()
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_RUNTIME = None
+_WORKER_STATE = {}
+
+
+def register_worker_state(name, snapshot, install, version=None):
+    # Runtime configuration that pool workers must mirror. A change in any
+    # version recycles the pool so workers never run with stale settings.
+    _WORKER_STATE[name] = (snapshot, install, version or snapshot)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def _initialize_worker_process(state):
+    for install, payload in state:
+        install(payload)
+
+
+def _configure_worker_http(config):
+    configure_http_pool(**config)
+
+
+register_worker_state(
+    "rate_limits",
+    shared_limiter_state,
+    install_shared_limiters,
+    version=limiter_state_version,
+)
+register_worker_state("http_pool", http_pool_config, _configure_worker_http)
+
+
+def get_process_pool(max_workers):
+    global _POOL, _POOL_WORKERS, _POOL_RUNTIME
+
+    max_workers = max(1, int(max_workers))
+    providers = sorted(_WORKER_STATE.items())
+    runtime = tuple((name, _freeze(version())) for name, (_, _, version) in providers)
+    with _POOL_LOCK:
+        if _POOL is not None and (_POOL_WORKERS != max_workers or _POOL_RUNTIME != runtime):
+            _POOL.shutdown(wait=True, cancel_futures=True)
+            _POOL = None
+
+        if _POOL is None:
+            state = [(install, snapshot()) for _, (snapshot, install, _) in providers]
+            _POOL = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_initialize_worker_process,
+                initargs=(state,),
+            )
+            _POOL_WORKERS = max_workers
+            _POOL_RUNTIME = runtime
+        return _POOL
+
+
+def shutdown_process_pool(pool=None):
+    global _POOL, _POOL_WORKERS
+
+    with _POOL_LOCK:
+        if _POOL is None or (pool is not None and pool is not _POOL):
+            return False
+        _POOL.shutdown(wait=True, cancel_futures=True)
+        _POOL = None
+        _POOL_WORKERS = 0
+        return True
+
+
+def process_pool_info():
+    with _POOL_LOCK:
+        if _POOL is None:
+            return None
+        return {"workers": _POOL_WORKERS}
+
+
+atexit.register(shutdown_process_pool)
+
+
+def _run_chunk(worker, chunk):
+    results = []
+    start = time.perf_counter()
+    for task in chunk:
+        try:
+            results.append(worker(task))
+        except Exception as exc:
+            results.append(engine_error(task, "Parallel", exc))
+    return results, time.perf_counter() - start
+
+
+class ChunkSizer:
+    def __init__(self, max_workers, target_seconds=0.25, initial_size=4, max_size=256):
+        self.max_workers = max(1, int(max_workers))
+        self.target_seconds = target_seconds
+        self.max_size = max_size
+        self.size = max(1, min(initial_size, max_size))
+        self._seconds_per_task = None
+
+    def observe(self, task_count, elapsed_seconds):
+        if task_count <= 0:
+            return
+
+        sample = elapsed_seconds / task_count
+        if self._seconds_per_task is None:
+            self._seconds_per_task = sample
+        else:
+            self._seconds_per_task = 0.7 * self._seconds_per_task + 0.3 * sample
+
+        if self._seconds_per_task <= 0:
+            self.size = self.max_size
+        else:
+            self.size = int(self.target_seconds / self._seconds_per_task)
+        self.size = max(1, min(self.max_size, self.size))
+
+    def next_size(self, remaining=None):
+        if remaining is None:
+            return self.size
+        # Keep at least two chunks per worker for the tail so one slow chunk
+        # cannot hold the run open while the other processes sit idle.
+        tail_cap = max(1, remaining // (self.max_workers * 2))
+        return max(1, min(self.size, tail_cap))
 
 
 class ParallelEngine:
     name = "parallel"
 
-    def run(self, worker, tasks, max_workers=4):
-        if not tasks:
-            return []
+    def run(self, worker, tasks, max_workers=4, queue_depth=None, controller=None):
+        return list(
+            self.run_iter(
+                worker,
+                tasks,
+                max_workers=max_workers,
+                ordered=True,
+                queue_depth=queue_depth,
+                controller=controller,
+            )
+        )
+
+    def run_iter(
+        self,
+        worker,
+        tasks,
+        max_workers=4,
+        ordered=False,
+        queue_depth=None,
+        controller=None,
+    ):
+        total = known_length(tasks)
+        task_iter = indexed_tasks(tasks)
+        if task_iter is None:
+            return
 
         max_workers = max(1, int(max_workers))
-        results = [None] * len(tasks)
-
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {
-                executor.submit(worker, task): index for index, task in enumerate(tasks)
-            }
-            for future in as_completed(future_map):
-                index = future_map[future]
-                try:
-                    results[index] = future.result()
-                except Exception as exc:
-                    task = tasks[index]
-                    number = task.get("number") if isinstance(task, dict) else None
-                    results[index] = {
-                        "ok": False,
-                        "number": number,
-                        "error": f"Parallel engine error: {exc}",
-                    }
-
-        return results
+        sizer = ChunkSizer(max_workers)
+        depth = resolve_queue_depth(queue_depth, max_workers * 2 * sizer.max_size)
+        emitter = OrderedEmitter() if ordered else None
+        pending = {}
+        in_flight = 0
+        submitted = 0
+        exhausted = False
+
+        def fill():
+            nonlocal in_flight, submitted, exhausted
+            buffered = emitter.buffered if emitter is not None else 0
+            cap = depth
+            if controller is not None:
+                cap = min(cap, controller.limit + buffered)
+            while (
+                not exhausted
+                and len(pending) < max_workers * 2
+                and in_flight + buffered < cap
+            ):
+                remaining = total - submitted if total is not None else None
+                size = min(sizer.next_size(remaining), cap - in_flight - buffered)
+                chunk = list(islice(task_iter, size))
+                if len(chunk) < size:
+                    exhausted = True
+                if not chunk:
+                    break
+
+                executor = get_process_pool(max_workers)
+                future = executor.submit(_run_chunk, worker, [task for _, task in chunk])
+                pending[future] = (chunk, executor)
+                in_flight += len(chunk)
+                submitted += len(chunk)
+
+        try:
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk, pool = pending.pop(future)
+                    in_flight -= len(chunk)
+                    elapsed = 0.0
+                    try:
+                        results, elapsed = future.result()
+                        sizer.observe(len(chunk), elapsed)
+                    except Exception as exc:
+                        if isinstance(exc, BrokenProcessPool):
+                            shutdown_process_pool(pool)
+                        results = [engine_error(task, "Parallel", exc) for _, task in chunk]
+
+                    for (index, _), result in zip(chunk, results):
+                        if controller is not None:
+                            controller.record_result(elapsed / len(chunk), result)
+                        if emitter is None:
+                            yield result
+                        else:
+                            yield from emitter.push(index, result)
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -1,31 +1,79 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from engines.common import (
+    DEFAULT_QUEUE_FACTOR,
+    OrderedEmitter,
+    engine_error,
+    indexed_tasks,
+    resolve_queue_depth,
+)
 
 
 class ThreadingEngine:
     name = "threading"
 
-    def run(self, worker, tasks, max_workers=8):
-        if not tasks:
-            return []
+    def run(self, worker, tasks, max_workers=8, queue_depth=None, controller=None):
+        return list(
+            self.run_iter(
+                worker,
+                tasks,
+                max_workers=max_workers,
+                ordered=True,
+                queue_depth=queue_depth,
+                controller=controller,
+            )
+        )
+
+    def run_iter(
+        self,
+        worker,
+        tasks,
+        max_workers=8,
+        ordered=False,
+        queue_depth=None,
+        controller=None,
+    ):
+        task_iter = indexed_tasks(tasks)
+        if task_iter is None:
+            return
 
         max_workers = max(1, int(max_workers))
-        results = [None] * len(tasks)
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {
-                executor.submit(worker, task): index for index, task in enumerate(tasks)
-            }
-            for future in as_completed(future_map):
-                index = future_map[future]
-                try:
-                    results[index] = future.result()
-                except Exception as exc:
-                    task = tasks[index]
-                    number = task.get("number") if isinstance(task, dict) else None
-                    results[index] = {
-                        "ok": False,
-                        "number": number,
-                        "error": f"Threading engine error: {exc}",
-                    }
-
-        return results
+        depth = resolve_queue_depth(queue_depth, max_workers * DEFAULT_QUEUE_FACTOR)
+        emitter = OrderedEmitter() if ordered else None
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        exhausted = False
+
+        def fill():
+            nonlocal exhausted
+            buffered = emitter.buffered if emitter is not None else 0
+            limit = controller.limit if controller is not None else max_workers
+            while not exhausted and len(pending) < limit and len(pending) + buffered < depth:
+                item = next(task_iter, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, task = item
+                pending[executor.submit(worker, task)] = (index, task, time.perf_counter())
+
+        try:
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, task, started = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        result = engine_error(task, "Threading", exc)
+                    if controller is not None:
+                        controller.record_result(time.perf_counter() - started, result)
+
+                    if emitter is None:
+                        yield result
+                    else:
+                        yield from emitter.push(index, result)
+                fill()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,54 +1,234 @@
-from core.scanner import scan_number
+import asyncio
+import time
+
+from core.result_cache import (
+    SCAN_RESULT_CACHE,
+    cached_scan_result,
+    configure_result_cache,
+    scan_with_cache,
+)
+from core.scanner import build_scan_result, disabled_owner_profile, scan_telecom
 from core.validator import validate_number
-from modules.owner_osint import lookup_owner_name
+from engines.parallel_engine import register_worker_state
+from modules.owner_osint import (
+    OWNER_CACHE,
+    configure_owner_cache,
+    install_shared_breaker,
+    lookup_owner_name,
+    lookup_owner_name_async,
+    shared_breaker_state,
+)
+from modules.prefix_index import (
+    configure_prefix_index,
+    prefix_index_config,
+    prefix_index_version,
+)
 from ui.formatter import format_output
 
 
-def scan_number_worker(task):
-    number = str(task.get("number", "")).strip()
-    enable_owner_lookup = bool(task.get("enable_owner_lookup", True))
-    render_output = bool(task.get("render_output", True))
+def _configure_worker_prefix_index(config):
+    configure_prefix_index(**config)
 
+
+register_worker_state("owner_cache", OWNER_CACHE.config, configure_owner_cache)
+register_worker_state("owner_breaker", shared_breaker_state, install_shared_breaker)
+register_worker_state("result_cache", SCAN_RESULT_CACHE.config, configure_result_cache)
+register_worker_state(
+    "prefix_index",
+    prefix_index_config,
+    _configure_worker_prefix_index,
+    version=prefix_index_version,
+)
+
+
+def _task_number(task):
+    # Batch validation attaches the parsed number so workers skip re-parsing.
+    number = str(task.get("number", "")).strip()
     if not number:
-        return {"ok": False, "number": "", "error": "Invalid number: empty input"}
+        return number, None, {"ok": False, "number": "", "error": "Invalid number: empty input"}
+
+    parsed = task.get("parsed")
+    if parsed is None:
+        valid, parsed = validate_number(number, task.get("region"))
+        if not valid:
+            error = {"ok": False, "number": number, "error": f"Invalid number: {number}"}
+            return number, None, error
+    return number, parsed, None
 
-    valid, parsed = validate_number(number)
-    if not valid:
-        return {"ok": False, "number": number, "error": f"Invalid number: {number}"}
+
+def scan_number_worker(task):
+    number, parsed, error = _task_number(task)
+    if error is not None:
+        return error
+
+    enable_owner_lookup = bool(task.get("enable_owner_lookup", True))
+    render_output = bool(task.get("render_output", True))
+    timings = {} if task.get("collect_timings") else None
 
     try:
-        result = scan_number(
+        result, cached = scan_with_cache(
             parsed,
             original_number=number,
             enable_owner_lookup=enable_owner_lookup,
+            timings=timings,
+            fields=task.get("fields"),
         )
     except Exception as exc:
         return {"ok": False, "number": number, "error": f"Scan error for {number}: {exc}"}
 
-    output = ""
-    if render_output:
-        output = format_output(result)
+    if cached:
+        return _scan_payload(number, result, render_output, cached=True)
+    return _scan_payload(number, result, render_output, timings)
+
+
+def owner_lookup_worker(task):
+    number, parsed, error = _task_number(task)
+    if error is not None:
+        return error
+
+    try:
+        owner = lookup_owner_name(parsed)
+    except Exception as exc:
+        return {"ok": False, "number": number, "error": f"Owner lookup error for {number}: {exc}"}
+
+    return {"ok": True, "number": number, "owner": owner}
+
+
+def scan_telecom_worker(task):
+    number, parsed, error = _task_number(task)
+    if error is not None:
+        return error
+
+    enable_owner_lookup = bool(task.get("enable_owner_lookup", True))
+    fields = task.get("fields")
+    timings = {} if task.get("collect_timings") else None
+    try:
+        cached = cached_scan_result(parsed, number, enable_owner_lookup, fields)
+        if cached is not None:
+            render_output = bool(task.get("render_output", True))
+            return _scan_payload(number, cached, render_output, cached=True)
+        telecom = scan_telecom(parsed, timings=timings, fields=fields)
+    except Exception as exc:
+        return {"ok": False, "number": number, "error": f"Scan error for {number}: {exc}"}
 
     return {
         "ok": True,
         "number": number,
-        "result": result.to_dict(),
-        "output": output,
+        "parsed": parsed,
+        "enable_owner_lookup": enable_owner_lookup,
+        "fields": fields,
+        "telecom": telecom,
+        "timings": timings,
     }
 
 
-def owner_lookup_worker(task):
-    number = str(task.get("number", "")).strip()
-    if not number:
-        return {"ok": False, "number": "", "error": "Invalid number: empty input"}
+def finish_scan(stage, owner, render_output=True):
+    number = stage["number"]
+    timings = stage.get("timings")
+    fields = stage.get("fields")
+    try:
+        result = build_scan_result(number, stage["telecom"], owner, timings=timings, fields=fields)
+        if fields is None:
+            SCAN_RESULT_CACHE.put(
+                stage["parsed"],
+                stage.get("enable_owner_lookup", True),
+                result.to_dict(),
+            )
+    except Exception as exc:
+        return {"ok": False, "number": number, "error": f"Scan error for {number}: {exc}"}
+    return _scan_payload(number, result, render_output, timings)
+
+
+def validate_worker(task):
+    number, parsed, error = _task_number(task)
+    if error is not None:
+        return error
+
+    return {"ok": True, "number": number, "parsed": parsed}
+
 
-    valid, parsed = validate_number(number)
-    if not valid:
-        return {"ok": False, "number": number, "error": f"Invalid number: {number}"}
+async def async_finish_scan_worker(task, stage):
+    if stage.get("cached"):
+        return stage
 
+    fields = stage.get("fields")
+    if fields is not None and "owner" not in fields:
+        owner = {}
+    elif bool(task.get("enable_owner_lookup", True)):
+        number = stage["number"]
+        started = time.perf_counter()
+        try:
+            owner = await lookup_owner_name_async(stage["parsed"])
+        except Exception as exc:
+            return {"ok": False, "number": number, "error": f"Scan error for {number}: {exc}"}
+        timings = stage.get("timings")
+        if timings is not None:
+            timings["owner"] = timings.get("owner", 0.0) + (time.perf_counter() - started)
+    else:
+        owner = disabled_owner_profile()
+
+    return finish_scan(stage, owner, render_output=bool(task.get("render_output", True)))
+
+
+async def async_finish_owner_lookup_worker(task, stage):
+    number = stage["number"]
     try:
-        owner = lookup_owner_name(parsed)
+        owner = await lookup_owner_name_async(stage["parsed"])
     except Exception as exc:
         return {"ok": False, "number": number, "error": f"Owner lookup error for {number}: {exc}"}
 
     return {"ok": True, "number": number, "owner": owner}
+
+
+async def async_scan_number_worker(task, executor):
+    loop = asyncio.get_running_loop()
+    stage = await loop.run_in_executor(executor, scan_telecom_worker, task)
+    if not stage.get("ok"):
+        return stage
+    return await async_finish_scan_worker(task, stage)
+
+
+async def async_owner_lookup_worker(task, executor):
+    loop = asyncio.get_running_loop()
+    stage = await loop.run_in_executor(executor, validate_worker, task)
+    if not stage.get("ok"):
+        return stage
+    return await async_finish_owner_lookup_worker(task, stage)
+
+
+ASYNC_WORKERS = {
+    scan_number_worker: async_scan_number_worker,
+    owner_lookup_worker: async_owner_lookup_worker,
+}
+
+
+HYBRID_STAGES = {
+    scan_number_worker: (scan_telecom_worker, async_finish_scan_worker),
+    owner_lookup_worker: (validate_worker, async_finish_owner_lookup_worker),
+}
+
+
+def resolve_async_worker(worker):
+    return ASYNC_WORKERS.get(worker)
+
+
+def resolve_hybrid_stages(worker):
+    return HYBRID_STAGES.get(worker)
+
+
+def _scan_payload(number, result, render_output, timings=None, cached=False):
+    output = ""
+    if render_output:
+        output = format_output(result)
+
+    payload = {
+        "ok": True,
+        "number": number,
+        "result": result.to_dict(),
+        "output": output,
+    }
+    if timings is not None:
+        payload["timings"] = timings
+    if cached:
+        payload["cached"] = True
+    return payload
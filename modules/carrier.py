@@ -1,7 +1,27 @@
-from phonenumbers import carrier
+from phonenumbers import PhoneNumberType, national_significant_number, number_type
 
-def get_carrier_info(parsed):
+from modules.prefix_index import get_prefix_index
+
+MOBILE_TYPES = {
+    PhoneNumberType.MOBILE,
+    PhoneNumberType.FIXED_LINE_OR_MOBILE,
+    PhoneNumberType.PAGER,
+}
+
+
+def get_carrier_info(parsed, ntype=None):
     try:
+        index = get_prefix_index()
+        digits = f"{parsed.country_code}{national_significant_number(parsed)}"
+        if index is not None and len(digits) >= index.width:
+            if ntype is None:
+                ntype = number_type(parsed)
+            if ntype not in MOBILE_TYPES:
+                return "Unknown"
+            return index.lookup("carrier", digits) or "Unknown"
+
+        from phonenumbers import carrier
+
         name = carrier.name_for_number(parsed, "en")
         return name if name else "Unknown"
     except:
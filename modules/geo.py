@@ -1,8 +1,87 @@
-from phonenumbers import geocoder, timezone
+from phonenumbers import (
+    NumberParseException,
+    PhoneNumberType,
+    country_mobile_token,
+    is_number_type_geographical,
+    is_valid_number_for_region,
+    national_significant_number,
+    number_type,
+    parse,
+    region_code_for_country_code,
+    region_codes_for_country_code,
+)
+
+from modules.prefix_index import get_prefix_index
+
+UNKNOWN_TIMEZONE = "Etc/Unknown"
+
+
+def get_geo_info(parsed, ntype=None):
+    index = get_prefix_index()
+    if index is not None:
+        info = _indexed_geo_info(index, parsed, ntype)
+        if info is not None:
+            return info
+
+    # Imported lazily: these modules load the full prefix metadata into every
+    # process, which the compiled index exists to avoid.
+    from phonenumbers import geocoder, timezone
 
-def get_geo_info(parsed):
     return {
         "Country": geocoder.country_name_for_number(parsed, "en"),
         "Region": geocoder.description_for_number(parsed, "en"),
         "Timezone": ", ".join(timezone.time_zones_for_number(parsed))
     }
+
+
+def _indexed_geo_info(index, parsed, ntype=None):
+    # Same rules as phonenumbers' geocoder and timezone modules, with the
+    # prefix searches served from the compiled index.
+    national = national_significant_number(parsed)
+    digits = f"{parsed.country_code}{national}"
+    if len(digits) < index.width:
+        return None
+
+    country = _country_name(index, parsed)
+    if ntype is None:
+        ntype = number_type(parsed)
+    if ntype == PhoneNumberType.UNKNOWN:
+        return {"Country": country, "Region": "", "Timezone": UNKNOWN_TIMEZONE}
+    if not is_number_type_geographical(ntype, parsed.country_code):
+        zones = index.country_time_zones(parsed.country_code) or (UNKNOWN_TIMEZONE,)
+        return {"Country": country, "Region": country, "Timezone": ", ".join(zones)}
+
+    area_digits = digits
+    token = country_mobile_token(parsed.country_code)
+    if token and national.startswith(token):
+        try:
+            stripped = parse(
+                national[len(token):],
+                region_code_for_country_code(parsed.country_code),
+            )
+        except NumberParseException:
+            stripped = parsed
+        area_digits = f"{stripped.country_code}{national_significant_number(stripped)}"
+        if len(area_digits) < index.width:
+            return None
+
+    zones = index.time_zones(digits) or (UNKNOWN_TIMEZONE,)
+    return {
+        "Country": country,
+        "Region": index.lookup("geo", area_digits) or country,
+        "Timezone": ", ".join(zones),
+    }
+
+
+def _country_name(index, parsed):
+    regions = region_codes_for_country_code(parsed.country_code)
+    if len(regions) == 1:
+        return index.region_name(regions[0])
+
+    matched = "ZZ"
+    for region in regions:
+        if is_valid_number_for_region(parsed, region):
+            if matched != "ZZ":
+                return ""
+            matched = region
+    return index.region_name(matched)
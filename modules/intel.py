@@ -16,9 +16,11 @@ LINE_TYPE_MAP = {
 }
 
 
-def get_line_type(parsed):
+def get_line_type(parsed, ntype=None):
     try:
-        return LINE_TYPE_MAP.get(number_type(parsed), "UNKNOWN")
+        if ntype is None:
+            ntype = number_type(parsed)
+        return LINE_TYPE_MAP.get(ntype, "UNKNOWN")
     except Exception:
         return "UNKNOWN"
 
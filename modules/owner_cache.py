@@ -0,0 +1,346 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from utils.sqlite_store import SQLiteConnections
+
+DEFAULT_CACHE_PATH = os.environ.get("NUMBREACHER_OWNER_CACHE", "output/owner_cache.sqlite3")
+DEFAULT_POSITIVE_TTL = 7 * 24 * 3600.0
+DEFAULT_NEGATIVE_TTL = 6 * 3600.0
+DEFAULT_MAX_ENTRIES = 100000
+MEMORY_ENTRIES = 2048
+EVICTION_INTERVAL = 256
+STATS_FLUSH_INTERVAL = 64
+TOUCH_INTERVAL = 60.0
+INFLIGHT_LINGER = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS owner_cache (
+    number TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    negative INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS owner_cache_last_access ON owner_cache (last_access);
+CREATE TABLE IF NOT EXISTS owner_inflight (
+    number TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    payload TEXT
+);
+CREATE TABLE IF NOT EXISTS owner_cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def is_cacheable(result):
+    if result.get("circuit_skipped"):
+        return False
+    # "Sources unavailable" says nothing about the number, so never store it.
+    failed = int(result.get("failed_queries", 0) or 0)
+    return failed == 0 or failed < len(result.get("sources") or [])
+
+
+def is_negative(result):
+    name = str(result.get("name", "Unknown")).strip().lower()
+    return name == "unknown" or bool(result.get("failed_queries"))
+
+
+class OwnerCache:
+    def __init__(
+        self,
+        path=DEFAULT_CACHE_PATH,
+        positive_ttl=DEFAULT_POSITIVE_TTL,
+        negative_ttl=DEFAULT_NEGATIVE_TTL,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        enabled=True,
+    ):
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(path, SCHEMA)
+        self._memory = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "coalesced": 0,
+        }
+        self._unflushed = 0
+        self._puts = 0
+        self._pid = os.getpid()
+        self.configure(path, positive_ttl, negative_ttl, max_entries, enabled)
+
+    def configure(
+        self,
+        path=None,
+        positive_ttl=None,
+        negative_ttl=None,
+        max_entries=None,
+        enabled=None,
+    ):
+        with self._lock:
+            if path is not None:
+                self._db.set_path(path)
+                self._memory.clear()
+            if positive_ttl is not None:
+                self.positive_ttl = max(0.0, float(positive_ttl))
+            if negative_ttl is not None:
+                self.negative_ttl = max(0.0, float(negative_ttl))
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            if enabled is not None:
+                self.enabled = bool(enabled)
+
+    @property
+    def path(self):
+        return self._db.path
+
+    def config(self):
+        with self._lock:
+            return {
+                "path": self.path,
+                "positive_ttl": self.positive_ttl,
+                "negative_ttl": self.negative_ttl,
+                "max_entries": self.max_entries,
+                "enabled": self.enabled,
+            }
+
+    def get(self, number):
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            self._check_fork()
+            entry = self._memory.get(number)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(number)
+                flush = self._count("hits")
+                hit = entry[1]
+            else:
+                hit = None
+        if hit is not None:
+            if flush:
+                self.flush_stats()
+            return hit
+
+        row = self._execute(
+            "SELECT payload, expires, last_access FROM owner_cache WHERE number = ?",
+            (number,),
+        ).fetchone()
+        if row is None or row[1] <= now:
+            with self._lock:
+                self._memory.pop(number, None)
+                flush = self._count("misses")
+            if flush:
+                self.flush_stats()
+            return None
+
+        result = json.loads(row[0])
+        if now - row[2] >= TOUCH_INTERVAL:
+            self._execute(
+                "UPDATE owner_cache SET last_access = ? WHERE number = ?",
+                (now, number),
+                commit=True,
+            )
+        with self._lock:
+            self._remember(number, row[1], result)
+            flush = self._count("hits")
+        if flush:
+            self.flush_stats()
+        return result
+
+    def put(self, number, result):
+        if not self.enabled or not is_cacheable(result):
+            return False
+
+        negative = is_negative(result)
+        now = time.time()
+        expires = now + (self.negative_ttl if negative else self.positive_ttl)
+        self._execute(
+            "INSERT OR REPLACE INTO owner_cache "
+            "(number, payload, negative, created, expires, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (number, json.dumps(result), int(negative), now, expires, now),
+            commit=True,
+        )
+        with self._lock:
+            self._remember(number, expires, result)
+            flush = self._count("stores")
+            self._puts += 1
+            evict = self._puts % EVICTION_INTERVAL == 0
+        if evict:
+            self.evict()
+        if flush:
+            self.flush_stats()
+        return True
+
+    def claim(self, number, lease_seconds):
+        now = time.time()
+        cursor = self._execute(
+            "INSERT INTO owner_inflight (number, pid, expires, payload) VALUES (?, ?, ?, NULL) "
+            "ON CONFLICT(number) DO UPDATE SET "
+            "pid = excluded.pid, expires = excluded.expires, payload = NULL "
+            "WHERE owner_inflight.expires <= ?",
+            (number, os.getpid(), now + lease_seconds, now),
+            commit=True,
+        )
+        return cursor.rowcount == 1
+
+    def publish(self, number, result):
+        # Followers in other processes read the payload from the claim row,
+        # which lingers briefly so results that are never cached still reach them.
+        self._execute(
+            "UPDATE owner_inflight SET payload = ?, expires = ? WHERE number = ? AND pid = ?",
+            (json.dumps(result), time.time() + INFLIGHT_LINGER, number, os.getpid()),
+            commit=True,
+        )
+
+    def abandon(self, number):
+        self._execute(
+            "DELETE FROM owner_inflight WHERE number = ? AND pid = ? AND payload IS NULL",
+            (number, os.getpid()),
+            commit=True,
+        )
+
+    def inflight_result(self, number):
+        row = self._execute(
+            "SELECT payload, expires FROM owner_inflight WHERE number = ?",
+            (number,),
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return False, None
+        if row[0] is None:
+            return True, None
+        return True, json.loads(row[0])
+
+    def note_coalesced(self):
+        with self._lock:
+            flush = self._count("coalesced")
+        if flush:
+            self.flush_stats()
+
+    def evict(self):
+        now = time.time()
+        self._execute("DELETE FROM owner_cache WHERE expires <= ?", (now,), commit=True)
+        self._execute("DELETE FROM owner_inflight WHERE expires <= ?", (now,), commit=True)
+        (total,) = self._execute("SELECT COUNT(*) FROM owner_cache").fetchone()
+        overflow = total - self.max_entries
+        if overflow <= 0:
+            return 0
+
+        self._execute(
+            "DELETE FROM owner_cache WHERE number IN "
+            "(SELECT number FROM owner_cache ORDER BY last_access LIMIT ?)",
+            (overflow,),
+            commit=True,
+        )
+        with self._lock:
+            self._memory.clear()
+            self._counters["evictions"] += overflow
+            self._unflushed += 1
+        return overflow
+
+    def purge(self, expired_only=False):
+        if expired_only:
+            cursor = self._execute(
+                "DELETE FROM owner_cache WHERE expires <= ?",
+                (time.time(),),
+                commit=True,
+            )
+        else:
+            cursor = self._execute("DELETE FROM owner_cache", commit=True)
+            self._execute("DELETE FROM owner_inflight", commit=True)
+            self._execute("DELETE FROM owner_cache_stats", commit=True)
+        with self._lock:
+            self._memory.clear()
+        return cursor.rowcount
+
+    def clear(self):
+        self.purge()
+        with self._lock:
+            for key in self._counters:
+                self._counters[key] = 0
+            self._unflushed = 0
+
+    def flush_stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            for key in self._counters:
+                self._counters[key] = 0
+            self._unflushed = 0
+
+        connection = self._db.connection()
+        with connection:
+            for name, value in counters.items():
+                if value:
+                    connection.execute(
+                        "INSERT INTO owner_cache_stats (name, value) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                        (name, value),
+                    )
+
+    def stats(self):
+        self.flush_stats()
+        now = time.time()
+        totals = dict(self._execute("SELECT name, value FROM owner_cache_stats").fetchall())
+        entries, negative, expired = self._execute(
+            "SELECT COUNT(*), COALESCE(SUM(negative), 0), "
+            "COALESCE(SUM(CASE WHEN expires <= ? THEN 1 ELSE 0 END), 0) FROM owner_cache",
+            (now,),
+        ).fetchone()
+        hits = totals.get("hits", 0)
+        misses = totals.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "positive": entries - negative,
+            "negative": negative,
+            "expired": expired,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "stores": totals.get("stores", 0),
+            "evictions": totals.get("evictions", 0),
+            "coalesced": totals.get("coalesced", 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, number):
+        row = self._execute(
+            "SELECT 1 FROM owner_cache WHERE number = ? AND expires > ?",
+            (number, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def _remember(self, number, expires, result):
+        self._memory[number] = (expires, result)
+        self._memory.move_to_end(number)
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _count(self, name):
+        self._check_fork()
+        self._counters[name] += 1
+        self._unflushed += 1
+        return self._unflushed >= STATS_FLUSH_INTERVAL
+
+    def _check_fork(self):
+        # Children inherit the parent's counters and memory tier through fork;
+        # drop them so stats are not double counted.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._memory.clear()
+            for key in self._counters:
+                self._counters[key] = 0
+            self._unflushed = 0
+
+    def _execute(self, sql, params=(), commit=False):
+        return self._db.execute(sql, params, commit=commit)
@@ -1,10 +1,31 @@
+import asyncio
 import html
+import os
+import random
 import re
+import threading
+import time
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.parse import quote_plus
 
 import requests
 
+from modules.owner_cache import OwnerCache
+from utils.async_http import AsyncHTTPClient, AsyncHTTPError
+from utils.circuit_breaker import CircuitBreaker
+from utils.http_session import get_session
+from utils.rate_limiter import (
+    acquire_rate_limit,
+    acquire_rate_limit_async,
+    configure_rate_limit,
+    refund_rate_limit,
+    reserve_rate_limit,
+)
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+SEARCH_URL = "https://duckduckgo.com/html/"
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -36,7 +57,25 @@ STOPWORDS = {
     "directory",
 }
 
-OWNER_CACHE = {}
+HIGH_CONFIDENCE_VOTES = 3
+MEDIUM_CONFIDENCE_VOTES = 2
+LOOKUP_DEADLINE = 10.0
+INFLIGHT_POLL_SECONDS = 0.05
+QUERY_THREADS = 64
+CACHE_THREADS = 4
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+OWNER_CACHE = OwnerCache()
+SOURCE_BREAKER = CircuitBreaker()
+_FLIGHTS = SingleFlight()
+_ASYNC_FLIGHTS = AsyncSingleFlight()
+_ASYNC_CLIENT = AsyncHTTPClient()
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
 
 
 def _clean_html(value):
@@ -62,71 +101,407 @@ def _is_likely_name(candidate):
     return lowered_words.isdisjoint(STOPWORDS)
 
 
-def lookup_owner_name(parsed, timeout=4):
-    number = f"{parsed.country_code}{parsed.national_number}"
+def configure_owner_rate_limit(rate, burst=None):
+    return configure_rate_limit(SEARCH_URL, rate, burst)
+
+
+def configure_owner_cache(config):
+    OWNER_CACHE.configure(**config)
+
+
+def shared_breaker_state():
+    return SOURCE_BREAKER.state
+
+
+def install_shared_breaker(state):
+    SOURCE_BREAKER.use_state(state)
 
-    if number in OWNER_CACHE:
-        return OWNER_CACHE[number]
 
+def _owner_key(parsed):
+    return f"{parsed.country_code}{parsed.national_number}"
+
+
+def _query_urls(number):
     query_variants = [
         f"\"{number}\" \"Truecaller\"",
         f"\"{number}\" \"phone owner\"",
     ]
+    return [f"{SEARCH_URL}?q={quote_plus(query)}" for query in query_variants]
+
 
+def _page_votes(page_text):
     votes = Counter()
-    source_urls = []
-    failed_queries = 0
+    titles = DUCK_RESULT_TITLE_PATTERN.findall(page_text)
+    for raw_title in titles[:10]:
+        title = _clean_html(raw_title)
+        for candidate_name in _extract_candidate_names(title):
+            votes[candidate_name] += 1
+    return votes
+
+
+class _VoteTally:
+    def __init__(self, page_count):
+        self.votes = Counter()
+        self.page_count = page_count
+        self.applied = 0
+        self.attempted = 0
+        self.skipped = 0
+        self.timed_out = 0
+        self.failed_queries = 0
+        self._ready = {}
+
+    def add(self, index, page_text, attempted):
+        if attempted:
+            self.attempted += 1
+        else:
+            self.skipped += 1
+        self._ready[index] = page_text
+        # Pages are applied in query order so ties resolve exactly as they
+        # would for sequential queries, whichever response lands first.
+        while self.applied in self._ready:
+            self._apply(self._ready.pop(self.applied))
+
+    def finish(self):
+        for index in range(self.applied, self.page_count):
+            if index in self._ready:
+                self._apply(self._ready.pop(index))
+            else:
+                self.timed_out += 1
+                self.failed_queries += 1
+        self.applied = self.page_count
+
+    def _apply(self, page_text):
+        if page_text is None:
+            self.failed_queries += 1
+        else:
+            self.votes.update(_page_votes(page_text))
+        self.applied += 1
+
+
+def _executor(name, size):
+    with _EXECUTORS_LOCK:
+        # Executors inherited through fork have no live threads; start fresh.
+        pid, executor = _EXECUTORS.get(name, (None, None))
+        if executor is None or pid != os.getpid():
+            executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=name)
+            _EXECUTORS[name] = (os.getpid(), executor)
+        return executor
 
-    for query in query_variants:
-        url = f"https://duckduckgo.com/html/?q={quote_plus(query)}"
-        source_urls.append(url)
 
+def _query_executor():
+    return _executor("owner-query", QUERY_THREADS)
+
+
+async def _cache_call(method, *args):
+    # The cache is SQLite with a busy timeout; a database locked by another
+    # session must stall a cache thread, never the event loop.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor("owner-cache", CACHE_THREADS), method, *args)
+
+
+def _retry_delay(attempt):
+    # Full jitter keeps workers that failed together from retrying together.
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def _is_transient(exc):
+    if isinstance(exc, AsyncHTTPError):
+        return exc.status is None or exc.status in RETRY_STATUSES
+    if isinstance(exc, requests.HTTPError):
+        response = exc.response
+        return response is not None and response.status_code in RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def _fetch_page(url, timeout):
+    # The first attempt spends the token reserved when the query was scheduled.
+    for attempt in range(RETRY_ATTEMPTS):
         try:
-            response = requests.get(url, headers=HEADERS, timeout=timeout)
+            if attempt:
+                acquire_rate_limit(url)
+            response = get_session().get(url, headers=HEADERS, timeout=timeout)
             response.raise_for_status()
-        except requests.RequestException:
-            failed_queries += 1
-            continue
+            return response.text
+        except requests.RequestException as exc:
+            if attempt + 1 >= RETRY_ATTEMPTS or not _is_transient(exc):
+                raise
+        time.sleep(_retry_delay(attempt))
+
+
+def _run_query(url, timeout, granted):
+    delay = granted - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    if not SOURCE_BREAKER.allow():
+        refund_rate_limit(url)
+        return None, False
+    try:
+        page_text = _fetch_page(url, timeout)
+    except requests.RequestException:
+        SOURCE_BREAKER.record(False)
+        return None, True
+    SOURCE_BREAKER.record(True)
+    return page_text, True
+
+
+async def _run_query_async(url, timeout, client, granted):
+    delay = granted - time.monotonic()
+    if delay > 0:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            refund_rate_limit(url)
+            raise
+    if not SOURCE_BREAKER.allow():
+        refund_rate_limit(url)
+        return None, False
+    try:
+        page_text = await _fetch_page_async(url, timeout, client)
+    except AsyncHTTPError:
+        SOURCE_BREAKER.record(False)
+        return None, True
+    except asyncio.CancelledError:
+        SOURCE_BREAKER.release()
+        raise
+    SOURCE_BREAKER.record(True)
+    return page_text, True
+
+
+async def _fetch_page_async(url, timeout, client):
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            if attempt:
+                await acquire_rate_limit_async(url)
+            response = await client.get(url, headers=HEADERS, timeout=timeout)
+            response.raise_for_status()
+            return response.text
+        except AsyncHTTPError as exc:
+            if attempt + 1 >= RETRY_ATTEMPTS or not _is_transient(exc):
+                raise
+        await asyncio.sleep(_retry_delay(attempt))
+
+
+def _circuit_skipped_result(source_urls):
+    return {
+        "name": "Unknown",
+        "confidence": "Low",
+        "method": "DuckDuckGo search-snippet heuristic",
+        "notes": "Owner lookup skipped: source circuit is open after repeated failures.",
+        "sources": source_urls,
+        "candidates": [],
+        "failed_queries": 0,
+        "circuit_skipped": True,
+    }
 
-        titles = DUCK_RESULT_TITLE_PATTERN.findall(response.text)
-        for raw_title in titles[:10]:
-            title = _clean_html(raw_title)
-            for candidate_name in _extract_candidate_names(title):
-                votes[candidate_name] += 1
 
+def _build_owner_result(votes, source_urls, failed_queries, timed_out=0):
     if not votes:
         notes = "No reliable owner name discovered in indexed public snippets."
-        if failed_queries == len(query_variants):
+        if failed_queries == len(source_urls):
             notes = "Owner lookup sources were unavailable."
+            if timed_out:
+                notes = "Owner lookup sources were unavailable or timed out."
 
-        result = {
+        return {
             "name": "Unknown",
             "confidence": "Low",
             "method": "DuckDuckGo search-snippet heuristic",
             "notes": notes,
             "sources": source_urls,
             "candidates": [],
+            "failed_queries": failed_queries,
         }
-        OWNER_CACHE[number] = result
-        return result
 
     top_candidates = [name for name, _ in votes.most_common(3)]
     best_name, score = votes.most_common(1)[0]
 
-    if score >= 3:
+    if score >= HIGH_CONFIDENCE_VOTES:
         confidence = "High"
-    elif score >= 2:
+    elif score >= MEDIUM_CONFIDENCE_VOTES:
         confidence = "Medium"
     else:
         confidence = "Low"
 
-    result = {
+    return {
         "name": best_name,
         "confidence": confidence,
         "method": "DuckDuckGo search-snippet heuristic",
         "notes": "Heuristic guess from public indexed pages. Verify manually.",
         "sources": source_urls,
         "candidates": top_candidates,
+        "failed_queries": failed_queries,
     }
-    OWNER_CACHE[number] = result
+
+
+def _tally_result(source_urls, tally):
+    # Only queries the breaker refused count as skipped; queries that missed
+    # the deadline are failures of a source that is still considered healthy.
+    if tally.skipped == len(source_urls):
+        return _circuit_skipped_result(source_urls)
+    return _build_owner_result(tally.votes, source_urls, tally.failed_queries, tally.timed_out)
+
+
+def _finish_lookup(number, source_urls, tally):
+    result = _tally_result(source_urls, tally)
+    if tally.attempted:
+        OWNER_CACHE.put(number, result)
+    return result
+
+
+def _schedule_queries(source_urls, deadline):
+    # Each query's deadline starts once the limiter grants its token, so time
+    # spent queued behind other lookups paces the query instead of timing it out.
+    now = time.monotonic()
+    schedule = []
+    for url in source_urls:
+        granted = now + reserve_rate_limit(url)
+        schedule.append((url, granted, granted + deadline))
+    return schedule
+
+
+def _next_expiry(pending):
+    return max(0.0, min(entry[-1] for entry in pending.values()) - time.monotonic())
+
+
+def _query_owner(number, timeout, deadline):
+    source_urls = _query_urls(number)
+    tally = _VoteTally(len(source_urls))
+    executor = _query_executor()
+    pending = {}
+    for index, (url, granted, expires) in enumerate(_schedule_queries(source_urls, deadline)):
+        pending[executor.submit(_run_query, url, timeout, granted)] = (index, url, expires)
+
+    while pending:
+        done, _ = wait(pending, timeout=_next_expiry(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            tally.add(pending.pop(future)[0], *future.result())
+
+        # Queries past their deadline count as failed. Requests already on the
+        # wire finish in the background; queued ones are cancelled and hand
+        # their token back.
+        now = time.monotonic()
+        for future, (_, url, expires) in list(pending.items()):
+            if expires <= now:
+                del pending[future]
+                if future.cancel():
+                    refund_rate_limit(url)
+
+    tally.finish()
+    return _finish_lookup(number, source_urls, tally)
+
+
+async def _query_owner_async(number, timeout, deadline, client):
+    source_urls = _query_urls(number)
+    tally = _VoteTally(len(source_urls))
+    pending = {}
+    for index, (url, granted, expires) in enumerate(_schedule_queries(source_urls, deadline)):
+        task = asyncio.ensure_future(_run_query_async(url, timeout, client, granted))
+        pending[task] = (index, expires)
+    expired = []
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=_next_expiry(pending),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                tally.add(pending.pop(task)[0], *task.result())
+
+            now = time.monotonic()
+            for task, (_, expires) in list(pending.items()):
+                if expires <= now:
+                    del pending[task]
+                    task.cancel()
+                    expired.append(task)
+    finally:
+        # Cancelled queries refund any token they were still waiting on.
+        for task in pending:
+            task.cancel()
+        expired.extend(pending)
+        if expired:
+            await asyncio.gather(*expired, return_exceptions=True)
+
+    tally.finish()
+    result = _tally_result(source_urls, tally)
+    if tally.attempted:
+        await _cache_call(OWNER_CACHE.put, number, result)
+    return result
+
+
+def _claimed_lookup(number, timeout, deadline):
+    if not OWNER_CACHE.enabled:
+        return _query_owner(number, timeout, deadline)
+
+    # Another process may already be looking this number up; wait for its
+    # result instead of repeating the queries.
+    while not OWNER_CACHE.claim(number, deadline + timeout):
+        claimed, shared = OWNER_CACHE.inflight_result(number)
+        if shared is not None:
+            OWNER_CACHE.note_coalesced()
+            return shared
+        if claimed:
+            time.sleep(INFLIGHT_POLL_SECONDS)
+
+    try:
+        result = _query_owner(number, timeout, deadline)
+    except BaseException:
+        OWNER_CACHE.abandon(number)
+        raise
+    OWNER_CACHE.publish(number, result)
+    return result
+
+
+async def _claimed_lookup_async(number, timeout, deadline, client):
+    if not OWNER_CACHE.enabled:
+        return await _query_owner_async(number, timeout, deadline, client)
+
+    while not await _cache_call(OWNER_CACHE.claim, number, deadline + timeout):
+        claimed, shared = await _cache_call(OWNER_CACHE.inflight_result, number)
+        if shared is not None:
+            await _cache_call(OWNER_CACHE.note_coalesced)
+            return shared
+        if claimed:
+            await asyncio.sleep(INFLIGHT_POLL_SECONDS)
+
+    try:
+        result = await _query_owner_async(number, timeout, deadline, client)
+    except BaseException:
+        await asyncio.shield(_cache_call(OWNER_CACHE.abandon, number))
+        raise
+    await _cache_call(OWNER_CACHE.publish, number, result)
+    return result
+
+
+def lookup_owner_name(parsed, timeout=4, deadline=LOOKUP_DEADLINE):
+    number = _owner_key(parsed)
+
+    cached = OWNER_CACHE.get(number)
+    if cached is not None:
+        return cached
+
+    result, shared = _FLIGHTS.do(
+        number,
+        lambda: _claimed_lookup(number, timeout, deadline),
+    )
+    if shared:
+        OWNER_CACHE.note_coalesced()
+    return result
+
+
+async def lookup_owner_name_async(parsed, timeout=4, client=None, deadline=LOOKUP_DEADLINE):
+    number = _owner_key(parsed)
+
+    cached = await _cache_call(OWNER_CACHE.get, number)
+    if cached is not None:
+        return cached
+
+    client = client or _ASYNC_CLIENT
+    result, shared = await _ASYNC_FLIGHTS.do(
+        number,
+        lambda: _claimed_lookup_async(number, timeout, deadline, client),
+    )
+    if shared:
+        await _cache_call(OWNER_CACHE.note_coalesced)
     return result
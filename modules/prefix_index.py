@@ -0,0 +1,331 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+import phonenumbers
+
+DEFAULT_INDEX_PATH = str(Path(__file__).resolve().parent.parent / "data" / "prefix_index.bin")
+MAGIC = b"NBPX"
+FORMAT_VERSION = 1
+MISSING = 0xFFFFFFFF
+TABLES = ("geo", "carrier", "timezone")
+
+_LOCK = threading.Lock()
+_CONFIG = {"path": DEFAULT_INDEX_PATH, "enabled": True}
+_INDEX = None
+_LOADED = False
+
+
+class PrefixIndexError(ValueError):
+    pass
+
+
+class PrefixIndex:
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            header = self._read_header()
+        except (struct.error, ValueError, KeyError) as exc:
+            self._mmap.close()
+            raise PrefixIndexError(f"invalid prefix index: {exc}") from exc
+
+        self.header = header
+        self.width = header["width"]
+        base = header["base"]
+        view = memoryview(self._mmap)
+        self._views = [view]
+        self._tables = {}
+        for name, table in header["tables"].items():
+            count = table["count"]
+            keys = self._view(view, base + table["keys"], count, header["key_type"])
+            values = self._view(view, base + table["values"], count, "I")
+            self._tables[name] = (keys, values)
+
+        strings = header["strings"]
+        self._offsets = self._view(view, base + strings["offsets"], strings["count"] + 1, "I")
+        self._blob = base + strings["blob"]
+        self._country_time_zones = header["country_time_zones"]
+        self._regions = header["regions"]
+
+    def _read_header(self):
+        if self._mmap[:4] != MAGIC:
+            raise ValueError("bad magic")
+        (length,) = struct.unpack_from("<I", self._mmap, 4)
+        header = json.loads(self._mmap[8 : 8 + length].decode("utf-8"))
+        if header["format"] != FORMAT_VERSION or header["byteorder"] != sys.byteorder:
+            raise ValueError("unsupported format")
+        header["base"] = _align(8 + length)
+        return header
+
+    def _view(self, view, offset, count, typecode):
+        size = array(typecode).itemsize
+        section = view[offset : offset + count * size].cast(typecode)
+        self._views.append(section)
+        return section
+
+    @property
+    def stale(self):
+        return self.header["phonenumbers"] != phonenumbers.__version__
+
+    def counts(self):
+        return {name: self.header["tables"][name]["entries"] for name in self._tables}
+
+    def lookup(self, table, digits):
+        keys, values = self._tables[table]
+        position = bisect_right(keys, int(digits[: self.width])) - 1
+        if position < 0:
+            return None
+        value = values[position]
+        return None if value == MISSING else self._string(value)
+
+    def time_zones(self, digits):
+        value = self.lookup("timezone", digits)
+        return tuple(value.split("&")) if value else None
+
+    def country_time_zones(self, country_code):
+        value = self._country_time_zones.get(str(country_code))
+        return tuple(value.split("&")) if value else None
+
+    def region_name(self, region_code):
+        return self._regions.get(region_code, "")
+
+    def _string(self, position):
+        start = self._blob + self._offsets[position]
+        end = self._blob + self._offsets[position + 1]
+        return self._mmap[start:end].decode("utf-8")
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+
+def _align(offset, size=8):
+    return (offset + size - 1) // size * size
+
+
+def _phonenumbers_sources():
+    from phonenumbers import COUNTRY_CODE_TO_REGION_CODE, geocoder
+    from phonenumbers.carrierdata import CARRIER_DATA
+    from phonenumbers.geodata import GEOCODE_DATA
+    from phonenumbers.geodata.locale import LOCALE_DATA
+    from phonenumbers.tzdata import TIMEZONE_DATA, TIMEZONE_LONGEST_PREFIX
+
+    country_time_zones = {}
+    for country_code in COUNTRY_CODE_TO_REGION_CODE:
+        code = str(country_code)
+        # Mirrors phonenumbers' country-level fallback for non-geographic numbers.
+        for length in range(TIMEZONE_LONGEST_PREFIX, 0, -1):
+            zones = TIMEZONE_DATA.get(code[: 1 + length])
+            if zones:
+                country_time_zones[code] = "&".join(zones)
+                break
+
+    return {
+        "geo": {prefix: names["en"] for prefix, names in GEOCODE_DATA.items() if "en" in names},
+        "carrier": {prefix: names["en"] for prefix, names in CARRIER_DATA.items() if "en" in names},
+        "timezone": {prefix: "&".join(zones) for prefix, zones in TIMEZONE_DATA.items()},
+        "country_time_zones": country_time_zones,
+        "regions": {
+            region: geocoder._region_display_name(region, "en") for region in LOCALE_DATA
+        },
+    }
+
+
+def _flatten(prefixes, width, string_ids):
+    # Every prefix covers a range of zero-padded keys. Ranges nest, so the
+    # innermost one wins; flattening them into sorted boundaries turns a
+    # longest-prefix match into one binary search.
+    intervals = []
+    for prefix, value in prefixes.items():
+        scale = 10 ** (width - len(prefix))
+        intervals.append((int(prefix) * scale, (int(prefix) + 1) * scale, string_ids[value]))
+    intervals.sort(key=lambda item: (item[0], -item[1]))
+
+    starts = []
+    values = []
+
+    def emit(position, value):
+        if starts and starts[-1] == position:
+            starts.pop()
+            values.pop()
+        if values and values[-1] == value:
+            return
+        starts.append(position)
+        values.append(value)
+
+    stack = []
+    for start, end, value in intervals:
+        while stack and stack[-1][0] <= start:
+            ended = stack.pop()[0]
+            emit(ended, stack[-1][1] if stack else MISSING)
+        emit(start, value)
+        stack.append((end, value))
+    while stack:
+        ended = stack.pop()[0]
+        emit(ended, stack[-1][1] if stack else MISSING)
+    return starts, values
+
+
+def build_prefix_index(path=None, sources=None):
+    path = Path(path or _CONFIG["path"])
+    sources = sources or _phonenumbers_sources()
+
+    width = max(len(prefix) for name in TABLES for prefix in sources[name])
+    key_type = "I" if 10**width <= MISSING else "Q"
+
+    strings = sorted({value for name in TABLES for value in sources[name].values()})
+    string_ids = {value: position for position, value in enumerate(strings)}
+
+    sections = []
+    offset = 0
+
+    def add_section(payload):
+        nonlocal offset
+        start = offset
+        sections.append(payload)
+        offset += len(payload)
+        padding = _align(offset) - offset
+        if padding:
+            sections.append(b"\0" * padding)
+            offset += padding
+        return start
+
+    tables = {}
+    for name in TABLES:
+        starts, values = _flatten(sources[name], width, string_ids)
+        tables[name] = {
+            "entries": len(sources[name]),
+            "count": len(starts),
+            "keys": add_section(array(key_type, starts).tobytes()),
+            "values": add_section(array("I", values).tobytes()),
+        }
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = array("I", [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    string_offsets = add_section(offsets.tobytes())
+    blob = add_section(b"".join(encoded))
+
+    header = json.dumps(
+        {
+            "format": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "phonenumbers": phonenumbers.__version__,
+            "width": width,
+            "key_type": key_type,
+            "tables": tables,
+            "strings": {"count": len(strings), "offsets": string_offsets, "blob": blob},
+            "country_time_zones": sources["country_time_zones"],
+            "regions": sources["regions"],
+        },
+        sort_keys=True,
+    ).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(struct.pack("<I", len(header)))
+        handle.write(header)
+        handle.write(b"\0" * (_align(8 + len(header)) - 8 - len(header)))
+        for payload in sections:
+            handle.write(payload)
+    os.replace(temp_path, path)
+    _reset()
+
+    return {
+        "path": str(path),
+        "size": path.stat().st_size,
+        "tables": {name: tables[name]["entries"] for name in TABLES},
+    }
+
+
+def _reset():
+    global _INDEX, _LOADED
+    with _LOCK:
+        # Other threads may still hold the old index, so leave it to the GC.
+        _INDEX = None
+        _LOADED = False
+
+
+def _open_index(path):
+    try:
+        index = PrefixIndex(path)
+    except (OSError, ValueError):
+        return None
+    if index.stale:
+        index.close()
+        return None
+    return index
+
+
+def get_prefix_index():
+    global _INDEX, _LOADED
+    if not _CONFIG["enabled"]:
+        return None
+    if not _LOADED:
+        with _LOCK:
+            if not _LOADED:
+                _INDEX = _open_index(_CONFIG["path"])
+                _LOADED = True
+    return _INDEX
+
+
+def configure_prefix_index(path=None, enabled=None):
+    with _LOCK:
+        if path is not None:
+            _CONFIG["path"] = str(path)
+        if enabled is not None:
+            _CONFIG["enabled"] = bool(enabled)
+    _reset()
+
+
+def prefix_index_config():
+    with _LOCK:
+        return dict(_CONFIG)
+
+
+def prefix_index_version():
+    # Pool workers must reopen the index after a rebuild, not only on a
+    # config change.
+    config = prefix_index_config()
+    try:
+        stat = os.stat(config["path"])
+    except OSError:
+        return (config["path"], config["enabled"], None)
+    return (config["path"], config["enabled"], stat.st_mtime_ns, stat.st_size)
+
+
+def prefix_index_status():
+    config = prefix_index_config()
+    status = {"path": config["path"], "enabled": config["enabled"], "state": "missing"}
+    try:
+        index = PrefixIndex(config["path"])
+    except FileNotFoundError:
+        return status
+    except (OSError, ValueError):
+        status["state"] = "invalid"
+        return status
+
+    try:
+        status.update(
+            state="stale" if index.stale else "ready",
+            size=os.path.getsize(config["path"]),
+            phonenumbers=index.header["phonenumbers"],
+            tables=index.counts(),
+        )
+    finally:
+        index.close()
+    return status
@@ -1,3 +1,7 @@
+RISK_ORDER = {"High": 3, "Medium": 2, "Low": 1}
+UNRESOLVED_OWNER_NAMES = {"unknown", "", "lookup disabled"}
+
+
 def calculate_risk(is_voip, carrier, line_type="UNKNOWN", owner_profile=None):
     score = 0
 
@@ -15,7 +19,7 @@ def calculate_risk(is_voip, carrier, line_type="UNKNOWN", owner_profile=None):
         owner_name = str(owner_profile.get("name", "Unknown")).strip().lower()
         confidence = str(owner_profile.get("confidence", "Low")).strip().lower()
 
-        if owner_name in {"unknown", "", "lookup disabled"}:
+        if owner_name in UNRESOLVED_OWNER_NAMES:
             score += 10
         elif confidence == "low":
             score += 5
@@ -26,3 +30,17 @@ def calculate_risk(is_voip, carrier, line_type="UNKNOWN", owner_profile=None):
         return "Medium"
     else:
         return "Low"
+
+
+def triage_score(result):
+    score = RISK_ORDER.get(str(result.get("risk", "Low")), 0) * 100
+
+    owner = result.get("owner") or {}
+    if str(owner.get("name", "Unknown")).strip().lower() in UNRESOLVED_OWNER_NAMES:
+        score += 20
+    if str(result.get("carrier", "")).lower() == "unknown":
+        score += 15
+    if result.get("voip"):
+        score += 20
+
+    return score
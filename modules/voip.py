@@ -1,4 +1,6 @@
 from phonenumbers import number_type, PhoneNumberType
 
-def is_voip(parsed):
-    return number_type(parsed) == PhoneNumberType.VOIP
+def is_voip(parsed, ntype=None):
+    if ntype is None:
+        ntype = number_type(parsed)
+    return ntype == PhoneNumberType.VOIP
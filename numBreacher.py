@@ -1,15 +1,42 @@
 import argparse
 import json
+import sqlite3
 import time
 from collections import Counter
+from datetime import datetime, timezone
 from difflib import get_close_matches
 from pathlib import Path
 
-from core.dataset_tools import diff_number_history, search_results, top_risks
-from core.scanner import scan_number
+from core.aggregates import DatasetAggregates
+from core.bulk_input import BulkInput, dedupe_numbers, peek_numbers
+from core.dataset_tools import (
+    count_results,
+    diff_number_history,
+    iter_result_file,
+    search_results,
+    top_risks,
+)
+from core.number_history import NUMBER_HISTORY, normalize_number
+from core.query import QueryError
+from core.result_archive import RESULT_ARCHIVE, RUN_ABORTED, RUN_COMPLETED, RUN_FAILED
+from core.result_cache import SCAN_RESULT_CACHE, scan_with_cache
+from core.result_store import ResultStore
+from core.scanner import SCAN_FIELDS, resolve_fields
 from core.settings import FrameworkSettings, PROFILE_PRESETS
-from core.validator import validate_number
-from engines.factory import available_engines, create_engine
+from core.stage_metrics import StageTimingCollector
+from core.validator import (
+    iter_validated,
+    normalize_region,
+    validate_number,
+    validation_summary,
+)
+from engines.factory import (
+    available_engines,
+    create_engine,
+    engine_pool_status,
+    shutdown_engines,
+)
+from engines.autoscale import ConcurrencyController
 from engines.workers import owner_lookup_worker, scan_number_worker
 from learning.glossary import GLOSSARY
 from learning.playbooks import PLAYBOOKS
@@ -23,11 +50,23 @@ from config.metadata import (
     VERSION,
 )
 from modules.intel import get_number_formats
-from modules.owner_osint import lookup_owner_name
+from modules.owner_cache import DEFAULT_CACHE_PATH
+from modules.owner_osint import (
+    OWNER_CACHE,
+    SOURCE_BREAKER,
+    configure_owner_rate_limit,
+    lookup_owner_name,
+)
+from modules.prefix_index import (
+    build_prefix_index,
+    configure_prefix_index,
+    prefix_index_status,
+)
 from reporter.reporter import Reporter
 from ui.banner import show_banner
 from ui.formatter import format_output
 from utils.helpers import save_result
+from utils.http_session import configure_http_pool
 from utils.logger import log
 
 
@@ -41,21 +80,26 @@ class NumBreacherCLI:
         "bf": "bulkfast",
         "w": "whois",
         "wb": "whoisbulk",
+        "vb": "validatebulk",
         "bv": "bulkview",
         "rb": "runbook",
         "sr": "searchresults",
         "tr": "toprisks",
+        "st": "stagetimes",
         "cfg": "status",
         "stats": "summary",
         "q": "exit",
     }
 
     def __init__(self):
-        self.last_results = []
+        self.last_results = ResultStore()
         self.last_bulk_metadata = {"skipped": 0, "elapsed_seconds": 0.0}
         self.settings = FrameworkSettings()
         self.reporter = Reporter()
         self._runbook_depth = 0
+        self._controller = None
+        self.stage_timings = StageTimingCollector()
+        self._apply_runtime_settings()
         self.command_handlers = {
             "help": self.handle_help,
             "scan": self.handle_scan,
@@ -69,7 +113,17 @@ class NumBreacherCLI:
             "workers": self.handle_workers,
             "autosummary": self.handle_auto_summary,
             "dedupe": self.handle_dedupe,
+            "stagetiming": self.handle_stage_timing,
+            "stagetimes": self.handle_stage_times,
             "bulkview": self.handle_bulk_view,
+            "bulkorder": self.handle_bulk_order,
+            "fields": self.handle_fields,
+            "queuedepth": self.handle_queue_depth,
+            "ratelimit": self.handle_rate_limit,
+            "httppool": self.handle_http_pool,
+            "ownercache": self.handle_owner_cache,
+            "scancache": self.handle_scan_cache,
+            "prefixdb": self.handle_prefix_db,
             "profile": self.handle_profile,
             "status": self.handle_status,
             "tips": self.handle_tips,
@@ -79,11 +133,15 @@ class NumBreacherCLI:
             "lessons": self.handle_lessons,
             "runbookstop": self.handle_runbook_stop,
             "validate": self.handle_validate,
+            "validatebulk": self.handle_validate_bulk,
             "clearresults": self.handle_clear_results,
             "runbook": self.handle_runbook,
             "searchresults": self.handle_search_results,
             "toprisks": self.handle_top_risks,
             "diff": self.handle_diff,
+            "timeline": self.handle_timeline,
+            "history": self.handle_history,
+            "archive": self.handle_archive,
             "summary": self.handle_summary,
             "report": self.handle_report,
             "reportjson": self.handle_report_json,
@@ -99,15 +157,18 @@ class NumBreacherCLI:
 Core Commands:
  scan <number>           Scan one phone number
  scanfast <number>       Scan without owner lookup
- bulk <file.txt>         Bulk scan from file
- bulkfast <file.txt>     Fast bulk scan (no owner lookup)
+ bulk <file> [CC]        Bulk scan from file, optional default region (e.g. US)
+                         (.gz/.bz2/.xz, CSV/TSV with column=<name|n>, '-' for stdin)
+ bulkfast <file> [CC]    Fast bulk scan (no owner lookup)
  runbook <file.txt>      Execute command script from file
  whois <number>          Owner OSINT lookup only
- whoisbulk <file.txt>    Bulk owner lookups
- validate <number>       Validate and normalize number formats
- searchresults <query>   Search in-memory results
- toprisks [n]            Show top n riskiest in-memory results
- diff <number>           Compare latest two scans of a number
+ whoisbulk <file> [CC]   Bulk owner lookups
+ validate <number> [CC]  Validate and normalize number formats
+ validatebulk <file>     Batch-validate a file [CC] and count by country code
+ searchresults <query>   Search in-memory results (text, or risk:High voip:true ...)
+ toprisks [n] [file]     Show top n riskiest results (in memory, or a .json/.jsonl export)
+ diff <number> [@a @b]   Compare two scans of a number (default: latest two)
+ timeline <number>       List carrier/risk/line type/owner changes across sessions
 
 Framework Commands:
  status                  Show framework status and session stats
@@ -117,12 +178,25 @@ Framework Commands:
  glossary [term]         Telecom recon glossary
  playbook [name]         Show guided investigation playbooks
  profile <name>          Apply profile: beginner/professional/speed/deep
- engine [name]           Show/set engine: threading, parallel, async
+ engine [name]           Show/set engine: threading, parallel, async, hybrid
  workers <number>        Set worker count (1-64)
+ workers auto [max]      Auto-tune concurrency (AIMD) up to max workers
+ queuedepth <n|auto>     Cap in-flight bulk tasks (auto scales with workers)
+ ratelimit <rps|off> [b] Owner lookup requests/sec per host, optional burst
+ httppool <n> [idle]     Keep-alive connections per host and idle eviction secs
+ ownercache [action]     Owner cache: stats, on, off, purge [expired], warm <file>
+ scancache [action]      Scan result cache: stats, on, off, purge [expired], ttl <hours>
+ prefixdb [action]       Compiled prefix index: status, build, on, off
+ history [action]        Per-number scan history: stats, on, off, purge
+ archive [action]        Result archive: stats, runs, load <run>, search <query>, prune <days>
  ownerlookup <on|off>    Toggle owner lookup in scan/bulk
  autosummary <on|off>    Auto print summary after bulk
  dedupe <on|off>         Remove duplicate numbers in bulk
+ stagetiming <on|off>    Record per-stage scan timings
+ stagetimes [reset]      Show p50/p95/p99 latency and runtime share per stage
  bulkview <mode>         Bulk output mode: full, compact, silent
+ bulkorder <mode>        Bulk emission order: ordered, unordered
+ fields <list|all>       Compute only these result fields in scan/bulk (e.g. risk,carrier)
  runbookstop <on|off>    Stop runbook when a command fails
  saveconfig <file.json>  Save framework settings
  loadconfig <file.json>  Load framework settings
@@ -195,6 +269,39 @@ General:
     def _current_workers(self):
         return self.settings.max_workers
 
+    def _concurrency_controller(self):
+        if not self.settings.auto_workers:
+            return None
+
+        ceiling = self._current_workers()
+        if self._controller is None:
+            self._controller = ConcurrencyController(
+                initial=max(1, min(ceiling, 4)),
+                maximum=ceiling,
+            )
+        elif self._controller.maximum != ceiling:
+            self._controller.resize(ceiling)
+        return self._controller
+
+    def _workers_label(self):
+        if not self.settings.auto_workers:
+            return str(self._current_workers())
+
+        if self._controller is None:
+            return f"auto (max={self._current_workers()}, not yet tuned)"
+
+        snapshot = self._controller.snapshot()
+        return (
+            f"auto (active={snapshot['limit']}, max={snapshot['maximum']}, "
+            f"error_rate={snapshot['error_rate']:.0%}, latency={snapshot['latency']:.2f}s)"
+        )
+
+    def _scan_fields(self):
+        try:
+            return resolve_fields(self.settings.scan_fields or None)
+        except ValueError:
+            return None
+
     def _owner_lookup_enabled(self):
         return self.settings.owner_lookup_enabled
 
@@ -203,9 +310,26 @@ General:
         print(output)
         save_result(output)
         result_dict = result.to_dict()
-        self.last_results.append(result_dict)
+        self._remember_result(result_dict)
+        self._flush_records()
         print(self.reporter.single_scan_terminal(result_dict))
 
+    def _remember_result(self, result):
+        self.last_results.append(result)
+        for name, store in (("history", NUMBER_HISTORY), ("archive", RESULT_ARCHIVE)):
+            try:
+                store.record(result)
+            except sqlite3.Error as exc:
+                log(f"{name}_error error={exc}")
+
+    def _flush_records(self):
+        for name, store in (("History", NUMBER_HISTORY), ("Archive", RESULT_ARCHIVE)):
+            try:
+                store.flush()
+            except sqlite3.Error as exc:
+                print(f"{name} error: {exc}")
+                log(f"{name.lower()}_error error={exc}")
+
     def _scan_and_record(self, number, enable_owner_lookup=None):
         valid, parsed = validate_number(number)
         if not valid:
@@ -217,37 +341,78 @@ General:
         if enable_owner_lookup is not None:
             lookup_enabled = enable_owner_lookup
 
-        result = scan_number(
+        timings = {} if self.settings.stage_timing else None
+        result, cached = scan_with_cache(
             parsed,
             original_number=number,
             enable_owner_lookup=lookup_enabled,
+            timings=timings,
+            fields=self._scan_fields(),
         )
+        if not cached:
+            self.stage_timings.record(timings)
         self._record_scan_result(result)
+        if cached:
+            print("Served from scan cache. Run `scancache purge` to force a fresh scan.")
         log(
             "scan_success "
-            f"number={number} risk={result.risk} "
+            f"number={number} risk={result.risk} cached={cached} "
             f"engine={self._current_engine_name()} owner_lookup={lookup_enabled}"
         )
         return True
 
-    def _read_bulk_numbers(self, file_path):
-        with open(file_path, encoding="utf-8") as handle:
-            return [line.strip() for line in handle if line.strip()]
+    @staticmethod
+    def _split_region_argument(value):
+        # A trailing two-letter token is a default region for numbers written
+        # without a country code: `bulk leads.txt GB`.
+        text = str(value or "").strip()
+        parts = text.rsplit(maxsplit=1)
+        if len(parts) == 2 and len(parts[1]) == 2 and parts[1].isalpha():
+            return parts[0], normalize_region(parts[1])
+        return text, None
+
+    @classmethod
+    def _split_bulk_argument(cls, value):
+        # `column=<name|n>` picks the number column of a CSV/TSV input and
+        # may sit before or after the region: `bulk leads.csv.gz column=phone GB`.
+        text = str(value or "").strip()
+        column = None
+        parts = text.rsplit(maxsplit=1)
+        if len(parts) == 2 and parts[1].lower().startswith("column="):
+            text, column = parts[0], parts[1].partition("=")[2]
+        file_path, region = cls._split_region_argument(text)
+        parts = file_path.rsplit(maxsplit=1)
+        if column is None and len(parts) == 2 and parts[1].lower().startswith("column="):
+            file_path, column = parts[0], parts[1].partition("=")[2]
+        return file_path, region, column or None
+
+    @staticmethod
+    def _validated_tasks(numbers, region, rejected, **fields):
+        for item in iter_validated(numbers, default_region=region):
+            if not item.valid:
+                rejected[item.reason] += 1
+                continue
+            yield dict(fields, number=item.number, parsed=item.parsed)
+
+    @staticmethod
+    def _rejected_label(rejected):
+        details = ", ".join(f"{reason}={count}" for reason, count in sorted(rejected.items()))
+        return f"{sum(rejected.values())} ({details})" if details else "0"
 
-    def _prepare_bulk_numbers(self, numbers):
+    def _dedupe_bulk_numbers(self, numbers, stats):
         if not self.settings.dedupe_bulk_numbers:
-            return numbers, 0
+            return numbers
+        return dedupe_numbers(numbers, stats, window=self.settings.bulk_dedupe_window)
 
-        unique = []
-        seen = set()
-        for number in numbers:
-            key = number.strip()
-            if key in seen:
-                continue
-            seen.add(key)
-            unique.append(number)
-        removed = len(numbers) - len(unique)
-        return unique, removed
+    @staticmethod
+    def _progress_due(index):
+        if index < 20:
+            return False
+        if index < 1000:
+            return index % 10 == 0
+        if index < 10000:
+            return index % 100 == 0
+        return index % 1000 == 0
 
     def _profile_names(self):
         return ", ".join(sorted(PROFILE_PRESETS.keys()))
@@ -276,9 +441,39 @@ General:
         if args.workers is not None:
             self.handle_workers(str(args.workers))
             ran = True
+        if args.queuedepth:
+            self.handle_queue_depth(args.queuedepth)
+            ran = True
+        if args.ratelimit:
+            self.handle_rate_limit(args.ratelimit)
+            ran = True
+        if args.httppool:
+            self.handle_http_pool(args.httppool)
+            ran = True
+        if args.ownercache:
+            self.handle_owner_cache(args.ownercache)
+            ran = True
+        if args.scancache:
+            self.handle_scan_cache(args.scancache)
+            ran = True
+        if args.prefixdb:
+            self.handle_prefix_db(args.prefixdb)
+            ran = True
+        if args.history:
+            self.handle_history(args.history)
+            ran = True
+        if args.archive:
+            self.handle_archive(args.archive)
+            ran = True
         if args.bulkview:
             self.handle_bulk_view(args.bulkview)
             ran = True
+        if args.bulkorder:
+            self.handle_bulk_order(args.bulkorder)
+            ran = True
+        if args.fields:
+            self.handle_fields(args.fields)
+            ran = True
         if args.runbookstop:
             self.handle_runbook_stop(args.runbookstop)
             ran = True
@@ -291,10 +486,16 @@ General:
         if args.dedupe:
             self.handle_dedupe(args.dedupe)
             ran = True
+        if args.stagetiming:
+            self.handle_stage_timing(args.stagetiming)
+            ran = True
 
         if args.validate:
             self.handle_validate(args.validate)
             ran = True
+        if args.validatebulk:
+            self.handle_validate_bulk(args.validatebulk)
+            ran = True
         if args.runbook:
             self.handle_runbook(args.runbook)
             ran = True
@@ -326,6 +527,9 @@ General:
         if args.diff:
             self.handle_diff(args.diff)
             ran = True
+        if args.timeline:
+            self.handle_timeline(args.timeline)
+            ran = True
 
         if args.status:
             self.handle_status("")
@@ -333,6 +537,9 @@ General:
         if args.summary:
             self.handle_summary("")
             ran = True
+        if args.stagetimes:
+            self.handle_stage_times("")
+            ran = True
         if args.tips:
             self.handle_tips("")
             ran = True
@@ -390,29 +597,40 @@ General:
     def handle_bulkfast(self, file_path):
         self._handle_bulk_impl(file_path, enable_owner_lookup=False)
 
-    def _handle_bulk_impl(self, file_path, enable_owner_lookup=None):
+    def _handle_bulk_impl(self, value, enable_owner_lookup=None):
+        try:
+            file_path, region, column = self._split_bulk_argument(value)
+        except ValueError as exc:
+            print(exc)
+            return
         if not file_path:
-            print("Usage: bulk <file.txt>")
+            print("Usage: bulk <file|-> [column=<name|n>] [region]")
             return
 
-        scanned = 0
-        skipped = 0
-        batch_results = []
-
         try:
-            numbers = self._read_bulk_numbers(file_path)
+            reader = BulkInput(file_path, column=column)
         except OSError as exc:
             print(f"Bulk error: {exc}")
             log(f"bulk_error file={file_path} error={exc}")
             return
 
-        if not numbers:
-            print("Bulk error: input file contains no numbers.")
+        with reader:
+            self._run_bulk_scan(file_path, reader, enable_owner_lookup, region)
+
+    def _run_bulk_scan(self, file_path, reader, enable_owner_lookup, region=None):
+        scanned = 0
+        skipped = 0
+        from_cache = 0
+        rejected = Counter()
+        batch = DatasetAggregates()
+
+        numbers = peek_numbers(reader)
+        if numbers is None:
+            print(f"Bulk error: {reader.error or 'input file contains no numbers.'}")
             return
 
-        numbers, removed_duplicates = self._prepare_bulk_numbers(numbers)
-        if removed_duplicates:
-            print(f"Deduped bulk input: removed {removed_duplicates} duplicate entries.")
+        dedupe_stats = {"removed": 0}
+        numbers = self._dedupe_bulk_numbers(numbers, dedupe_stats)
 
         lookup_enabled = self._owner_lookup_enabled()
         if enable_owner_lookup is not None:
@@ -423,14 +641,15 @@ General:
             output_mode = "full"
             self.settings.bulk_output_mode = "full"
 
-        tasks = [
-            {
-                "number": number,
-                "enable_owner_lookup": lookup_enabled,
-                "render_output": output_mode == "full",
-            }
-            for number in numbers
-        ]
+        tasks = self._validated_tasks(
+            numbers,
+            region,
+            rejected,
+            enable_owner_lookup=lookup_enabled,
+            render_output=output_mode == "full",
+            collect_timings=self.settings.stage_timing,
+            fields=self._scan_fields(),
+        )
 
         try:
             engine = create_engine(self._current_engine_name())
@@ -439,47 +658,86 @@ General:
             return
 
         start_time = time.perf_counter()
-        worker_results = engine.run(
-            scan_number_worker,
-            tasks,
-            max_workers=self._current_workers(),
-        )
-        elapsed = time.perf_counter() - start_time
-        total = len(worker_results)
+        RESULT_ARCHIVE.begin_run(f"bulk {file_path}")
+        status = RUN_FAILED
+        try:
+            stream = engine.run_iter(
+                scan_number_worker,
+                tasks,
+                max_workers=self._current_workers(),
+                ordered=self.settings.bulk_ordered_output,
+                queue_depth=self.settings.queue_depth,
+                controller=self._concurrency_controller(),
+            )
 
-        for index, item in enumerate(worker_results, start=1):
-            if item.get("ok"):
-                output = item.get("output", "")
-                result = item.get("result", {})
-                if output_mode == "full":
-                    print(output)
-                    save_result(output)
-                elif output_mode == "compact":
-                    print(self.reporter.single_scan_terminal(result))
-                self.last_results.append(result)
-                batch_results.append(result)
-                scanned += 1
-            else:
-                print(item.get("error", "Bulk scan worker failed."))
-                skipped += 1
+            for index, item in enumerate(stream, start=1):
+                if item.get("ok"):
+                    output = item.get("output", "")
+                    result = item.get("result", {})
+                    if output_mode == "full":
+                        print(output, flush=True)
+                        save_result(output)
+                    elif output_mode == "compact":
+                        print(self.reporter.single_scan_terminal(result), flush=True)
+                    self._remember_result(result)
+                    self.stage_timings.record(item.get("timings"))
+                    batch.add(result)
+                    scanned += 1
+                    if item.get("cached"):
+                        from_cache += 1
+                else:
+                    print(item.get("error", "Bulk scan worker failed."), flush=True)
+                    skipped += 1
 
-            if total >= 20 and (index % 10 == 0 or index == total):
-                print(f"Bulk progress: {index}/{total}")
+                if self._progress_due(index):
+                    risks = ""
+                    if batch.covers("risk"):
+                        risks = (
+                            f" (High={batch.risks.get('High', 0)}, "
+                            f"Medium={batch.risks.get('Medium', 0)}, "
+                            f"Low={batch.risks.get('Low', 0)})"
+                        )
+                    print(
+                        f"Bulk progress: {index} processed{risks} | {reader.progress_label()}",
+                        flush=True,
+                    )
+
+            status = RUN_COMPLETED
+        except KeyboardInterrupt:
+            status = RUN_ABORTED
+            raise
+        finally:
+            self._flush_records()
+            RESULT_ARCHIVE.end_run(status)
+
+        if reader.error:
+            print(f"Bulk input error: {reader.error} (input read up to {reader.progress_label()})")
+            log(f"bulk_input_error file={file_path} error={reader.error}")
+        if dedupe_stats["removed"]:
+            print(f"Deduped bulk input: removed {dedupe_stats['removed']} duplicate entries.")
+        if rejected:
+            print(f"Pre-validation dropped: {self._rejected_label(rejected)}")
+            skipped += sum(rejected.values())
 
+        elapsed = time.perf_counter() - start_time
         self.last_bulk_metadata = {"skipped": skipped, "elapsed_seconds": elapsed}
-        print(f"Bulk complete. Scanned: {scanned}, Skipped: {skipped}")
+        print(
+            f"Bulk complete. Scanned: {scanned}, Skipped: {skipped}, "
+            f"From cache: {from_cache}"
+        )
 
         log(
             "bulk_complete "
-            f"file={file_path} scanned={scanned} skipped={skipped} "
-            f"elapsed={elapsed:.3f}s engine={self._current_engine_name()} "
+            f"file={file_path} scanned={scanned} skipped={skipped} cached={from_cache} "
+            f"bytes={reader.bytes_read} elapsed={elapsed:.3f}s "
+            f"engine={self._current_engine_name()} "
             f"workers={self._current_workers()} owner_lookup={lookup_enabled}"
         )
 
         if self.settings.auto_summary_after_bulk:
             print(
                 self.reporter.bulk_terminal_summary(
-                    batch_results,
+                    batch,
                     scanned=scanned,
                     skipped=skipped,
                     engine_name=self._current_engine_name(),
@@ -521,24 +779,33 @@ General:
             for source in sources:
                 print(f" - {source}")
 
-    def handle_whois_bulk(self, file_path):
+    def handle_whois_bulk(self, value):
+        try:
+            file_path, region, column = self._split_bulk_argument(value)
+        except ValueError as exc:
+            print(exc)
+            return
         if not file_path:
-            print("Usage: whoisbulk <file.txt>")
+            print("Usage: whoisbulk <file|-> [column=<name|n>] [region]")
             return
 
         try:
-            numbers = self._read_bulk_numbers(file_path)
+            reader = BulkInput(file_path, column=column)
         except OSError as exc:
             print(f"Whois bulk error: {exc}")
             return
 
-        if not numbers:
-            print("Whois bulk error: input file contains no numbers.")
+        with reader:
+            self._run_whois_bulk(reader, region)
+
+    def _run_whois_bulk(self, reader, region=None):
+        numbers = peek_numbers(reader)
+        if numbers is None:
+            print(f"Whois bulk error: {reader.error or 'input file contains no numbers.'}")
             return
 
-        numbers, removed_duplicates = self._prepare_bulk_numbers(numbers)
-        if removed_duplicates:
-            print(f"Deduped whois input: removed {removed_duplicates} duplicate entries.")
+        dedupe_stats = {"removed": 0}
+        numbers = self._dedupe_bulk_numbers(numbers, dedupe_stats)
 
         try:
             engine = create_engine(self._current_engine_name())
@@ -546,33 +813,55 @@ General:
             print(exc)
             return
 
-        tasks = [{"number": number} for number in numbers]
-        start_time = time.perf_counter()
-        worker_results = engine.run(owner_lookup_worker, tasks, max_workers=self._current_workers())
-        elapsed = time.perf_counter() - start_time
-
+        rejected = Counter()
+        tasks = self._validated_tasks(numbers, region, rejected)
         successful = 0
         failed = 0
-        total = len(worker_results)
-        for index, item in enumerate(worker_results, start=1):
+        circuit_skipped = 0
+        start_time = time.perf_counter()
+        stream = engine.run_iter(
+            owner_lookup_worker,
+            tasks,
+            max_workers=self._current_workers(),
+            ordered=self.settings.bulk_ordered_output,
+            queue_depth=self.settings.queue_depth,
+            controller=self._concurrency_controller(),
+        )
+
+        for index, item in enumerate(stream, start=1):
             if item.get("ok"):
                 successful += 1
                 number = item.get("number", "Unknown")
                 owner = item.get("owner", {})
+                if owner.get("circuit_skipped"):
+                    circuit_skipped += 1
                 print(
                     f"[whois] {number} -> {owner.get('name', 'Unknown')} "
-                    f"({owner.get('confidence', 'Low')})"
+                    f"({owner.get('confidence', 'Low')})",
+                    flush=True,
                 )
             else:
                 failed += 1
-                print(item.get("error", "Owner lookup worker failed."))
+                print(item.get("error", "Owner lookup worker failed."), flush=True)
 
-            if total >= 20 and (index % 10 == 0 or index == total):
-                print(f"Whois progress: {index}/{total}")
+            if self._progress_due(index):
+                print(
+                    f"Whois progress: {index} processed | {reader.progress_label()}", flush=True
+                )
+
+        if reader.error:
+            print(f"Whois input error: {reader.error}")
+        if dedupe_stats["removed"]:
+            print(f"Deduped whois input: removed {dedupe_stats['removed']} duplicate entries.")
+        if rejected:
+            print(f"Pre-validation dropped: {self._rejected_label(rejected)}")
+            failed += sum(rejected.values())
+
+        elapsed = time.perf_counter() - start_time
 
         print(
             f"Whois bulk complete. Success: {successful}, Failed: {failed}, "
-            f"Runtime: {elapsed:.2f}s"
+            f"Circuit-skipped: {circuit_skipped}, Runtime: {elapsed:.2f}s"
         )
 
     def handle_owner_lookup(self, state):
@@ -596,7 +885,7 @@ General:
             available = ", ".join(available_engines())
             print(f"Current engine: {self._current_engine_name()}")
             print(f"Available engines: {available}")
-            print("Usage: engine <threading|parallel|async>")
+            print("Usage: engine <threading|parallel|async|hybrid>")
             return
 
         selected = value.strip().lower()
@@ -609,12 +898,21 @@ General:
 
     def handle_workers(self, value):
         if not value:
-            print(f"Current workers: {self._current_workers()}")
-            print("Usage: workers <number>")
+            print(f"Current workers: {self._workers_label()}")
+            print("Usage: workers <number> | workers auto [max]")
+            return
+
+        parts = value.strip().lower().split()
+        auto = parts[0] == "auto"
+        if auto and len(parts) == 1:
+            parts.append("64")
+
+        if len(parts) != (2 if auto else 1):
+            print("Usage: workers <number> | workers auto [max]")
             return
 
         try:
-            parsed = int(value.strip())
+            parsed = int(parts[-1])
         except ValueError:
             print("Workers must be an integer.")
             return
@@ -624,7 +922,370 @@ General:
             return
 
         self.settings.max_workers = parsed
-        print(f"Worker count set to {self._current_workers()}.")
+        self.settings.auto_workers = auto
+        if auto:
+            print(f"Auto concurrency enabled (max {parsed} workers).")
+        else:
+            print(f"Worker count set to {self._current_workers()}.")
+
+    def handle_queue_depth(self, value):
+        if not value:
+            print(f"Current queue depth: {self._queue_depth_label()}")
+            print("Usage: queuedepth <number|auto>")
+            return
+
+        normalized = value.strip().lower()
+        if normalized == "auto":
+            self.settings.queue_depth = 0
+            print("Queue depth set to auto.")
+            return
+
+        try:
+            parsed = int(normalized)
+        except ValueError:
+            print("Queue depth must be an integer or 'auto'.")
+            return
+
+        if parsed < 1 or parsed > 100000:
+            print("Queue depth must be between 1 and 100000.")
+            return
+
+        self.settings.queue_depth = parsed
+        print(f"Queue depth set to {parsed}.")
+
+    def _queue_depth_label(self):
+        if self.settings.queue_depth > 0:
+            return str(self.settings.queue_depth)
+        return "auto"
+
+    def handle_rate_limit(self, value):
+        if not value:
+            print(f"Current owner rate limit: {self._rate_limit_label()}")
+            print("Usage: ratelimit <requests_per_second|off> [burst]")
+            return
+
+        parts = value.split()
+        if parts[0].lower() == "off":
+            self.settings.owner_rate_limit = 0.0
+            self._apply_runtime_settings()
+            print("Owner rate limit disabled.")
+            return
+
+        try:
+            rate = float(parts[0])
+            burst = int(parts[1]) if len(parts) > 1 else self.settings.owner_rate_burst
+        except ValueError:
+            print("Usage: ratelimit <requests_per_second|off> [burst]")
+            return
+
+        if rate <= 0 or rate > 100:
+            print("Rate must be between 0 and 100 requests per second.")
+            return
+        if burst < 1 or burst > 100:
+            print("Burst must be between 1 and 100.")
+            return
+
+        self.settings.owner_rate_limit = rate
+        self.settings.owner_rate_burst = burst
+        self._apply_runtime_settings()
+        print(f"Owner rate limit set to {self._rate_limit_label()}.")
+
+    def _rate_limit_label(self):
+        if self.settings.owner_rate_limit <= 0:
+            return "off"
+        return (
+            f"{self.settings.owner_rate_limit:g} req/s "
+            f"(burst {self.settings.owner_rate_burst})"
+        )
+
+    @staticmethod
+    def _breaker_label():
+        snapshot = SOURCE_BREAKER.snapshot()
+        label = (
+            f"circuit {snapshot['state']} (trips={snapshot['trips']}, "
+            f"skipped={snapshot['skipped']}, error rate={snapshot['error_rate']:.0%})"
+        )
+        if snapshot["state"] == "open":
+            label += f", retry in {snapshot['retry_in']:.0f}s"
+        return label
+
+    def handle_http_pool(self, value):
+        if not value:
+            print(f"Current HTTP pool: {self._http_pool_label()}")
+            print("Usage: httppool <size> [idle_seconds]")
+            return
+
+        parts = value.split()
+        try:
+            size = int(parts[0])
+            idle = float(parts[1]) if len(parts) > 1 else self.settings.http_idle_timeout
+        except ValueError:
+            print("Usage: httppool <size> [idle_seconds]")
+            return
+
+        if size < 1 or size > 256:
+            print("Pool size must be between 1 and 256.")
+            return
+        if idle < 0 or idle > 3600:
+            print("Idle timeout must be between 0 and 3600 seconds.")
+            return
+
+        self.settings.http_pool_size = size
+        self.settings.http_idle_timeout = idle
+        self._apply_runtime_settings()
+        print(f"HTTP pool set to {self._http_pool_label()}.")
+
+    def _http_pool_label(self):
+        return (
+            f"{self.settings.http_pool_size} connections/host, "
+            f"idle eviction {self.settings.http_idle_timeout:g}s"
+        )
+
+    def _apply_runtime_settings(self):
+        configure_owner_rate_limit(
+            self.settings.owner_rate_limit,
+            self.settings.owner_rate_burst,
+        )
+        configure_http_pool(self.settings.http_pool_size, self.settings.http_idle_timeout)
+        OWNER_CACHE.configure(
+            path=self.settings.owner_cache_path or DEFAULT_CACHE_PATH,
+            positive_ttl=self.settings.owner_cache_ttl_hours * 3600,
+            negative_ttl=self.settings.owner_cache_negative_ttl_hours * 3600,
+            max_entries=self.settings.owner_cache_max_entries,
+            enabled=self.settings.owner_cache_enabled,
+        )
+        SCAN_RESULT_CACHE.configure(
+            ttl=self.settings.scan_cache_ttl_hours * 3600,
+            enabled=self.settings.scan_cache_enabled,
+        )
+        configure_prefix_index(enabled=self.settings.prefix_index_enabled)
+        NUMBER_HISTORY.configure(enabled=self.settings.history_enabled)
+        RESULT_ARCHIVE.configure(enabled=self.settings.archive_enabled)
+
+    def handle_owner_cache(self, value):
+        parts = str(value or "").split(maxsplit=1)
+        action = parts[0].lower() if parts else "stats"
+        argument = parts[1].strip() if len(parts) > 1 else ""
+
+        if action in {"on", "off"}:
+            self.settings.owner_cache_enabled = action == "on"
+            self._apply_runtime_settings()
+            print(f"Owner cache {'enabled' if action == 'on' else 'disabled'}.")
+            return
+        if action == "purge":
+            expired_only = argument.lower() == "expired"
+            try:
+                removed = OWNER_CACHE.purge(expired_only=expired_only)
+            except sqlite3.Error as exc:
+                print(f"Owner cache error: {exc}")
+                return
+            label = "expired " if expired_only else ""
+            print(f"Owner cache purged: removed {removed} {label}entries.")
+            return
+        if action == "warm":
+            self._warm_owner_cache(argument)
+            return
+        if action != "stats":
+            print("Usage: ownercache [stats|on|off|purge [expired]|warm <file.txt>]")
+            return
+
+        try:
+            stats = OWNER_CACHE.stats()
+        except sqlite3.Error as exc:
+            print(f"Owner cache error: {exc}")
+            return
+
+        print("\nOwner Cache")
+        print("-" * 40)
+        print(f"Status         : {'On' if self.settings.owner_cache_enabled else 'Off'}")
+        print(f"Path           : {stats['path']}")
+        print(
+            f"Entries        : {stats['entries']}/{stats['max_entries']} "
+            f"(positive={stats['positive']}, negative={stats['negative']}, "
+            f"expired={stats['expired']})"
+        )
+        print(
+            f"TTL            : {self.settings.owner_cache_ttl_hours:g}h positive, "
+            f"{self.settings.owner_cache_negative_ttl_hours:g}h negative"
+        )
+        print(
+            f"Lookups        : hits={stats['hits']}, misses={stats['misses']}, "
+            f"hit rate={stats['hit_rate']:.1%}"
+        )
+        print(f"Stores         : {stats['stores']} (evicted {stats['evictions']})")
+        print(f"Coalesced      : {stats['coalesced']} duplicate in-flight lookups shared")
+
+    def handle_scan_cache(self, value):
+        parts = str(value or "").split(maxsplit=1)
+        action = parts[0].lower() if parts else "stats"
+        argument = parts[1].strip() if len(parts) > 1 else ""
+
+        if action in {"on", "off"}:
+            self.settings.scan_cache_enabled = action == "on"
+            self._apply_runtime_settings()
+            print(f"Scan cache {'enabled' if action == 'on' else 'disabled'}.")
+            return
+        if action == "ttl":
+            try:
+                hours = float(argument)
+            except ValueError:
+                print("Usage: scancache ttl <hours>")
+                return
+            if hours < 0:
+                print("Scan cache TTL cannot be negative.")
+                return
+            self.settings.scan_cache_ttl_hours = hours
+            self._apply_runtime_settings()
+            print(f"Scan cache TTL set to {hours:g}h.")
+            return
+        if action == "purge":
+            expired_only = argument.lower() == "expired"
+            try:
+                removed = SCAN_RESULT_CACHE.purge(expired_only=expired_only)
+            except sqlite3.Error as exc:
+                print(f"Scan cache error: {exc}")
+                return
+            label = "expired " if expired_only else ""
+            print(f"Scan cache purged: removed {removed} {label}entries.")
+            return
+        if action != "stats":
+            print("Usage: scancache [stats|on|off|purge [expired]|ttl <hours>]")
+            return
+
+        try:
+            stats = SCAN_RESULT_CACHE.stats()
+        except sqlite3.Error as exc:
+            print(f"Scan cache error: {exc}")
+            return
+
+        print("\nScan Cache")
+        print("-" * 40)
+        print(f"Status         : {'On' if self.settings.scan_cache_enabled else 'Off'}")
+        print(f"Path           : {stats['path']}")
+        print(f"Entries        : {stats['entries']} (expired={stats['expired']})")
+        print(f"TTL            : {self.settings.scan_cache_ttl_hours:g}h")
+        print(
+            f"Session        : hits={stats['hits']}, misses={stats['misses']}, "
+            f"hit rate={stats['hit_rate']:.1%}"
+        )
+
+    def handle_prefix_db(self, value):
+        action = str(value or "status").strip().lower()
+
+        if action in {"on", "off"}:
+            self.settings.prefix_index_enabled = action == "on"
+            self._apply_runtime_settings()
+            print(f"Prefix index {'enabled' if action == 'on' else 'disabled'}.")
+            return
+        if action == "build":
+            print("Compiling prefix index from phonenumbers metadata...")
+            start_time = time.perf_counter()
+            try:
+                built = build_prefix_index()
+            except OSError as exc:
+                print(f"Prefix index error: {exc}")
+                return
+            tables = built["tables"]
+            print(
+                f"Prefix index built: {built['path']} ({built['size'] / 1048576:.1f} MB, "
+                f"geo={tables['geo']}, carrier={tables['carrier']}, "
+                f"timezone={tables['timezone']}) in {time.perf_counter() - start_time:.2f}s"
+            )
+            log(f"prefix_index_built path={built['path']} size={built['size']}")
+            return
+        if action != "status":
+            print("Usage: prefixdb [status|build|on|off]")
+            return
+
+        status = prefix_index_status()
+        print("\nPrefix Index")
+        print("-" * 40)
+        print(f"Status         : {'On' if self.settings.prefix_index_enabled else 'Off'}")
+        print(f"Path           : {status['path']}")
+        print(f"State          : {status['state']}")
+        if status["state"] in {"ready", "stale"}:
+            tables = status["tables"]
+            print(f"Size           : {status['size'] / 1048576:.1f} MB")
+            print(
+                f"Prefixes       : geo={tables['geo']}, carrier={tables['carrier']}, "
+                f"timezone={tables['timezone']}"
+            )
+            print(f"Built from     : phonenumbers {status['phonenumbers']}")
+        if status["state"] != "ready":
+            print("Lookups use phonenumbers directly. Run `prefixdb build` to compile the index.")
+
+    def _prefix_db_label(self):
+        if not self.settings.prefix_index_enabled:
+            return "Off"
+        return prefix_index_status()["state"].capitalize()
+
+    def _warm_owner_cache(self, value):
+        try:
+            file_path, region, column = self._split_bulk_argument(value)
+        except ValueError as exc:
+            print(exc)
+            return
+        if not file_path:
+            print("Usage: ownercache warm <file|-> [column=<name|n>] [region]")
+            return
+        if not self.settings.owner_cache_enabled:
+            print("Owner cache is off. Enable it with `ownercache on` first.")
+            return
+
+        try:
+            reader = BulkInput(file_path, column=column)
+        except OSError as exc:
+            print(f"Owner cache warm error: {exc}")
+            return
+
+        with reader:
+            numbers = peek_numbers(reader)
+            if numbers is None:
+                print(
+                    "Owner cache warm error: "
+                    f"{reader.error or 'input file contains no numbers.'}"
+                )
+                return
+
+            try:
+                engine = create_engine(self._current_engine_name())
+            except ValueError as exc:
+                print(exc)
+                return
+
+            before = OWNER_CACHE.stats()["entries"]
+            dedupe_stats = {"removed": 0}
+            tasks = self._validated_tasks(
+                self._dedupe_bulk_numbers(numbers, dedupe_stats),
+                region,
+                Counter(),
+            )
+            processed = 0
+            start_time = time.perf_counter()
+            stream = engine.run_iter(
+                owner_lookup_worker,
+                tasks,
+                max_workers=self._current_workers(),
+                queue_depth=self.settings.queue_depth,
+                controller=self._concurrency_controller(),
+            )
+            for index, _ in enumerate(stream, start=1):
+                processed = index
+                if self._progress_due(index):
+                    print(
+                        f"Owner cache warm progress: {index} processed | "
+                        f"{reader.progress_label()}",
+                        flush=True,
+                    )
+        if reader.error:
+            print(f"Owner cache warm input error: {reader.error}")
+
+        added = OWNER_CACHE.stats()["entries"] - before
+        print(
+            f"Owner cache warm complete. Processed: {processed}, "
+            f"New entries: {max(0, added)}, "
+            f"Runtime: {time.perf_counter() - start_time:.2f}s"
+        )
 
     def handle_auto_summary(self, value):
         if not value:
@@ -658,6 +1319,44 @@ General:
         status = "enabled" if self.settings.dedupe_bulk_numbers else "disabled"
         print(f"Bulk dedupe {status}.")
 
+    def handle_stage_timing(self, value):
+        if not value:
+            current = "on" if self.settings.stage_timing else "off"
+            print(f"stagetiming is currently {current}")
+            print("Usage: stagetiming <on|off>")
+            return
+
+        normalized = value.strip().lower()
+        if normalized not in {"on", "off"}:
+            print("Usage: stagetiming <on|off>")
+            return
+
+        self.settings.stage_timing = normalized == "on"
+        status = "enabled" if self.settings.stage_timing else "disabled"
+        print(f"Stage timing {status}.")
+
+    def handle_stage_times(self, value):
+        if str(value or "").strip().lower() == "reset":
+            self.stage_timings.clear()
+            print("Stage timings cleared.")
+            return
+
+        summary = self.stage_timings.summary()
+        if not summary["records"]:
+            print("No stage timings recorded. Enable with `stagetiming on` and run a scan.")
+            return
+
+        print(f"\nStage Timings ({summary['records']} records)")
+        print("-" * 40)
+        print(f"{'Stage':12} {'Count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Share':>7}")
+        for row in summary["stages"]:
+            print(
+                f"{row['stage']:12} {row['count']:>8} "
+                f"{row['p50'] * 1000:>9.2f} {row['p95'] * 1000:>9.2f} "
+                f"{row['p99'] * 1000:>9.2f} {row['share']:>7.1%}"
+            )
+        print(f"Total stage time: {summary['total_seconds']:.3f}s")
+
     def handle_runbook_stop(self, value):
         if not value:
             current = "on" if self.settings.runbook_stop_on_error else "off"
@@ -688,6 +1387,40 @@ General:
         self.settings.bulk_output_mode = normalized
         print(f"Bulk output mode set to {normalized}.")
 
+    def handle_bulk_order(self, value):
+        if not value:
+            current = "ordered" if self.settings.bulk_ordered_output else "unordered"
+            print(f"Current bulkorder mode: {current}")
+            print("Usage: bulkorder <ordered|unordered>")
+            return
+
+        normalized = value.strip().lower()
+        if normalized not in {"ordered", "unordered"}:
+            print("Usage: bulkorder <ordered|unordered>")
+            return
+
+        self.settings.bulk_ordered_output = normalized == "ordered"
+        print(f"Bulk emission order set to {normalized}.")
+
+    def handle_fields(self, value):
+        if not value:
+            current = self._scan_fields()
+            print(f"Current fields: {', '.join(current) if current else 'all'}")
+            print(f"Usage: fields <list|all>  (available: {', '.join(SCAN_FIELDS)})")
+            return
+
+        try:
+            fields = resolve_fields(value)
+        except ValueError as exc:
+            print(exc)
+            return
+
+        self.settings.scan_fields = ",".join(fields) if fields else ""
+        if fields is None:
+            print("Scans compute all fields.")
+        else:
+            print(f"Scans compute only: {', '.join(fields)} (dependencies included).")
+
     def handle_glossary(self, term):
         target = str(term or "").strip().lower()
         if not target:
@@ -824,12 +1557,18 @@ General:
             print("No in-memory results to search.")
             return
 
-        matches = search_results(self.last_results, query, limit=25)
+        try:
+            total = count_results(self.last_results, query)
+            matches = search_results(self.last_results, query, limit=25)
+        except QueryError as exc:
+            print(exc)
+            return
         if not matches:
             print(f"No results matched query: {query}")
             return
 
-        print(f"\nSearch Results for '{query}' ({len(matches)} matches)")
+        shown = f", showing {len(matches)}" if total > len(matches) else ""
+        print(f"\nSearch Results for '{query}' ({total} matches{shown})")
         print("-" * 40)
         for item in matches:
             number = item.get("number", "Unknown")
@@ -842,18 +1581,24 @@ General:
             )
 
     def handle_top_risks(self, value):
-        if not self.last_results:
-            print("No in-memory results available.")
-            return
+        target, _, file_path = str(value or "").strip().partition(" ")
+        if target and not target.isdigit():
+            target, file_path = "", str(value).strip()
+        limit = max(1, min(100, int(target or "10")))
+        file_path = file_path.strip()
 
-        target = str(value or "10").strip()
-        try:
-            limit = max(1, min(100, int(target)))
-        except ValueError:
-            print("Usage: toprisks [n]")
+        if file_path:
+            try:
+                results = top_risks(iter_result_file(file_path), limit=limit)
+            except (OSError, ValueError) as exc:
+                print(f"Toprisks error: {exc}")
+                return
+        elif not self.last_results:
+            print("No in-memory results available.")
             return
+        else:
+            results = top_risks(self.last_results, limit=limit)
 
-        results = top_risks(self.last_results, limit=limit)
         print(f"\nTop Risks ({len(results)})")
         print("-" * 40)
         for index, item in enumerate(results, start=1):
@@ -867,25 +1612,230 @@ General:
                 f"line_type={line_type} | owner={owner_name}"
             )
 
-    def handle_diff(self, number):
-        if not number:
-            print("Usage: diff <number>")
+    @staticmethod
+    def _history_time(recorded):
+        return datetime.fromtimestamp(recorded, timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ")
+
+    def handle_diff(self, value):
+        parts = str(value or "").split()
+        points = []
+        while parts and parts[-1].startswith("@") and len(points) < 2:
+            points.insert(0, parts.pop())
+        number = " ".join(parts)
+        if not number or len(points) == 1:
+            print("Usage: diff <number> [@old @new]")
+            return
+        try:
+            old, new = (int(point[1:]) for point in points) if points else (-2, -1)
+        except ValueError:
+            print("Usage: diff <number> [@old @new]  (points are 1-based; @-1 is the latest)")
             return
 
-        result = diff_number_history(self.last_results, number)
+        if not self.settings.history_enabled:
+            result = diff_number_history(self.last_results, number) if not points else None
+        else:
+            try:
+                result = NUMBER_HISTORY.diff(normalize_number({"number": number}), old, new)
+            except sqlite3.Error as exc:
+                print(f"History error: {exc}")
+                return
         if result is None:
             print("No diff available. Need at least two scans for the same number.")
             return
 
         print(f"\nDiff for {result['number']}")
         print("-" * 40)
+        if "old" in result:
+            for label in ("old", "new"):
+                point = result[label]
+                when = self._history_time(point["recorded"])
+                print(f"{label.title():<4}: #{point['seq']} at {when}")
         if not result["changed"]:
-            print("No changes detected between latest two scans.")
+            print("No changes detected between these scans.")
             return
 
         for key, change in result["changes"].items():
             print(f"- {key}: {change.get('old')} -> {change.get('new')}")
 
+    def handle_timeline(self, number):
+        number = str(number or "").strip()
+        if not number:
+            print("Usage: timeline <number>")
+            return
+
+        target = normalize_number({"number": number})
+        try:
+            events = NUMBER_HISTORY.timeline(target)
+        except sqlite3.Error as exc:
+            print(f"History error: {exc}")
+            return
+        if not events:
+            print(f"No recorded history for {target}.")
+            return
+
+        print(f"\nTimeline for {target}")
+        print("-" * 40)
+        for event in events:
+            when = self._history_time(event["recorded"])
+            if not event["changes"]:
+                fields = event["snapshot"]
+                summary = ", ".join(
+                    f"{key}={fields[key]}"
+                    for key in ("carrier", "risk", "line_type", "owner.name")
+                    if key in fields
+                )
+                print(f"#{event['seq']} {when} first seen: {summary}")
+                continue
+            changes = ", ".join(
+                f"{key}: {change['old']} -> {change['new']}"
+                for key, change in event["changes"].items()
+            )
+            print(f"#{event['seq']} {when} {changes}")
+
+    def handle_archive(self, value):
+        action, _, argument = str(value or "stats").strip().partition(" ")
+        action = action.lower()
+        argument = argument.strip()
+
+        if action in {"on", "off"}:
+            self.settings.archive_enabled = action == "on"
+            self._apply_runtime_settings()
+            print(f"Result archive {'enabled' if action == 'on' else 'disabled'}.")
+            return
+        handlers = {
+            "stats": self._archive_stats,
+            "runs": self._archive_runs,
+            "load": self._archive_load,
+            "search": self._archive_search,
+            "prune": self._archive_prune,
+        }
+        handler = handlers.get(action)
+        if handler is None:
+            print(
+                "Usage: archive [stats|on|off|runs [n]|load <run|latest>|"
+                "search <query>|prune <days>]"
+            )
+            return
+        try:
+            handler(argument)
+        except sqlite3.Error as exc:
+            print(f"Archive error: {exc}")
+
+    def _archive_stats(self, _):
+        stats = RESULT_ARCHIVE.stats()
+        print("\nResult Archive")
+        print("-" * 40)
+        print(f"Status         : {'On' if self.settings.archive_enabled else 'Off'}")
+        print(f"Path           : {stats['path']}")
+        print(f"Results        : {stats['results']} across {stats['runs']} runs")
+        if stats["results"]:
+            print(f"Oldest         : {self._history_time(stats['oldest'])}")
+            print(f"Newest         : {self._history_time(stats['newest'])}")
+
+    def _archive_runs(self, value):
+        try:
+            limit = max(1, int(value or 20))
+        except ValueError:
+            print("Usage: archive runs [n]")
+            return
+        runs = RESULT_ARCHIVE.runs(limit)
+        if not runs:
+            print("No archived runs.")
+            return
+        print("\nArchived Runs")
+        print("-" * 40)
+        for run in runs:
+            status = f" | {run['status']}" if run["status"] else ""
+            print(
+                f"#{run['id']} {self._history_time(run['started'])} | "
+                f"results={run['results']} | {run['label']}{status}"
+            )
+
+    def _archive_load(self, value):
+        target = value.lower()
+        if target == "latest":
+            run = RESULT_ARCHIVE.latest_run()
+        else:
+            try:
+                run = int(target.lstrip("#"))
+            except ValueError:
+                print("Usage: archive load <run|latest>")
+                return
+
+        self.last_results.clear()
+        self.last_bulk_metadata = {"skipped": 0, "elapsed_seconds": 0.0}
+        self.last_results.extend(RESULT_ARCHIVE.load_run(run) if run is not None else ())
+        if not self.last_results:
+            print(f"No archived results for run {value}.")
+            return
+        print(f"Loaded {len(self.last_results)} results from run #{run} into memory.")
+
+    def _archive_search(self, query):
+        if not query:
+            print("Usage: archive search <query>")
+            return
+        try:
+            total, matches = RESULT_ARCHIVE.search(query, limit=25)
+        except QueryError as exc:
+            print(exc)
+            return
+        if not matches:
+            print(f"No archived results matched query: {query}")
+            return
+
+        shown = f", showing {len(matches)}" if total > len(matches) else ""
+        print(f"\nArchive Results for '{query}' ({total} matches{shown})")
+        print("-" * 40)
+        for match in matches:
+            item = match["result"]
+            number = item.get("number", "Unknown")
+            risk = item.get("risk", "Unknown")
+            carrier = item.get("carrier", "Unknown")
+            owner_name = (item.get("owner") or {}).get("name", "Unknown")
+            print(
+                f"- {number} | risk={risk} | carrier={carrier} | owner={owner_name} | "
+                f"run=#{match['run']} {self._history_time(match['recorded'])}"
+            )
+
+    def _archive_prune(self, value):
+        try:
+            days = float(value)
+        except ValueError:
+            days = -1
+        if days < 0:
+            print("Usage: archive prune <days>")
+            return
+        removed = RESULT_ARCHIVE.prune(days)
+        print(f"Archive pruned: removed {removed} results older than {value} days.")
+        log(f"archive_pruned days={value} removed={removed}")
+
+    def handle_history(self, value):
+        action = str(value or "stats").strip().lower()
+
+        if action in {"on", "off"}:
+            self.settings.history_enabled = action == "on"
+            self._apply_runtime_settings()
+            print(f"Number history {'enabled' if action == 'on' else 'disabled'}.")
+            return
+        try:
+            if action == "purge":
+                removed = NUMBER_HISTORY.purge()
+                print(f"Number history purged: removed {removed} points.")
+                return
+            if action != "stats":
+                print("Usage: history [stats|on|off|purge]")
+                return
+            stats = NUMBER_HISTORY.stats()
+        except sqlite3.Error as exc:
+            print(f"History error: {exc}")
+            return
+
+        print("\nNumber History")
+        print("-" * 40)
+        print(f"Status         : {'On' if self.settings.history_enabled else 'Off'}")
+        print(f"Path           : {stats['path']}")
+        print(f"Points         : {stats['points']} across {stats['numbers']} numbers")
+
     def handle_profile(self, value):
         if not value:
             print(f"Current profile: {self.settings.profile}")
@@ -902,22 +1852,42 @@ General:
         if self._current_engine_name() not in available_engines():
             self.settings.engine_name = "threading"
 
+        self._apply_runtime_settings()
         print(f"Profile applied: {self.settings.profile}")
         self.handle_status("")
 
     def handle_status(self, _):
-        counts = Counter(str(item.get("risk", "Unknown")) for item in self.last_results)
+        counts = self.last_results.aggregates.risks
         print("\nFramework Status")
         print("-" * 40)
         print(f"Profile        : {self.settings.profile}")
         print(f"Engine         : {self._current_engine_name()}")
-        print(f"Workers        : {self._current_workers()}")
+        print(f"Workers        : {self._workers_label()}")
+        print(f"Queue Depth    : {self._queue_depth_label()}")
+        print(f"Process Pool   : {engine_pool_status()}")
+        print(f"Owner Rate     : {self._rate_limit_label()}")
+        print(f"HTTP Pool      : {self._http_pool_label()}")
+        print(f"Owner Cache    : {'On' if self.settings.owner_cache_enabled else 'Off'}")
+        print(f"Prefix Index   : {self._prefix_db_label()}")
+        print(f"History        : {'On' if self.settings.history_enabled else 'Off'}")
+        print(f"Archive        : {'On' if self.settings.archive_enabled else 'Off'}")
+        print(
+            f"Scan Cache     : {'On' if self.settings.scan_cache_enabled else 'Off'} "
+            f"(TTL {self.settings.scan_cache_ttl_hours:g}h)"
+        )
+        print(f"Owner Source   : {self._breaker_label()}")
         print(f"Owner Lookup   : {'On' if self._owner_lookup_enabled() else 'Off'}")
         print(
             f"Auto Summary   : {'On' if self.settings.auto_summary_after_bulk else 'Off'}"
         )
         print(f"Bulk Dedupe    : {'On' if self.settings.dedupe_bulk_numbers else 'Off'}")
+        print(f"Stage Timing   : {'On' if self.settings.stage_timing else 'Off'}")
         print(f"Bulk View      : {self.settings.bulk_output_mode}")
+        print(f"Fields         : {self.settings.scan_fields or 'all'}")
+        print(
+            "Bulk Order     : "
+            f"{'ordered' if self.settings.bulk_ordered_output else 'unordered'}"
+        )
         print(
             "Runbook Stop   : "
             f"{'On' if self.settings.runbook_stop_on_error else 'Off'}"
@@ -951,12 +1921,17 @@ General:
         print(f"Repository    : {REPO_URL}")
         print(f"Ethical Notice: {ETHICAL_NOTICE}")
 
-    def handle_validate(self, number):
+    def handle_validate(self, value):
+        try:
+            number, region = self._split_region_argument(value)
+        except ValueError as exc:
+            print(exc)
+            return
         if not number:
-            print("Usage: validate <number>")
+            print("Usage: validate <number> [region]")
             return
 
-        valid, parsed = validate_number(number)
+        valid, parsed = validate_number(number, region)
         if not valid:
             print(f"Invalid number: {number}")
             return
@@ -970,6 +1945,54 @@ General:
             for key, value in formats.items():
                 print(f"{key:11}: {value}")
 
+    def handle_validate_bulk(self, value):
+        try:
+            file_path, region, column = self._split_bulk_argument(value)
+        except ValueError as exc:
+            print(exc)
+            return
+        if not file_path:
+            print("Usage: validatebulk <file|-> [column=<name|n>] [region]")
+            return
+
+        try:
+            reader = BulkInput(file_path, column=column)
+        except OSError as exc:
+            print(f"Validate bulk error: {exc}")
+            return
+
+        start_time = time.perf_counter()
+        with reader:
+            summary = validation_summary(
+                iter_validated(reader, default_region=region),
+                samples=5,
+            )
+        if reader.error:
+            print(f"Validate bulk input error: {reader.error}")
+        elapsed = time.perf_counter() - start_time
+
+        print("\nBatch Validation")
+        print("-" * 40)
+        print(f"Input      : {file_path} ({reader.bytes_read / 1048576:.1f} MB read)")
+        print(f"Region     : {region or 'none (numbers need +country code)'}")
+        print(f"Rows       : {summary['total']}")
+        print(f"Valid      : {summary['valid']}")
+        print(f"Rejected   : {self._rejected_label(summary['rejected'])}")
+        print(f"Runtime    : {elapsed:.2f}s")
+        if summary["countries"]:
+            print("By country code:")
+            for item in summary["countries"][:10]:
+                print(f" +{item['country_code']:<4} {item['region']:3} {item['count']}")
+        if summary["rejected_samples"]:
+            print("Sample rejects:")
+            for number, reason in summary["rejected_samples"]:
+                print(f" - {number} ({reason})")
+        log(
+            "validate_bulk "
+            f"file={file_path} rows={summary['total']} valid={summary['valid']} "
+            f"elapsed={elapsed:.3f}s"
+        )
+
     def handle_clear_results(self, _):
         count = len(self.last_results)
         self.last_results.clear()
@@ -1058,11 +2081,38 @@ General:
         if loaded.engine_name not in available_engines():
             loaded.engine_name = "threading"
         loaded.max_workers = max(1, min(64, int(loaded.max_workers)))
+        loaded.auto_workers = bool(loaded.auto_workers)
+        loaded.queue_depth = max(0, min(100000, int(loaded.queue_depth)))
         if str(loaded.bulk_output_mode).strip().lower() not in {"full", "compact", "silent"}:
             loaded.bulk_output_mode = "full"
         loaded.runbook_stop_on_error = bool(loaded.runbook_stop_on_error)
+        loaded.stage_timing = bool(loaded.stage_timing)
+        loaded.bulk_ordered_output = bool(loaded.bulk_ordered_output)
+        try:
+            fields = resolve_fields(str(loaded.scan_fields or "") or None)
+        except ValueError:
+            fields = None
+        loaded.scan_fields = ",".join(fields) if fields else ""
+        loaded.owner_rate_limit = max(0.0, min(100.0, float(loaded.owner_rate_limit)))
+        loaded.owner_rate_burst = max(1, min(100, int(loaded.owner_rate_burst)))
+        loaded.http_pool_size = max(1, min(256, int(loaded.http_pool_size)))
+        loaded.http_idle_timeout = max(0.0, min(3600.0, float(loaded.http_idle_timeout)))
+        loaded.owner_cache_enabled = bool(loaded.owner_cache_enabled)
+        loaded.owner_cache_path = str(loaded.owner_cache_path or "")
+        loaded.owner_cache_ttl_hours = max(0.0, float(loaded.owner_cache_ttl_hours))
+        loaded.owner_cache_negative_ttl_hours = max(
+            0.0, float(loaded.owner_cache_negative_ttl_hours)
+        )
+        loaded.owner_cache_max_entries = max(1, int(loaded.owner_cache_max_entries))
+        loaded.scan_cache_enabled = bool(loaded.scan_cache_enabled)
+        loaded.scan_cache_ttl_hours = max(0.0, float(loaded.scan_cache_ttl_hours))
+        loaded.prefix_index_enabled = bool(loaded.prefix_index_enabled)
+        loaded.history_enabled = bool(loaded.history_enabled)
+        loaded.archive_enabled = bool(loaded.archive_enabled)
+        loaded.bulk_dedupe_window = max(1, int(loaded.bulk_dedupe_window))
 
         self.settings = loaded
+        self._apply_runtime_settings()
         print(f"Config loaded from {file_path}.")
         self.handle_status("")
 
@@ -1076,7 +2126,7 @@ General:
 
         try:
             with path.open("w", encoding="utf-8") as handle:
-                json.dump(self.last_results, handle, indent=4)
+                json.dump(list(self.last_results), handle, indent=4)
             print(f"Exported {len(self.last_results)} records to JSON.")
         except OSError as exc:
             print(f"Export error: {exc}")
@@ -1093,12 +2143,44 @@ def build_arg_parser():
 
     parser.add_argument("--profile", choices=sorted(PROFILE_PRESETS.keys()), help="Apply profile preset")
     parser.add_argument("--engine", choices=available_engines(), help="Set execution engine")
-    parser.add_argument("--workers", type=int, help="Set worker count (1-64)")
+    parser.add_argument("--workers", help="Set worker count (1-64) or 'auto'")
+    parser.add_argument("--queuedepth", help="Cap in-flight bulk tasks (number or 'auto')")
+    parser.add_argument(
+        "--ratelimit",
+        help="Owner lookup requests per second per host, optional burst (e.g. '2 4' or 'off')",
+    )
+    parser.add_argument(
+        "--ownercache",
+        help="Owner cache action: stats, on, off, 'purge [expired]', 'warm <file>'",
+    )
+    parser.add_argument(
+        "--scancache",
+        help="Scan result cache action: stats, on, off, 'purge [expired]', 'ttl <hours>'",
+    )
+    parser.add_argument("--prefixdb", help="Prefix index action: status, build, on, off")
+    parser.add_argument("--history", help="Number history action: stats, on, off, purge")
+    parser.add_argument(
+        "--archive",
+        help="Result archive action: stats, runs, load <run>, search <query>, prune <days>",
+    )
+    parser.add_argument(
+        "--httppool",
+        help="Keep-alive connections per host, optional idle eviction seconds (e.g. '32 30')",
+    )
     parser.add_argument(
         "--bulkview",
         choices=["full", "compact", "silent"],
         help="Set bulk output mode",
     )
+    parser.add_argument(
+        "--bulkorder",
+        choices=["ordered", "unordered"],
+        help="Set bulk result emission order",
+    )
+    parser.add_argument(
+        "--fields",
+        help=f"Comma-separated result fields to compute, or 'all' ({', '.join(SCAN_FIELDS)})",
+    )
     parser.add_argument(
         "--runbookstop",
         choices=["on", "off"],
@@ -1107,26 +2189,42 @@ def build_arg_parser():
     parser.add_argument("--ownerlookup", choices=["on", "off"], help="Toggle owner lookup")
     parser.add_argument("--autosummary", choices=["on", "off"], help="Toggle auto summary after bulk")
     parser.add_argument("--dedupe", choices=["on", "off"], help="Toggle bulk dedupe")
+    parser.add_argument("--stagetiming", choices=["on", "off"], help="Toggle per-stage scan timings")
 
-    parser.add_argument("--validate", help="Validate one phone number")
+    parser.add_argument(
+        "--validate",
+        help="Validate one phone number, optional region (e.g. '020 7946 0000 GB')",
+    )
+    parser.add_argument(
+        "--validatebulk",
+        help="Batch-validate a file, optional region (e.g. 'leads.txt US')",
+    )
     parser.add_argument("--runbook", help="Execute command runbook file path")
     parser.add_argument("--scan", help="Scan one phone number")
     parser.add_argument("--scanfast", help="Scan one phone number without owner lookup")
-    parser.add_argument("--bulk", help="Bulk scan file path")
+    parser.add_argument("--bulk", help="Bulk scan file path (.gz/.bz2/.xz, CSV/TSV, or - for stdin)")
     parser.add_argument("--bulkfast", help="Bulk scan file path without owner lookup")
     parser.add_argument("--whois", help="Owner OSINT lookup for one number")
     parser.add_argument("--whoisbulk", help="Bulk owner lookup file path")
-    parser.add_argument("--searchresults", help="Search in-memory results")
+    parser.add_argument(
+        "--searchresults",
+        help="Search in-memory results: free text or fields (e.g. 'risk:High voip:true')",
+    )
     parser.add_argument(
         "--toprisks",
         nargs="?",
         const="10",
-        help="Show top risk-ranked in-memory results",
+        help="Show top risk-ranked results: [n] [file.json|file.jsonl]",
     )
-    parser.add_argument("--diff", help="Compare latest two scans for this number")
+    parser.add_argument(
+        "--diff",
+        help="Compare two scans of a number, optional points (e.g. '+14155552671 @1 @-1')",
+    )
+    parser.add_argument("--timeline", help="List recorded changes for this number")
 
     parser.add_argument("--status", action="store_true", help="Show framework status")
     parser.add_argument("--summary", action="store_true", help="Show dataset summary")
+    parser.add_argument("--stagetimes", action="store_true", help="Show per-stage timing percentiles")
     parser.add_argument("--tips", action="store_true", help="Show quick tips")
     parser.add_argument("--about", action="store_true", help="Show tool metadata")
     parser.add_argument("--lessons", action="store_true", help="Show learning modules")
@@ -1159,12 +2257,24 @@ def has_flag_actions(args):
             args.profile,
             args.engine,
             args.workers is not None,
+            args.queuedepth,
+            args.ratelimit,
+            args.httppool,
+            args.ownercache,
+            args.scancache,
+            args.prefixdb,
+            args.history,
+            args.archive,
             args.bulkview,
+            args.bulkorder,
+            args.fields,
             args.runbookstop,
             args.ownerlookup,
             args.autosummary,
             args.dedupe,
+            args.stagetiming,
             args.validate,
+            args.validatebulk,
             args.runbook,
             args.scan,
             args.scanfast,
@@ -1175,8 +2285,10 @@ def has_flag_actions(args):
             args.searchresults,
             args.toprisks is not None,
             args.diff,
+            args.timeline,
             args.status,
             args.summary,
+            args.stagetimes,
             args.tips,
             args.about,
             args.lessons,
@@ -1199,17 +2311,20 @@ def main(argv=None):
     cli = NumBreacherCLI()
     flagged = has_flag_actions(args)
 
-    if flagged:
-        show_banner()
-        cli.run_flag_actions(args)
-        if args.no_shell:
-            return
+    try:
+        if flagged:
+            show_banner()
+            cli.run_flag_actions(args)
+            if args.no_shell:
+                return
 
-    if args.no_shell and not flagged:
-        print("No flag actions provided. Use --help.")
-        return
+        if args.no_shell and not flagged:
+            print("No flag actions provided. Use --help.")
+            return
 
-    cli.run(show_startup=not flagged)
+        cli.run(show_startup=not flagged)
+    finally:
+        shutdown_engines()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,25 @@
-from collections import Counter
 from datetime import datetime, timezone
 
+from core.aggregates import aggregate_results
+from modules.risk import UNRESOLVED_OWNER_NAMES
+
+SUMMARY_SECTIONS = {
+    "risk": ("risk_distribution", "priority_numbers"),
+    "owner": ("owner_resolution",),
+    "carrier": ("top_carriers",),
+    "geo": ("top_countries",),
+}
+
 
 class Reporter:
-    UNKNOWN_OWNER_NAMES = {"unknown", "lookup disabled", ""}
+    UNKNOWN_OWNER_NAMES = UNRESOLVED_OWNER_NAMES
 
     def single_scan_terminal(self, result):
+        # Results scanned with a field selection only carry the selected
+        # keys; sections and signals for the others are left out.
         number = result.get("number", "Unknown")
         risk = result.get("risk", "Unknown")
-        owner = result.get("owner", {})
+        owner = result.get("owner") or {}
         owner_name = str(owner.get("name", "Unknown"))
         owner_confidence = str(owner.get("confidence", "Low"))
 
@@ -22,7 +33,7 @@ class Reporter:
         if line_type in {"PREMIUM_RATE", "PAGER", "VOIP"}:
             signals.append(f"line={line_type}")
 
-        if owner_name.strip().lower() in self.UNKNOWN_OWNER_NAMES:
+        if "owner" in result and owner_name.strip().lower() in self.UNKNOWN_OWNER_NAMES:
             signals.append("owner-unresolved")
 
         if not signals:
@@ -30,10 +41,13 @@ class Reporter:
         else:
             signals_text = ", ".join(signals)
 
-        return (
-            f"[Reporter] {number} -> {risk} risk | "
-            f"Owner: {owner_name} ({owner_confidence}) | Signals: {signals_text}"
-        )
+        sections = [f"[Reporter] {number}"]
+        if "risk" in result:
+            sections[0] += f" -> {risk} risk"
+        if "owner" in result:
+            sections.append(f"Owner: {owner_name} ({owner_confidence})")
+        sections.append(f"Signals: {signals_text}")
+        return " | ".join(sections)
 
     def bulk_terminal_summary(
         self,
@@ -45,66 +59,68 @@ class Reporter:
         workers,
         title="Bulk Summary",
     ):
-        risk_counts = Counter(str(item.get("risk", "Unknown")) for item in results)
-        owner_resolved = sum(1 for item in results if self._owner_resolved(item))
+        aggregates = aggregate_results(results)
+        risk_counts = aggregates.risks
+        owner_resolved = aggregates.owner_resolved
+        circuit_skipped = aggregates.circuit_skipped
 
-        carrier_counts = Counter(str(item.get("carrier", "Unknown")) for item in results)
+        carrier_counts = aggregates.carriers
         top_carriers = ", ".join(
             f"{name}({count})" for name, count in carrier_counts.most_common(3)
         )
         if not top_carriers:
             top_carriers = "None"
 
-        top_regions = Counter(
-            str((item.get("geo") or {}).get("Country", "Unknown")) for item in results
-        )
+        top_regions = aggregates.countries
         region_summary = ", ".join(
             f"{name}({count})" for name, count in top_regions.most_common(3)
         )
         if not region_summary:
             region_summary = "None"
 
-        high_risk_numbers = [
-            item.get("number", "Unknown") for item in results if item.get("risk") == "High"
-        ][:5]
+        high_risk_numbers = [item["number"] for item in aggregates.priority[:5]]
         if not high_risk_numbers:
             high_risk_text = "None"
         else:
             high_risk_text = ", ".join(high_risk_numbers)
 
-        return "\n".join(
-            [
-                f"[Reporter] {title}",
-                f" Engine: {engine_name} (workers={workers})",
-                f" Runtime: {elapsed_seconds:.2f}s",
-                f" Totals: scanned={scanned}, skipped={skipped}",
-                (
-                    " Risk: "
-                    f"High={risk_counts.get('High', 0)}, "
-                    f"Medium={risk_counts.get('Medium', 0)}, "
-                    f"Low={risk_counts.get('Low', 0)}"
-                ),
-                f" Owner resolved: {owner_resolved}/{scanned if scanned else 0}",
-                f" Top carriers: {top_carriers}",
-                f" Top countries: {region_summary}",
-                f" Priority numbers: {high_risk_text}",
-            ]
-        )
+        lines = [
+            f"[Reporter] {title}",
+            f" Engine: {engine_name} (workers={workers})",
+            f" Runtime: {elapsed_seconds:.2f}s",
+            f" Totals: scanned={scanned}, skipped={skipped}",
+        ]
+        if aggregates.covers("risk"):
+            lines.append(
+                " Risk: "
+                f"High={risk_counts.get('High', 0)}, "
+                f"Medium={risk_counts.get('Medium', 0)}, "
+                f"Low={risk_counts.get('Low', 0)}"
+            )
+        if aggregates.covers("owner"):
+            lines.append(f" Owner resolved: {owner_resolved}/{scanned if scanned else 0}")
+            lines.append(f" Owner lookups circuit-skipped: {circuit_skipped}")
+        if aggregates.covers("carrier"):
+            lines.append(f" Top carriers: {top_carriers}")
+        if aggregates.covers("geo"):
+            lines.append(f" Top countries: {region_summary}")
+        if aggregates.covers("risk"):
+            lines.append(f" Priority numbers: {high_risk_text}")
+        return "\n".join(lines)
 
     def generate_markdown_report(self, results, metadata=None):
         metadata = metadata or {}
-        scanned = len(results)
+        aggregates = aggregate_results(results)
+        scanned = len(aggregates)
         skipped = int(metadata.get("skipped", 0))
         engine_name = metadata.get("engine", "threading")
         workers = int(metadata.get("workers", 1))
         elapsed_seconds = float(metadata.get("elapsed_seconds", 0.0))
 
-        risk_counts = Counter(str(item.get("risk", "Unknown")) for item in results)
-        owner_resolved = sum(1 for item in results if self._owner_resolved(item))
-        top_carriers = Counter(str(item.get("carrier", "Unknown")) for item in results)
-        top_countries = Counter(
-            str((item.get("geo") or {}).get("Country", "Unknown")) for item in results
-        )
+        risk_counts = aggregates.risks
+        owner_resolved = aggregates.owner_resolved
+        top_carriers = aggregates.carriers
+        top_countries = aggregates.countries
 
         lines = [
             "# Telecom Recon Report",
@@ -115,40 +131,57 @@ class Reporter:
             f"- Runtime: {elapsed_seconds:.2f}s",
             f"- Scanned: {scanned}",
             f"- Skipped: {skipped}",
-            "",
-            "## Risk Distribution",
-            f"- High: {risk_counts.get('High', 0)}",
-            f"- Medium: {risk_counts.get('Medium', 0)}",
-            f"- Low: {risk_counts.get('Low', 0)}",
-            "",
-            "## Owner Resolution",
-            f"- Resolved owner names: {owner_resolved}/{scanned if scanned else 0}",
-            "",
-            "## Top Carriers",
         ]
 
-        if top_carriers:
-            for name, count in top_carriers.most_common(10):
-                lines.append(f"- {name}: {count}")
-        else:
-            lines.append("- None")
-
-        lines.extend(["", "## Top Countries"])
-        if top_countries:
-            for name, count in top_countries.most_common(10):
-                lines.append(f"- {name}: {count}")
-        else:
-            lines.append("- None")
-
-        lines.extend(["", "## High-Risk Numbers"])
-        high_risk_results = [item for item in results if item.get("risk") == "High"]
-        if high_risk_results:
-            for item in high_risk_results[:25]:
-                owner_name = (item.get("owner") or {}).get("name", "Unknown")
-                carrier = item.get("carrier", "Unknown")
-                lines.append(f"- {item.get('number', 'Unknown')} | carrier={carrier} | owner={owner_name}")
-        else:
-            lines.append("- None")
+        if aggregates.covers("risk"):
+            lines.extend(
+                [
+                    "",
+                    "## Risk Distribution",
+                    f"- High: {risk_counts.get('High', 0)}",
+                    f"- Medium: {risk_counts.get('Medium', 0)}",
+                    f"- Low: {risk_counts.get('Low', 0)}",
+                ]
+            )
+
+        if aggregates.covers("owner"):
+            lines.extend(
+                [
+                    "",
+                    "## Owner Resolution",
+                    f"- Resolved owner names: {owner_resolved}/{scanned if scanned else 0}",
+                ]
+            )
+
+        if aggregates.covers("carrier"):
+            lines.extend(["", "## Top Carriers"])
+            if top_carriers:
+                for name, count in top_carriers.most_common(10):
+                    lines.append(f"- {name}: {count}")
+            else:
+                lines.append("- None")
+
+        if aggregates.covers("geo"):
+            lines.extend(["", "## Top Countries"])
+            if top_countries:
+                for name, count in top_countries.most_common(10):
+                    lines.append(f"- {name}: {count}")
+            else:
+                lines.append("- None")
+
+        if aggregates.covers("risk"):
+            lines.extend(["", "## High-Risk Numbers"])
+            high_risk_results = aggregates.priority[:25]
+            if high_risk_results:
+                for item in high_risk_results:
+                    owner_name = item["owner"]
+                    carrier = item["carrier"]
+                    lines.append(
+                        f"- {item.get('number', 'Unknown')} | "
+                        f"carrier={carrier} | owner={owner_name}"
+                    )
+            else:
+                lines.append("- None")
 
         lines.extend(
             [
@@ -163,19 +196,18 @@ class Reporter:
 
     def generate_json_summary(self, results, metadata=None):
         metadata = metadata or {}
-        scanned = len(results)
+        aggregates = aggregate_results(results)
+        scanned = len(aggregates)
         skipped = int(metadata.get("skipped", 0))
         engine_name = metadata.get("engine", "threading")
         workers = int(metadata.get("workers", 1))
         elapsed_seconds = float(metadata.get("elapsed_seconds", 0.0))
 
-        risk_counts = Counter(str(item.get("risk", "Unknown")) for item in results)
-        owner_resolved = sum(1 for item in results if self._owner_resolved(item))
+        risk_counts = aggregates.risks
+        owner_resolved = aggregates.owner_resolved
 
-        carrier_counts = Counter(str(item.get("carrier", "Unknown")) for item in results)
-        country_counts = Counter(
-            str((item.get("geo") or {}).get("Country", "Unknown")) for item in results
-        )
+        carrier_counts = aggregates.carriers
+        country_counts = aggregates.countries
 
         top_carriers = [
             {"carrier": name, "count": count} for name, count in carrier_counts.most_common(10)
@@ -183,11 +215,9 @@ class Reporter:
         top_countries = [
             {"country": name, "count": count} for name, count in country_counts.most_common(10)
         ]
-        high_risk_numbers = [
-            item.get("number", "Unknown") for item in results if item.get("risk") == "High"
-        ][:25]
+        high_risk_numbers = [item["number"] for item in aggregates.priority[:25]]
 
-        return {
+        summary = {
             "metadata": {
                 "engine": engine_name,
                 "workers": workers,
@@ -209,8 +239,8 @@ class Reporter:
             "top_countries": top_countries,
             "priority_numbers": high_risk_numbers,
         }
-
-    def _owner_resolved(self, result):
-        owner = result.get("owner", {})
-        owner_name = str(owner.get("name", "Unknown")).strip().lower()
-        return owner_name not in self.UNKNOWN_OWNER_NAMES
+        for field, keys in SUMMARY_SECTIONS.items():
+            if not aggregates.covers(field):
+                for key in keys:
+                    summary.pop(key)
+        return summary
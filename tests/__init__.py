@@ -1 +1,10 @@
 # Test package marker.
+import os
+import tempfile
+
+# Keep test lookups out of the user's persistent caches.
+_CACHE_DIR = tempfile.mkdtemp(prefix="numbreacher-tests-")
+os.environ.setdefault("NUMBREACHER_OWNER_CACHE", os.path.join(_CACHE_DIR, "owner_cache.sqlite3"))
+os.environ.setdefault("NUMBREACHER_RESULT_CACHE", os.path.join(_CACHE_DIR, "scan_cache.sqlite3"))
+os.environ.setdefault("NUMBREACHER_HISTORY", os.path.join(_CACHE_DIR, "number_history.sqlite3"))
+os.environ.setdefault("NUMBREACHER_ARCHIVE", os.path.join(_CACHE_DIR, "results.sqlite3"))
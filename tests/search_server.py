@@ -0,0 +1,112 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PAGE = (
+    "<html><body>"
+    '<a class="result__a" href="#">John Smith - Truecaller</a>'
+    '<a class="result__a" href="#">John Smith phone owner</a>'
+    '<a class="result__a" href="#">Caller John Smith</a>'
+    "</body></html>"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.paths.append(self.path)
+            server.request_count += 1
+            failing = server.request_count <= server.fail_first
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+
+        try:
+            if server.delay and (server.delay_match is None or server.delay_match in self.path):
+                time.sleep(server.delay)
+            body = server.page.encode("utf-8")
+            self.send_response(503 if failing else server.status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def do_CONNECT(self):
+        # Tunnels are refused; tests only check that the client asked for one.
+        with self.server.lock:
+            self.server.paths.append(f"CONNECT {self.path}")
+        self.send_response(403)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+class LocalSearchServer:
+    def __init__(
+        self,
+        page=DEFAULT_PAGE,
+        delay=0.0,
+        status=200,
+        fail_first=0,
+        delay_match=None,
+    ):
+        self.httpd = _Server(("127.0.0.1", 0), _Handler)
+        self.httpd.page = page
+        self.httpd.delay = delay
+        self.httpd.delay_match = delay_match
+        self.httpd.status = status
+        self.httpd.fail_first = fail_first
+        self.httpd.lock = threading.Lock()
+        self.httpd.request_count = 0
+        self.httpd.paths = []
+        self.httpd.connection_count = 0
+        self.httpd.active = 0
+        self.httpd.peak_active = 0
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/html/"
+
+    @property
+    def paths(self):
+        return list(self.httpd.paths)
+
+    @property
+    def request_count(self):
+        return self.httpd.request_count
+
+    @property
+    def connection_count(self):
+        return self.httpd.connection_count
+
+    @property
+    def peak_active(self):
+        return self.httpd.peak_active
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join(timeout=5)
@@ -0,0 +1,62 @@
+import unittest
+
+from core.aggregates import DatasetAggregates, aggregate_results
+from core.result_store import ResultStore
+from reporter.reporter import Reporter
+
+
+def _row(index):
+    return {
+        "number": f"+1415555{index:04d}",
+        "carrier": ("Unknown", "AT&T", "JT")[index % 3],
+        "risk": ("High", "Medium", "Low", "High")[index % 4],
+        "owner": {
+            "name": "Unknown" if index % 2 else f"Owner {index}",
+            "circuit_skipped": index % 5 == 0,
+        },
+        "geo": {"Country": "United States" if index % 3 else "Guernsey"},
+    }
+
+
+def _snapshot(aggregates):
+    return (
+        aggregates.total,
+        dict(aggregates.risks),
+        dict(aggregates.carriers),
+        dict(aggregates.countries),
+        aggregates.owner_resolved,
+        aggregates.circuit_skipped,
+        aggregates.priority,
+    )
+
+
+class TestDatasetAggregates(unittest.TestCase):
+    def setUp(self):
+        self.rows = [_row(index) for index in range(40)]
+
+    def test_store_keeps_running_aggregates(self):
+        store = ResultStore()
+        for row in self.rows:
+            store.append(row)
+        self.assertIs(aggregate_results(store), store.aggregates)
+        self.assertEqual(_snapshot(store.aggregates), _snapshot(DatasetAggregates(self.rows)))
+        self.assertEqual(store.aggregates.owner_resolved, 20)
+        self.assertEqual(len(store.aggregates.priority), 20)
+
+        reporter = Reporter()
+        metadata = {"engine": "async", "workers": 4, "skipped": 2}
+        self.assertEqual(
+            reporter.generate_json_summary(store, metadata=metadata),
+            reporter.generate_json_summary(self.rows, metadata=metadata),
+        )
+        self.assertEqual(
+            reporter.bulk_terminal_summary(store.aggregates, 40, 2, "async", 1.0, 4),
+            reporter.bulk_terminal_summary(self.rows, 40, 2, "async", 1.0, 4),
+        )
+
+        store.clear()
+        self.assertEqual(_snapshot(store.aggregates), _snapshot(DatasetAggregates()))
+
+
+if __name__ == "__main__":
+    unittest.main()
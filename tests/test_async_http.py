@@ -0,0 +1,69 @@
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from tests.search_server import LocalSearchServer
+from utils.async_http import AsyncHTTPClient, AsyncHTTPError, proxy_for
+
+PROXY_VARIABLES = ("http_proxy", "https_proxy", "all_proxy", "no_proxy")
+
+
+def _environment(**values):
+    cleared = {
+        key: value
+        for key, value in os.environ.items()
+        if key.lower() not in PROXY_VARIABLES
+    }
+    cleared.update(values)
+    return mock.patch.dict(os.environ, cleared, clear=True)
+
+
+def _fetch(url):
+    async def run():
+        client = AsyncHTTPClient()
+        try:
+            return await client.get(url, timeout=4)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+class TestAsyncHTTPProxies(unittest.TestCase):
+    def test_plain_http_goes_through_proxy(self):
+        with LocalSearchServer() as proxy:
+            host, port = proxy.httpd.server_address[:2]
+            target = "http://lookup.numbreacher.invalid/html/?q=1"
+            with _environment(http_proxy=f"http://user:p%40ss@{host}:{port}"):
+                response = _fetch(target)
+
+        self.assertEqual(response.status, 200)
+        self.assertIn("John Smith", response.text)
+        self.assertEqual(proxy.paths, [target])
+
+    def test_https_tunnels_with_connect(self):
+        with LocalSearchServer() as proxy:
+            host, port = proxy.httpd.server_address[:2]
+            with _environment(https_proxy=f"http://{host}:{port}"):
+                with self.assertRaises(AsyncHTTPError) as caught:
+                    _fetch("https://lookup.numbreacher.invalid/html/")
+
+        self.assertEqual(caught.exception.status, 403)
+        self.assertEqual(proxy.paths, ["CONNECT lookup.numbreacher.invalid:443"])
+
+    def test_no_proxy_and_unset_environment_connect_directly(self):
+        with LocalSearchServer() as server:
+            with _environment(http_proxy="http://127.0.0.1:9", no_proxy="127.0.0.1"):
+                self.assertIsNone(proxy_for(server.url))
+                self.assertEqual(_fetch(server.url).status, 200)
+            with _environment():
+                self.assertIsNone(proxy_for(server.url))
+            with _environment(all_proxy="socks5://127.0.0.1:9"):
+                self.assertEqual(proxy_for(server.url).scheme, "socks5")
+
+        self.assertEqual(server.paths, ["/html/"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+
+from core.bulk_input import BulkInput, dedupe_numbers, peek_numbers
+
+
+class TestBulkInput(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text, opener=open):
+        path = os.path.join(self.directory.name, name)
+        with opener(path, "wb") as handle:
+            handle.write(text.encode("utf-8"))
+        return path
+
+    def read(self, path, column=None):
+        with BulkInput(path, column=column) as reader:
+            numbers = list(reader)
+        return numbers, reader
+
+    def test_compressed_inputs_stream_lines(self):
+        text = "\ufeff+14155552671\r\n\n  +442079460000 \n"
+        for name, opener in (
+            ("plain.txt", open),
+            ("numbers.gz", gzip.open),
+            ("numbers.txt.bz2", bz2.open),
+            ("no-extension", lzma.open),
+        ):
+            with self.subTest(name=name):
+                numbers, reader = self.read(self.write(name, text, opener))
+                self.assertEqual(numbers, ["+14155552671", "+442079460000"])
+                self.assertEqual(reader.bytes_read, reader.size)
+                self.assertIsNone(reader.error)
+
+    def test_csv_and_tsv_columns(self):
+        csv_text = 'name,Phone,notes\n"Roe, Jane",+14155552671,x\nJohn,,y\nAl,+442079460000\n'
+        path = self.write("leads.csv.gz", csv_text, gzip.open)
+        self.assertEqual(self.read(path)[0], ["+14155552671", "+442079460000"])
+        self.assertEqual(self.read(path, column="notes")[0], ["x", "y"])
+
+        path = self.write("dump.tsv", "+14155552671\tA\n+442079460000\tB\n")
+        self.assertEqual(self.read(path)[0], ["+14155552671", "+442079460000"])
+        path = self.write("dump.txt", "a\t+14155552671\nb\t+442079460000\n")
+        self.assertEqual(self.read(path, column="2")[0], ["+14155552671", "+442079460000"])
+
+        numbers, reader = self.read(path, column="msisdn")
+        self.assertEqual(numbers, [])
+        self.assertIn("msisdn", reader.error)
+
+    def test_truncated_input_keeps_numbers_read(self):
+        payload = gzip.compress("".join(f"+1415555{i:04d}\n" for i in range(5000)).encode())
+        path = os.path.join(self.directory.name, "cut.gz")
+        with open(path, "wb") as handle:
+            handle.write(payload[: len(payload) // 2])
+
+        numbers, reader = self.read(path)
+        self.assertTrue(0 < len(numbers) < 5000)
+        self.assertEqual(numbers[0], "+14155550000")
+        self.assertIsNotNone(reader.error)
+        self.assertIsNone(peek_numbers(BulkInput(self.write("empty.txt", "\n\n"))))
+
+    def test_dedupe_window_bounds_memory(self):
+        stats = {"removed": 0}
+        numbers = ["a", "b", "a", "c", "d", "a", "d"]
+        self.assertEqual(list(dedupe_numbers(numbers, stats, window=2)), ["a", "b", "c", "d", "a"])
+        self.assertEqual(stats["removed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from utils.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_trips_on_error_rate_and_recovers_after_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_requests=4, cooldown_seconds=10, clock=clock)
+
+        for success in (True, False, True, False):
+            self.assertTrue(breaker.allow())
+            breaker.record(success)
+
+        self.assertEqual(breaker.snapshot()["state"], "open")
+        self.assertFalse(breaker.allow())
+
+        clock.now += 10
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record(True)
+
+        snapshot = breaker.snapshot()
+        self.assertEqual(snapshot["state"], "closed")
+        self.assertEqual(snapshot["trips"], 1)
+        self.assertEqual(snapshot["skipped"], 2)
+
+    def test_failed_probe_reopens_circuit(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_requests=2, cooldown_seconds=5, clock=clock)
+        breaker.record(False)
+        breaker.record(False)
+
+        clock.now += 5
+        self.assertTrue(breaker.allow())
+        breaker.record(False)
+
+        self.assertEqual(breaker.snapshot()["state"], "open")
+        self.assertEqual(breaker.snapshot()["trips"], 2)
+        self.assertAlmostEqual(breaker.snapshot()["retry_in"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
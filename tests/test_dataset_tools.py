@@ -1,6 +1,16 @@
+import json
+import os
+import tempfile
 import unittest
 
-from core.dataset_tools import diff_number_history, quick_distribution, search_results, top_risks
+from core.dataset_tools import (
+    diff_number_history,
+    iter_result_file,
+    quick_distribution,
+    search_results,
+    top_risks,
+)
+from core.result_store import ResultStore
 
 
 class TestDatasetTools(unittest.TestCase):
@@ -45,6 +55,25 @@ class TestDatasetTools(unittest.TestCase):
         self.assertEqual(len(ranked), 2)
         self.assertEqual(ranked[0]["risk"], "High")
 
+    def test_top_risks_incremental_and_streamed(self):
+        store = ResultStore()
+        rows = []
+        for position in range(30):
+            row = dict(self.results[position % 3], number=f"+1415555{position:04d}")
+            rows.append(row)
+            store.append(row)
+            for limit in (1, 4, 12):
+                self.assertEqual(top_risks(store, limit=limit), top_risks(rows, limit=limit))
+        self.assertEqual(
+            top_risks(store.window(20), limit=5), top_risks(rows[20:], limit=5)
+        )
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "results.jsonl")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.writelines(json.dumps(row) + "\n" for row in rows)
+            self.assertEqual(top_risks(iter_result_file(path), limit=4), top_risks(rows, limit=4))
+
     def test_diff_number_history(self):
         diff = diff_number_history(self.results, "+14155552671")
         self.assertIsNotNone(diff)
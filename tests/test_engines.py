@@ -1,6 +1,9 @@
+import time
 import unittest
 
+from engines.autoscale import ConcurrencyController
 from engines.factory import available_engines, create_engine
+from engines.parallel_engine import ChunkSizer, get_process_pool, shutdown_process_pool
 from engines.workers import scan_number_worker
 
 
@@ -8,12 +11,18 @@ def simple_worker(task):
     return {"ok": True, "number": task.get("number", "")}
 
 
+def delayed_worker(task):
+    time.sleep(task.get("delay", 0))
+    return {"ok": True, "number": task.get("number", "")}
+
+
 class TestEngines(unittest.TestCase):
     def test_available_engines(self):
         engines = available_engines()
         self.assertIn("threading", engines)
         self.assertIn("parallel", engines)
         self.assertIn("async", engines)
+        self.assertIn("hybrid", engines)
 
     def test_threading_engine_scan_worker(self):
         engine = create_engine("threading")
@@ -62,6 +71,137 @@ class TestEngines(unittest.TestCase):
         self.assertTrue(results[0]["ok"])
         self.assertTrue(results[1]["ok"])
 
+    def test_run_iter_ordered_and_unordered(self):
+        tasks = [
+            {"number": "slow", "delay": 0.2},
+            {"number": "fast", "delay": 0.0},
+        ]
+        for name in ("threading", "async"):
+            engine = create_engine(name)
+            ordered = [item["number"] for item in engine.run_iter(delayed_worker, tasks, 2, ordered=True)]
+            unordered = [
+                item["number"] for item in engine.run_iter(delayed_worker, tasks, 2, ordered=False)
+            ]
+            self.assertEqual(ordered, ["slow", "fast"], msg=name)
+            self.assertEqual(unordered, ["fast", "slow"], msg=name)
+
+    def test_hybrid_engine_matches_threading_engine(self):
+        tasks = [
+            {"number": "+14155552671", "enable_owner_lookup": False, "render_output": False},
+            {"number": "invalid", "enable_owner_lookup": False, "render_output": False},
+            {"number": "+447911123456", "enable_owner_lookup": False, "render_output": False},
+        ]
+        try:
+            hybrid = create_engine("hybrid").run(scan_number_worker, tasks, max_workers=2)
+        except Exception as exc:
+            self.skipTest(f"Hybrid engine not supported in this environment: {exc}")
+            return
+        finally:
+            shutdown_process_pool()
+
+        threaded = create_engine("threading").run(scan_number_worker, tasks, max_workers=2)
+        self.assertEqual(hybrid, threaded)
+
+    def test_run_iter_bounds_in_flight_tasks_for_lazy_input(self):
+        for name in ("threading", "async", "parallel"):
+            pulled = 0
+
+            def lazy_tasks():
+                nonlocal pulled
+                for index in range(40):
+                    pulled += 1
+                    yield {"number": str(index), "delay": 0.005}
+
+            engine = create_engine(name)
+            emitted = 0
+            max_ahead = 0
+            try:
+                for ordered in (True, False):
+                    pulled = 0
+                    emitted = 0
+                    stream = engine.run_iter(
+                        delayed_worker, lazy_tasks(), max_workers=2, ordered=ordered, queue_depth=5
+                    )
+                    for _ in stream:
+                        emitted += 1
+                        max_ahead = max(max_ahead, pulled - emitted)
+                    self.assertEqual(emitted, 40, msg=name)
+            except Exception as exc:
+                if name == "parallel":
+                    self.skipTest(f"Parallel engine not supported in this environment: {exc}")
+                raise
+            finally:
+                shutdown_process_pool()
+            self.assertLessEqual(max_ahead, 5, msg=name)
+
+    def test_concurrency_controller_aimd(self):
+        controller = ConcurrencyController(initial=4, maximum=6)
+        for _ in range(40):
+            controller.record(0.1)
+        self.assertEqual(controller.limit, 6)
+
+        for _ in range(6):
+            controller.record(0.1, failed=True)
+        self.assertEqual(controller.limit, 3)
+        self.assertEqual(controller.snapshot()["decreases"], 1)
+
+        for _ in range(4):
+            controller.record(5.0)
+        self.assertEqual(controller.limit, 1)
+
+    def test_threading_engine_respects_controller_limit(self):
+        active = 0
+        peak = 0
+
+        def tracked_worker(task):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            time.sleep(0.01)
+            active -= 1
+            return {"ok": True, "number": task["number"]}
+
+        controller = ConcurrencyController(initial=2, maximum=2)
+        tasks = [{"number": str(index)} for index in range(20)]
+        results = create_engine("threading").run(
+            tracked_worker, tasks, max_workers=16, controller=controller
+        )
+        self.assertEqual(len(results), 20)
+        self.assertLessEqual(peak, 2)
+
+    def test_run_iter_empty_tasks(self):
+        for name in available_engines():
+            self.assertEqual(list(create_engine(name).run_iter(simple_worker, [])), [])
+
+    def test_parallel_engine_chunked_ordering_and_pool_reuse(self):
+        engine = create_engine("parallel")
+        tasks = [{"number": str(index)} for index in range(57)]
+        try:
+            first = engine.run(simple_worker, tasks, max_workers=2)
+            pool = get_process_pool(2)
+            second = engine.run(simple_worker, tasks, max_workers=2)
+        except Exception as exc:
+            self.skipTest(f"Parallel engine not supported in this environment: {exc}")
+            return
+
+        try:
+            self.assertEqual([item["number"] for item in first], [task["number"] for task in tasks])
+            self.assertEqual(first, second)
+            self.assertIs(get_process_pool(2), pool)
+        finally:
+            self.assertTrue(shutdown_process_pool())
+            self.assertFalse(shutdown_process_pool())
+
+    def test_chunk_sizer_adapts_to_task_cost(self):
+        sizer = ChunkSizer(max_workers=4, target_seconds=0.5, max_size=100)
+        sizer.observe(4, 0.004)
+        self.assertEqual(sizer.next_size(10_000), 100)
+
+        sizer = ChunkSizer(max_workers=4, target_seconds=0.5, max_size=100)
+        sizer.observe(4, 8.0)
+        self.assertEqual(sizer.next_size(10_000), 1)
+        self.assertEqual(ChunkSizer(max_workers=4).next_size(3), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.search_server import LocalSearchServer
+from utils.http_session import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    close_http_sessions,
+    configure_http_pool,
+    get_session,
+)
+
+
+def _idle_sockets(session, url):
+    pools = session.get_adapter(url).poolmanager.pools
+    return sum(
+        1
+        for key in pools.keys()
+        for connection in list(pools[key].pool.queue)
+        if connection is not None and connection.sock is not None
+    )
+
+
+class TestHTTPSession(unittest.TestCase):
+    def tearDown(self):
+        configure_http_pool(DEFAULT_POOL_SIZE, DEFAULT_IDLE_TIMEOUT)
+        close_http_sessions()
+
+    def test_threads_share_one_session_bounded_by_pool_size(self):
+        configure_http_pool(pool_size=2, idle_timeout=0)
+        with LocalSearchServer(delay=0.2) as server:
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                sessions = list(executor.map(lambda _: get_session(), range(6)))
+                statuses = list(
+                    executor.map(lambda _: get_session().get(server.url).status_code, range(6))
+                )
+
+            session = get_session()
+            self.assertTrue(all(item is session for item in sessions))
+            self.assertEqual(statuses, [200] * 6)
+            self.assertEqual(server.peak_active, 6)
+            self.assertEqual(_idle_sockets(session, server.url), 2)
+
+    def test_idle_sessions_are_swept_without_further_use(self):
+        configure_http_pool(idle_timeout=0.2)
+        with LocalSearchServer() as server:
+            session = get_session()
+            session.get(server.url)
+            self.assertEqual(_idle_sockets(session, server.url), 1)
+            time.sleep(0.6)
+            self.assertEqual(_idle_sockets(session, server.url), 0)
+
+            self.assertEqual(get_session().get(server.url).status_code, 200)
+            self.assertEqual(server.connection_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from core.number_history import NumberHistory, normalize_number
+
+
+def _row(carrier, risk, owner="Unknown", number="+1 415 555 2671"):
+    return {
+        "number": number,
+        "carrier": carrier,
+        "risk": risk,
+        "line_type": "MOBILE",
+        "owner": {"name": owner},
+    }
+
+
+class TestNumberHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "history.sqlite3")
+        self.history = NumberHistory(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_diff_between_arbitrary_points(self):
+        self.history.record(_row("AT&T", "Low"), recorded=1.0)
+        self.history.record(_row("AT&T", "High"), recorded=2.0)
+        self.history.record(_row("Verizon", "High", owner="Jane Roe"), recorded=3.0)
+        self.history.record(_row("JT", "Low", number="+441481123456"), recorded=4.0)
+
+        number = normalize_number({"number": " +1 (415) 555-2671"})
+        self.assertEqual(number, "+14155552671")
+        self.assertEqual(self.history.count(number), 3)
+
+        latest = self.history.diff(number)
+        self.assertEqual((latest["old"]["seq"], latest["new"]["seq"]), (2, 3))
+        self.assertEqual(set(latest["changes"]), {"carrier", "owner.name"})
+
+        first = self.history.diff(number, 1, -1)
+        self.assertEqual(first["old"]["recorded"], 1.0)
+        self.assertEqual(first["changes"]["risk"], {"old": "Low", "new": "High"})
+        self.assertIsNone(self.history.diff(number, 1, 4))
+        self.assertIsNone(self.history.diff("+441481123456"))
+
+    def test_timeline_persists_across_sessions(self):
+        self.history.record(_row("AT&T", "Low"), recorded=1.0)
+        self.history.record(_row("AT&T", "Low"), recorded=2.0)
+        self.history.flush()
+
+        reopened = NumberHistory(self.path)
+        reopened.record(_row("AT&T", "High"), recorded=3.0)
+        reopened.record({"number": "+14155552671", "risk": "High"}, recorded=4.0)
+        reopened.record(_row("Verizon", "High"), recorded=5.0)
+
+        events = reopened.timeline("+14155552671")
+        self.assertEqual([event["seq"] for event in events], [1, 3, 5])
+        self.assertEqual(events[1]["changes"], {"risk": {"old": "Low", "new": "High"}})
+        self.assertEqual(list(events[2]["changes"]), ["carrier"])
+        self.assertEqual(reopened.stats()["points"], 5)
+
+        disabled = NumberHistory(self.path, enabled=False)
+        disabled.record(_row("JT", "Low"))
+        self.assertEqual(disabled.count("+14155552671"), 5)
+        self.assertEqual(reopened.purge(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
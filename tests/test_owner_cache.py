@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+import unittest
+
+from engines.factory import create_engine
+from engines.parallel_engine import shutdown_process_pool
+from modules import owner_osint
+from modules.owner_cache import OwnerCache
+
+
+def _owner(name="John Smith", failed_queries=0):
+    return {
+        "name": name,
+        "confidence": "High" if name != "Unknown" else "Low",
+        "sources": ["a", "b"],
+        "candidates": [name] if name != "Unknown" else [],
+        "failed_queries": failed_queries,
+    }
+
+
+def store_owner(number):
+    return owner_osint.OWNER_CACHE.put(number, _owner(f"Owner Number{number[-1]}"))
+
+
+class TestOwnerCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "owners.sqlite3")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_positive_and_negative_ttls(self):
+        cache = OwnerCache(self.path, positive_ttl=60, negative_ttl=0.2)
+        cache.put("14155550001", _owner())
+        cache.put("14155550002", _owner("Unknown"))
+
+        self.assertEqual(cache.get("14155550001")["name"], "John Smith")
+        self.assertEqual(cache.get("14155550002")["name"], "Unknown")
+        time.sleep(0.3)
+        self.assertIsNotNone(cache.get("14155550001"))
+        self.assertIsNone(cache.get("14155550002"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["negative"], 1)
+
+    def test_source_failures_are_not_cached(self):
+        cache = OwnerCache(self.path)
+        self.assertFalse(cache.put("14155550003", _owner("Unknown", failed_queries=2)))
+        self.assertFalse(cache.put("14155550004", dict(_owner(), circuit_skipped=True)))
+        self.assertTrue(cache.put("14155550005", _owner("Unknown", failed_queries=1)))
+        self.assertNotIn("14155550003", cache)
+        self.assertIn("14155550005", cache)
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = OwnerCache(self.path, max_entries=2)
+        for index in range(3):
+            cache.put(f"1415555001{index}", _owner())
+            cache._execute(
+                "UPDATE owner_cache SET last_access = ? WHERE number = ?",
+                (index, f"1415555001{index}"),
+                commit=True,
+            )
+        cache._execute(
+            "UPDATE owner_cache SET last_access = 10 WHERE number = '14155550010'",
+            commit=True,
+        )
+
+        self.assertEqual(cache.evict(), 1)
+        self.assertIn("14155550010", cache)
+        self.assertNotIn("14155550011", cache)
+        self.assertIn("14155550012", cache)
+
+    def test_persists_and_is_shared_with_pool_workers(self):
+        previous = owner_osint.OWNER_CACHE.config()
+        owner_osint.OWNER_CACHE.configure(path=self.path)
+        try:
+            numbers = [f"1415555002{index}" for index in range(4)]
+            stored = create_engine("parallel").run(store_owner, numbers, max_workers=2)
+        finally:
+            shutdown_process_pool()
+            owner_osint.OWNER_CACHE.configure(**previous)
+
+        self.assertEqual(stored, [True] * 4)
+        reopened = OwnerCache(self.path)
+        self.assertEqual(reopened.get("14155550023")["name"], "Owner Number3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,306 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import phonenumbers
+
+from engines.factory import create_engine
+from engines.parallel_engine import shutdown_process_pool
+from engines.workers import owner_lookup_worker, scan_number_worker
+from modules import owner_osint
+from modules.owner_osint import lookup_owner_name, lookup_owner_name_async
+from tests.search_server import LocalSearchServer
+
+
+class TestOwnerOsint(unittest.TestCase):
+    def setUp(self):
+        owner_osint.OWNER_CACHE.clear()
+        owner_osint.SOURCE_BREAKER.reset()
+
+    def tearDown(self):
+        owner_osint.OWNER_CACHE.clear()
+        owner_osint.SOURCE_BREAKER.reset()
+
+    def test_sync_and_async_lookup_agree(self):
+        with LocalSearchServer() as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                parsed = phonenumbers.parse("+14155552671")
+                sync_result = lookup_owner_name(parsed)
+                owner_osint.OWNER_CACHE.clear()
+                async_result = asyncio.run(lookup_owner_name_async(parsed))
+
+        self.assertEqual(sync_result, async_result)
+        self.assertEqual(async_result["name"], "John Smith")
+        self.assertEqual(async_result["confidence"], "High")
+        self.assertTrue(async_result["sources"][0].startswith(server.url))
+
+    def test_async_lookup_reports_unavailable_sources(self):
+        with LocalSearchServer(status=503) as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                result = asyncio.run(lookup_owner_name_async(phonenumbers.parse("+447911123456")))
+
+        self.assertEqual(result["name"], "Unknown")
+        self.assertEqual(result["notes"], "Owner lookup sources were unavailable.")
+
+    def test_lookup_retries_transient_errors(self):
+        with LocalSearchServer(fail_first=1) as server:
+            with mock.patch.multiple(owner_osint, SEARCH_URL=server.url, RETRY_BASE_DELAY=0.01):
+                sync_result = lookup_owner_name(phonenumbers.parse("+14155552671"))
+                owner_osint.OWNER_CACHE.clear()
+                async_result = asyncio.run(
+                    lookup_owner_name_async(phonenumbers.parse("+14155552671"))
+                )
+
+        self.assertEqual(sync_result["name"], "John Smith")
+        self.assertEqual(sync_result["failed_queries"], 0)
+        self.assertEqual(async_result["name"], "John Smith")
+        self.assertGreaterEqual(server.request_count, 3)
+
+    def test_open_circuit_skips_lookups_without_requests(self):
+        with LocalSearchServer(status=503) as server:
+            with mock.patch.multiple(owner_osint, SEARCH_URL=server.url, RETRY_ATTEMPTS=1):
+                for index in range(3):
+                    lookup_owner_name(phonenumbers.parse(f"+1415555{4000 + index}"))
+                requests_before = server.request_count
+                skipped = asyncio.run(
+                    lookup_owner_name_async(phonenumbers.parse("+14155554100"))
+                )
+
+        self.assertEqual(owner_osint.SOURCE_BREAKER.snapshot()["state"], "open")
+        self.assertEqual(server.request_count, requests_before)
+        self.assertTrue(skipped["circuit_skipped"])
+        self.assertNotIn("14155554100", owner_osint.OWNER_CACHE)
+
+    def test_parallel_workers_share_the_parent_breaker(self):
+        tasks = [{"number": f"+1415555{4200 + index}"} for index in range(12)]
+        with LocalSearchServer(status=503) as server:
+            with mock.patch.multiple(owner_osint, SEARCH_URL=server.url, RETRY_ATTEMPTS=1):
+                try:
+                    results = create_engine("parallel").run(
+                        owner_lookup_worker, tasks, max_workers=4
+                    )
+                finally:
+                    shutdown_process_pool()
+
+        snapshot = owner_osint.SOURCE_BREAKER.snapshot()
+        skipped = sum(1 for item in results if item["owner"].get("circuit_skipped"))
+        self.assertEqual(snapshot["state"], "open")
+        self.assertEqual(snapshot["trips"], 1)
+        self.assertGreater(skipped, 0)
+        # Only requests already in flight when the shared breaker opened get through.
+        self.assertLessEqual(server.request_count, owner_osint.SOURCE_BREAKER.min_requests + 8)
+
+    def test_locked_cache_does_not_block_event_loop(self):
+        async def lookup_with_ticker():
+            ticks = 0
+            lookup = asyncio.ensure_future(
+                lookup_owner_name_async(phonenumbers.parse("+14155556005"))
+            )
+            while not lookup.done():
+                await asyncio.sleep(0.02)
+                ticks += 1
+            return lookup.result(), ticks
+
+        blocker = sqlite3.connect(owner_osint.OWNER_CACHE.path, check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.6, blocker.rollback)
+        release.start()
+        try:
+            with LocalSearchServer() as server:
+                with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                    result, ticks = asyncio.run(lookup_with_ticker())
+        finally:
+            release.join()
+            blocker.close()
+
+        self.assertEqual(result["name"], "John Smith")
+        self.assertGreater(ticks, 10)
+
+    def test_query_variants_run_concurrently(self):
+        with LocalSearchServer(page="<html></html>", delay=0.4) as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                start = time.perf_counter()
+                lookup_owner_name(phonenumbers.parse("+14155556001"))
+                sync_elapsed = time.perf_counter() - start
+                start = time.perf_counter()
+                asyncio.run(lookup_owner_name_async(phonenumbers.parse("+14155556002")))
+                async_elapsed = time.perf_counter() - start
+
+        self.assertEqual(server.request_count, 4)
+        self.assertLess(sync_elapsed, 0.7)
+        self.assertLess(async_elapsed, 0.7)
+
+    def test_votes_count_every_mention_in_query_order(self):
+        def page(*titles):
+            return "".join(f'<a class="result__a" href="#">{title}</a>' for title in titles)
+
+        tally = owner_osint._VoteTally(2)
+        tally.add(1, page("Bruce Wayne", "Bruce Wayne"), True)
+        tally.add(0, page(*(["Alice Walker"] * 5 + ["Bruce Wayne"] * 2)), True)
+        tally.finish()
+        result = owner_osint._build_owner_result(tally.votes, ["a", "b"], tally.failed_queries)
+        self.assertEqual((result["name"], result["confidence"]), ("Alice Walker", "High"))
+        self.assertEqual(result["candidates"], ["Alice Walker", "Bruce Wayne"])
+
+        tally = owner_osint._VoteTally(1)
+        tally.add(0, page("Jane Porter and Jane Porter"), True)
+        tally.finish()
+        self.assertEqual(tally.votes["Jane Porter"], 2)
+
+    def test_deadline_bounds_slow_sources(self):
+        with LocalSearchServer(delay=3.0, delay_match="phone+owner") as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                start = time.perf_counter()
+                result = lookup_owner_name(phonenumbers.parse("+14155556004"), deadline=0.5)
+                elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(result["name"], "John Smith")
+        self.assertEqual(result["confidence"], "Medium")
+        self.assertEqual(result["failed_queries"], 1)
+
+    def test_deadline_misses_are_failures_not_circuit_skips(self):
+        with LocalSearchServer(delay=1.0) as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                sync_result = lookup_owner_name(phonenumbers.parse("+14155556006"), deadline=0.2)
+                async_result = asyncio.run(
+                    lookup_owner_name_async(phonenumbers.parse("+14155556007"), deadline=0.2)
+                )
+
+        for result in (sync_result, async_result):
+            self.assertNotIn("circuit_skipped", result)
+            self.assertEqual(result["failed_queries"], 2)
+            self.assertEqual(result["notes"], "Owner lookup sources were unavailable or timed out.")
+        snapshot = owner_osint.SOURCE_BREAKER.snapshot()
+        self.assertEqual((snapshot["state"], snapshot["skipped"]), ("closed", 0))
+
+    def test_rate_limit_wait_does_not_consume_lookup_deadline(self):
+        numbers = [phonenumbers.parse(f"+1415555{6100 + index}") for index in range(6)]
+
+        async def lookup_all(parsed_numbers):
+            return await asyncio.gather(
+                *(lookup_owner_name_async(parsed, deadline=0.3) for parsed in parsed_numbers)
+            )
+
+        with LocalSearchServer() as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                owner_osint.configure_owner_rate_limit(10, 1)
+                try:
+                    async_results = asyncio.run(lookup_all(numbers[:3]))
+                    with ThreadPoolExecutor(max_workers=3) as executor:
+                        sync_results = list(
+                            executor.map(
+                                lambda parsed: lookup_owner_name(parsed, deadline=0.3),
+                                numbers[3:],
+                            )
+                        )
+                finally:
+                    owner_osint.configure_owner_rate_limit(0)
+
+        for result in async_results + sync_results:
+            self.assertEqual(result["name"], "John Smith")
+            self.assertEqual(result["failed_queries"], 0)
+
+    def test_cancelled_lookup_refunds_reserved_tokens(self):
+        with LocalSearchServer() as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                bucket = owner_osint.configure_owner_rate_limit(1, 1)
+                try:
+                    bucket.reserve()
+                    with self.assertRaises(asyncio.TimeoutError):
+                        asyncio.run(
+                            asyncio.wait_for(
+                                lookup_owner_name_async(phonenumbers.parse("+14155556200")),
+                                0.2,
+                            )
+                        )
+                    delay = bucket.reserve()
+                finally:
+                    owner_osint.configure_owner_rate_limit(0)
+
+        self.assertEqual(server.request_count, 0)
+        self.assertLess(delay, 1.0)
+
+    def test_duplicate_numbers_share_one_lookup_per_engine(self):
+        tasks = [{"number": "+14155557001"} for _ in range(8)]
+        for engine_name in ("threading", "async", "parallel"):
+            owner_osint.OWNER_CACHE.clear()
+            with self.subTest(engine=engine_name):
+                with LocalSearchServer(delay=0.3) as server:
+                    with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                        try:
+                            results = create_engine(engine_name).run(
+                                owner_lookup_worker, tasks, max_workers=8
+                            )
+                        finally:
+                            shutdown_process_pool()
+
+                self.assertTrue(all(item["owner"]["name"] == "John Smith" for item in results))
+                self.assertEqual(server.request_count, 2)
+
+    def test_concurrent_failures_are_shared_but_not_cached(self):
+        tasks = [{"number": "+14155557002"} for _ in range(6)]
+        with LocalSearchServer(delay=0.2, status=404) as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                results = create_engine("threading").run(owner_lookup_worker, tasks, max_workers=6)
+
+        self.assertEqual(server.request_count, 2)
+        self.assertTrue(all(item["owner"]["failed_queries"] == 2 for item in results))
+        self.assertNotIn("14155557002", owner_osint.OWNER_CACHE)
+
+    def test_queries_reuse_keep_alive_connections(self):
+        async def fetch_all(url):
+            client = owner_osint.AsyncHTTPClient()
+            for _ in range(3):
+                await owner_osint._fetch_page_async(url, 4, client)
+            await client.aclose()
+
+        with LocalSearchServer() as server:
+            for _ in range(3):
+                owner_osint._fetch_page(server.url, 4)
+            sync_connections = server.connection_count
+            asyncio.run(fetch_all(server.url))
+
+        self.assertEqual(server.request_count, 6)
+        self.assertEqual(sync_connections, 1)
+        self.assertEqual(server.connection_count, 2)
+
+    def test_async_engine_exceeds_default_thread_cap(self):
+        tasks = [
+            {"number": f"+1415555{2000 + index}", "render_output": False}
+            for index in range(64)
+        ]
+        with LocalSearchServer(delay=0.3) as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                start = time.perf_counter()
+                results = create_engine("async").run(scan_number_worker, tasks, max_workers=64)
+                elapsed = time.perf_counter() - start
+
+        self.assertTrue(all(item["ok"] for item in results))
+        self.assertEqual(results[0]["result"]["owner"]["name"], "John Smith")
+        self.assertGreater(server.peak_active, 32)
+        self.assertLess(elapsed, 5.0)
+
+    def test_hybrid_engine_runs_owner_stage_on_event_loop(self):
+        tasks = [{"number": f"+1415555{3000 + index}", "render_output": False} for index in range(12)]
+        with LocalSearchServer() as server:
+            with mock.patch.object(owner_osint, "SEARCH_URL", server.url):
+                try:
+                    results = create_engine("hybrid").run(scan_number_worker, tasks, max_workers=8)
+                except Exception as exc:
+                    self.skipTest(f"Hybrid engine not supported in this environment: {exc}")
+                    return
+                finally:
+                    shutdown_process_pool()
+
+        self.assertEqual([item["number"] for item in results], [task["number"] for task in tasks])
+        self.assertTrue(all(item["result"]["owner"]["name"] == "John Smith" for item in results))
+        self.assertEqual(server.request_count, 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import phonenumbers
+from phonenumbers import carrier, geocoder, timezone
+
+from modules import prefix_index
+from modules.carrier import get_carrier_info
+from modules.geo import get_geo_info
+from modules.prefix_index import PrefixIndex, build_prefix_index, configure_prefix_index
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "prefix_index.bin")
+        original = prefix_index.prefix_index_config()
+        self.addCleanup(configure_prefix_index, **original)
+        self.addCleanup(self.tempdir.cleanup)
+
+    def test_longest_prefix_match(self):
+        sources = {
+            "geo": {"1": "NANP", "1415": "San Francisco", "14155": "Inner", "44": "UK"},
+            "carrier": {"447": "Mobile UK"},
+            "timezone": {"1": "America/New_York&America/Chicago"},
+            "country_time_zones": {"44": "Europe/London"},
+            "regions": {"GB": "United Kingdom"},
+        }
+        build_prefix_index(self.path, sources=sources)
+        index = PrefixIndex(self.path)
+        self.addCleanup(index.close)
+
+        self.assertEqual(index.lookup("geo", "14155552671"), "Inner")
+        self.assertEqual(index.lookup("geo", "14156552671"), "San Francisco")
+        self.assertEqual(index.lookup("geo", "14165552671"), "NANP")
+        self.assertEqual(index.lookup("geo", "44207946000"), "UK")
+        self.assertIsNone(index.lookup("geo", "33123456789"))
+        self.assertIsNone(index.lookup("carrier", "44207946000"))
+        self.assertEqual(index.time_zones("12125550100"), ("America/New_York", "America/Chicago"))
+        self.assertEqual(index.country_time_zones(44), ("Europe/London",))
+        self.assertEqual(index.region_name("GB"), "United Kingdom")
+
+    def test_indexed_lookups_match_phonenumbers(self):
+        build_prefix_index(self.path)
+        configure_prefix_index(path=self.path, enabled=True)
+        self.assertIsNotNone(prefix_index.get_prefix_index())
+
+        for raw in (
+            "+14155552671",
+            "+442079460000",
+            "+447400123456",
+            "+5491123456789",
+            "+18005550199",
+            "+61412345678",
+            "+12425550100",
+            "+1415555267",
+        ):
+            with self.subTest(number=raw):
+                parsed = phonenumbers.parse(raw)
+                expected = {
+                    "Country": geocoder.country_name_for_number(parsed, "en"),
+                    "Region": geocoder.description_for_number(parsed, "en"),
+                    "Timezone": ", ".join(timezone.time_zones_for_number(parsed)),
+                }
+                self.assertEqual(get_geo_info(parsed), expected)
+                self.assertEqual(
+                    get_carrier_info(parsed),
+                    carrier.name_for_number(parsed, "en") or "Unknown",
+                )
+
+    def test_missing_index_falls_back(self):
+        configure_prefix_index(path=self.path, enabled=True)
+        self.assertIsNone(prefix_index.get_prefix_index())
+        self.assertEqual(prefix_index.prefix_index_status()["state"], "missing")
+        parsed = phonenumbers.parse("+14155552671")
+        self.assertEqual(get_geo_info(parsed)["Region"], "San Francisco, CA")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from core.dataset_tools import count_results, search_results
+from core.query import QueryError, is_structured_query, parse_query, query_count, query_rows
+from core.result_store import ResultStore
+
+
+def _row(index):
+    return {
+        "number": f"+1415555{index:04d}",
+        "carrier": "Unknown" if index % 4 == 0 else "AT&T",
+        "risk": ("High", "Medium", "Low")[index % 3],
+        "voip": index % 5 == 0,
+        "line_type": "VOIP" if index % 5 == 0 else "MOBILE",
+        "owner": {"name": "Unknown" if index % 2 else f"Jane Roe {index}", "confidence": "Low"},
+        "geo": {"Country": "United States" if index < 30 else "Canada", "Region": "CA"},
+    }
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.rows = [_row(index) for index in range(60)]
+        self.store = ResultStore(self.rows)
+
+    def check(self, query, predicate):
+        expected = [index for index, row in enumerate(self.rows) if predicate(row)]
+        self.assertEqual(query_rows(self.store, query), expected, msg=query)
+        self.assertEqual(query_count(self.store, query), len(expected), msg=query)
+
+    def test_field_terms_and_operators(self):
+        self.check(
+            'risk:High voip:true country:"United States" carrier:unknown',
+            lambda row: row["risk"] == "High"
+            and row["voip"]
+            and row["geo"]["Country"] == "United States"
+            and row["carrier"] == "Unknown",
+        )
+        self.check(
+            "risk:High OR line:voip",
+            lambda row: row["risk"] == "High" or row["line_type"] == "VOIP",
+        )
+        self.check(
+            "NOT risk:low -voip:true",
+            lambda row: row["risk"] != "Low" and not row["voip"],
+        )
+        self.check(
+            "(risk:High OR -carrier:AT&T) AND NOT (country:can* OR owner:unknown)",
+            lambda row: (row["risk"] == "High" or row["carrier"] != "AT&T")
+            and not (row["geo"]["Country"] == "Canada" or row["owner"]["name"] == "Unknown"),
+        )
+        self.check(
+            "number:5550 jane",
+            lambda row: "5550" in row["number"] and "jane" in row["owner"]["name"].lower(),
+        )
+        self.check("voip:false OR NOT voip:false", lambda row: True)
+
+    def test_views_and_list_inputs(self):
+        window = self.store.window(30)
+        self.assertEqual(query_count(window, "country:canada"), 30)
+        self.assertEqual(query_rows(window, "-risk:medium", limit=2), [30, 32])
+
+        matches = search_results(self.rows, "risk:High voip:true", limit=3)
+        self.assertEqual(
+            [row["number"] for row in matches],
+            ["+14155550000", "+14155550015", "+14155550030"],
+        )
+        self.assertEqual(count_results(self.rows, "risk:High voip:true"), 4)
+        self.assertEqual(count_results(self.store, "jane roe"), 30)
+
+    def test_detection_and_errors(self):
+        self.assertFalse(is_structured_query("jane roe"))
+        self.assertFalse(is_structured_query("tel:+1-415"))
+        self.assertTrue(is_structured_query("risk:High"))
+        self.assertTrue(is_structured_query("jane OR john"))
+        for query in (
+            "risk:High OR",
+            "(risk:High",
+            'country:"United',
+            "voip:maybe",
+            "AND",
+            'risk:Medium ""',
+            "risk:High OR ' '",
+        ):
+            with self.subTest(query=query), self.assertRaises(QueryError):
+                parse_query(query)
+
+    def test_parentheses_alone_stay_free_text(self):
+        rows = self.rows + [dict(_row(60), carrier="Acme (UK)")]
+        for query in ("acme (uk)", "(uk)", "acme ("):
+            with self.subTest(query=query):
+                self.assertFalse(is_structured_query(query))
+        self.assertEqual(count_results(rows, "acme (uk)"), 1)
+        self.assertEqual(search_results(rows, "acme (uk)")[0]["carrier"], "Acme (UK)")
+
+
+if __name__ == "__main__":
+    unittest.main()
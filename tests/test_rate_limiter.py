@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from engines.factory import create_engine
+from engines.parallel_engine import shutdown_process_pool
+from utils import rate_limiter
+from utils.rate_limiter import (
+    TokenBucket,
+    acquire_rate_limit,
+    acquire_rate_limit_async,
+    configure_rate_limit,
+)
+
+TEST_HOST = "ratelimit.test"
+
+
+def limited_worker(task):
+    acquire_rate_limit(f"https://{TEST_HOST}/html/?q={task}")
+    return time.monotonic()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    def tearDown(self):
+        with rate_limiter._REGISTRY_LOCK:
+            rate_limiter._LIMITERS.pop(TEST_HOST, None)
+
+    def test_bucket_spends_burst_then_spaces_reservations(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_disabled_limit_never_waits(self):
+        configure_rate_limit(TEST_HOST, 0)
+        start = time.perf_counter()
+        for _ in range(50):
+            self.assertEqual(acquire_rate_limit(f"https://{TEST_HOST}/"), 0.0)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_threads_and_async_tasks_share_one_bucket(self):
+        configure_rate_limit(TEST_HOST, 20, 1)
+        stamps = []
+        lock = threading.Lock()
+
+        def run():
+            acquire_rate_limit(f"https://{TEST_HOST}/")
+            with lock:
+                stamps.append(time.monotonic())
+
+        async def run_async():
+            await asyncio.gather(
+                *(acquire_rate_limit_async(f"https://{TEST_HOST}/") for _ in range(5))
+            )
+
+        threads = [threading.Thread(target=run) for _ in range(5)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        asyncio.run(run_async())
+        for thread in threads:
+            thread.join()
+
+        # Ten requests at 20/s with a burst of one need at least 9 * 50ms.
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+    def test_process_pool_workers_share_parent_bucket(self):
+        configure_rate_limit(TEST_HOST, 20, 1)
+        try:
+            stamps = create_engine("parallel").run(limited_worker, list(range(10)), max_workers=2)
+        finally:
+            shutdown_process_pool()
+
+        self.assertEqual(len(stamps), 10)
+        self.assertGreaterEqual(max(stamps) - min(stamps), 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
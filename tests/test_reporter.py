@@ -32,6 +32,24 @@ class TestReporter(unittest.TestCase):
         self.assertIn("[Reporter]", text)
         self.assertIn("Medium risk", text)
 
+    def test_unselected_fields_are_left_out(self):
+        partial = [{"number": "+14155552671", "carrier": "Unknown", "line_type": "MOBILE"}]
+        text = self.reporter.single_scan_terminal(partial[0])
+        self.assertEqual(text, "[Reporter] +14155552671 | Signals: unknown-carrier")
+
+        summary = self.reporter.bulk_terminal_summary(partial, 1, 0, "threading", 0.5, 2)
+        self.assertIn("Top carriers: Unknown(1)", summary)
+        for absent in ("Risk:", "Owner", "Top countries", "Priority numbers"):
+            self.assertNotIn(absent, summary)
+
+        report = self.reporter.generate_markdown_report(partial)
+        self.assertIn("## Top Carriers", report)
+        self.assertNotIn("## Risk Distribution", report)
+        self.assertNotIn("## Owner Resolution", report)
+
+        json_summary = self.reporter.generate_json_summary(partial)
+        self.assertEqual(sorted(json_summary), ["metadata", "top_carriers"])
+
     def test_generate_markdown_report(self):
         report = self.reporter.generate_markdown_report(self.sample_results)
         self.assertIn("# Telecom Recon Report", report)
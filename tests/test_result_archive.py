@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from core.query import query_rows
+from core.result_archive import ResultArchive
+from core.result_store import ResultStore
+
+
+def _row(index):
+    return {
+        "number": f"+1415555{index:04d}",
+        "carrier": "Unknown" if index % 4 == 0 else "AT&T",
+        "risk": ("High", "Medium", "Low")[index % 3],
+        "voip": index % 5 == 0,
+        "line_type": "VOIP" if index % 5 == 0 else "MOBILE",
+        "owner": {"name": "Unknown" if index % 2 else f"Jane Roe {index}", "confidence": "Low"},
+        "geo": {"Country": "United States" if index < 30 else "Canada", "Region": "CA"},
+    }
+
+
+class TestResultArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.sqlite3")
+        self.archive = ResultArchive(self.path)
+        self.rows = [_row(index) for index in range(60)]
+
+        self.archive.begin_run("bulk first.txt")
+        for index, row in enumerate(self.rows[:40]):
+            self.archive.record(row, recorded=1000.0 + index)
+        self.archive.end_run()
+        for index, row in enumerate(self.rows[40:], start=40):
+            self.archive.record(row, recorded=1000.0 + index)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_runs_load_in_order_across_sessions(self):
+        self.archive.flush()
+        reopened = ResultArchive(self.path)
+        runs = reopened.runs()
+        self.assertEqual(
+            [(run["label"], run["results"], run["status"]) for run in runs],
+            [("interactive", 20, ""), ("bulk first.txt", 40, "completed")],
+        )
+        self.assertEqual(reopened.latest_run(), runs[0]["id"])
+        self.assertEqual(list(reopened.load_run(runs[1]["id"])), self.rows[:40])
+
+    def test_interrupted_run_is_closed_with_its_status(self):
+        self.archive.begin_run("bulk second.txt")
+        self.archive.record(self.rows[0], recorded=2000.0)
+        self.archive.flush()
+        self.assertEqual(self.archive.runs(1)[0]["status"], "running")
+
+        self.archive.end_run("aborted")
+        self.archive.record(self.rows[1], recorded=2001.0)
+        runs = self.archive.runs(3)
+        self.assertEqual(
+            [(run["label"], run["status"]) for run in runs],
+            [("interactive", ""), ("bulk second.txt", "aborted"), ("interactive", "")],
+        )
+
+    def test_search_matches_in_memory_queries(self):
+        store = ResultStore(self.rows)
+        for query in (
+            'risk:High voip:true country:"United States" carrier:unknown',
+            "(risk:High OR -carrier:AT&T) AND NOT (country:can* OR owner:unknown)",
+            "number:5550 jane",
+            "line:v?ip OR risk:[!hm]*",
+        ):
+            with self.subTest(query=query):
+                expected = [self.rows[index] for index in reversed(query_rows(store, query))]
+                total, matches = self.archive.search(query, limit=100)
+                self.assertEqual(total, len(expected))
+                self.assertEqual([match["result"] for match in matches], expected)
+
+        total, matches = self.archive.search("jane roe 1", limit=2)
+        self.assertEqual(total, 5)
+        self.assertEqual([match["result"]["number"] for match in matches][0], "+14155550018")
+
+    def test_prune_by_age(self):
+        self.assertEqual(self.archive.prune(0), 60)
+        self.assertEqual(self.archive.stats()["runs"], 0)
+        self.archive.record(self.rows[0])
+        self.assertEqual(self.archive.prune(1), 0)
+        self.assertEqual(self.archive.stats()["results"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+import unittest
+
+from core.result_cache import SCAN_RESULT_CACHE, ResultCache, scan_fingerprint
+from core.scanner import scan_number
+from core.validator import validate_number
+from engines.factory import create_engine
+from engines.workers import scan_number_worker
+
+
+def _result(number, owner_name="John Smith", failed_queries=0):
+    _, parsed = validate_number(number)
+    result = scan_number(parsed, original_number=number, enable_owner_lookup=False).to_dict()
+    result["owner"] = {
+        "name": owner_name,
+        "confidence": "Medium",
+        "method": "DuckDuckGo search-snippet heuristic",
+        "notes": "Heuristic guess from public indexed pages. Verify manually.",
+        "sources": ["a", "b"],
+        "candidates": [owner_name],
+        "failed_queries": failed_queries,
+    }
+    return result
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "scans.sqlite3")
+        _, self.parsed = validate_number("+14155552671")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_entries_are_keyed_by_e164_and_fingerprint(self):
+        cache = ResultCache(self.path, ttl=60)
+        result = _result("+14155552671")
+        self.assertTrue({"geo", "formats", "voip", "reputation", "osint"} <= set(result))
+        cache.put(self.parsed, True, result)
+
+        _, same_number = validate_number("+1 (415) 555-2671")
+        self.assertEqual(cache.get(same_number, True), result)
+        self.assertIsNone(cache.get(self.parsed, False))
+        self.assertNotEqual(scan_fingerprint(True), scan_fingerprint(False))
+
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"]), (1, 1, 1))
+
+    def test_ttl_and_uncacheable_owners(self):
+        cache = ResultCache(self.path, ttl=0.2)
+        self.assertFalse(cache.put(self.parsed, True, _result("+14155552671", "Unknown", 2)))
+        self.assertTrue(cache.put(self.parsed, False, _result("+14155552671", "Unknown", 2)))
+        time.sleep(0.3)
+        self.assertIsNone(cache.get(self.parsed, False))
+        self.assertEqual(cache.purge(expired_only=True), 1)
+
+    def test_workers_serve_repeat_scans_from_cache(self):
+        original = SCAN_RESULT_CACHE.config()
+        self.addCleanup(SCAN_RESULT_CACHE.configure, **original)
+        SCAN_RESULT_CACHE.configure(path=self.path, ttl=60, enabled=True)
+
+        task = {"number": "+14155552671", "enable_owner_lookup": False, "render_output": False}
+        first = scan_number_worker(task)
+        self.assertNotIn("cached", first)
+        for name in ("threading", "async", "hybrid"):
+            item = create_engine(name).run(scan_number_worker, [task], max_workers=1)[0]
+            self.assertTrue(item.get("cached"), msg=name)
+            self.assertEqual(item["result"], first["result"], msg=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
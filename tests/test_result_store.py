@@ -0,0 +1,117 @@
+import unittest
+
+import phonenumbers
+
+from core.dataset_tools import diff_number_history, quick_distribution, search_results, top_risks
+from core.result_store import ResultStore
+from core.scanner import resolve_fields, scan_number
+from reporter.reporter import Reporter
+
+
+def _scan(number, **kwargs):
+    parsed = phonenumbers.parse(number)
+    return scan_number(parsed, original_number=number, enable_owner_lookup=False, **kwargs)
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.results = [
+            _scan(number).to_dict()
+            for number in (
+                "+14155552671",
+                "+442079460000",
+                "+390612345678",
+                "+61412345678",
+                "+14155552671 ext. 12",
+            )
+        ]
+        self.results.append(_scan("+18005550199", fields=resolve_fields("carrier,osint")).to_dict())
+        self.results.append(
+            {
+                "number": "+447911123456",
+                "carrier": "JT",
+                "risk": "High",
+                "voip": True,
+                "owner": {"name": "John Doe", "confidence": "Medium", "circuit_skipped": True},
+                "geo": {"Country": "Guernsey", "Region": "GG"},
+                "notes": ["manual"],
+            }
+        )
+
+    def test_rows_round_trip(self):
+        store = ResultStore(self.results)
+        self.assertEqual(len(store), len(self.results))
+        for expected, actual in zip(self.results, store):
+            self.assertEqual(actual, expected)
+            self.assertEqual(list(actual), list(expected))
+        self.assertEqual(store[-1]["notes"], ["manual"])
+
+        store[-1]["owner"]["name"] = "changed"
+        self.assertEqual(store[-1]["owner"]["name"], "John Doe")
+
+        window = store.window(5)
+        self.assertEqual(len(window), 2)
+        self.assertEqual(window.counts("risk"), {"Unknown": 1, "High": 1})
+
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_categorical_columns_share_codes(self):
+        store = ResultStore(self.results * 3)
+        risk = store.column("risk")
+        self.assertEqual(len(risk.values), len(set(item.get("risk") for item in self.results)))
+        self.assertEqual(store.counts("risk")["High"], 3)
+        self.assertEqual(
+            store.rows_where("risk", lambda value: value == "High"), [6, 13, 20]
+        )
+        self.assertEqual(
+            store.count_where("owner", lambda owner: bool((owner or {}).get("circuit_skipped"))),
+            3,
+        )
+
+    def test_queries_match_list_results(self):
+        store = ResultStore(self.results)
+        for query in ("john", "united", "+44", "medium", "states ca"):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    search_results(store, query), search_results(self.results, query)
+                )
+        self.assertEqual(top_risks(store, limit=4), top_risks(self.results, limit=4))
+        self.assertEqual(quick_distribution(store), quick_distribution(self.results))
+        self.assertEqual(
+            diff_number_history(store, "+14155552671"),
+            diff_number_history(self.results, "+14155552671"),
+        )
+
+        reporter = Reporter()
+        metadata = {"engine": "threading", "workers": 2, "skipped": 1}
+        self.assertEqual(
+            reporter.generate_json_summary(store, metadata=metadata),
+            reporter.generate_json_summary(self.results, metadata=metadata),
+        )
+        self.assertEqual(
+            reporter.bulk_terminal_summary(store, 7, 0, "threading", 0.5, 2),
+            reporter.bulk_terminal_summary(self.results, 7, 0, "threading", 0.5, 2),
+        )
+
+    def test_search_index_tracks_appends(self):
+        store = ResultStore()
+        rows = []
+        for position in range(40):
+            row = dict(self.results[-1], number=f"+4479111{position:05d}")
+            if position % 10 == 0:
+                row["owner"] = {"name": f"Jane Roe {position}", "confidence": "Low"}
+            rows.append(row)
+            store.append(row)
+            self.assertEqual(search_results(store, "roe"), search_results(rows, "roe"))
+
+        self.assertEqual(store.search("0039"), [39])
+        self.assertEqual(store.search("roe 3"), [30])
+        self.assertEqual(store.search("gg jane"), [0, 10, 20, 30])
+        self.assertEqual(store.search("+44", limit=3), [0, 1, 2])
+        self.assertEqual(store.window(15).search("jane roe"), [20, 30])
+        self.assertEqual(store.search("zzz"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
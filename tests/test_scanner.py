@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+import phonenumbers
+
+from core import scanner
+from core.result_cache import SCAN_RESULT_CACHE
+from core.scanner import resolve_fields, scan_number
+from engines.factory import create_engine
+from engines.workers import scan_number_worker
+
+
+class TestFieldSelection(unittest.TestCase):
+    def setUp(self):
+        self.parsed = phonenumbers.parse("+14155552671")
+
+    def test_resolve_fields_adds_dependencies(self):
+        self.assertIsNone(resolve_fields(None))
+        self.assertIsNone(resolve_fields("all"))
+        self.assertEqual(resolve_fields("carrier"), ("carrier",))
+        self.assertEqual(
+            resolve_fields("risk, carrier"),
+            ("carrier", "line_type", "voip", "risk", "owner"),
+        )
+        with self.assertRaises(ValueError):
+            resolve_fields("carrier,bogus")
+
+    def test_partial_scan_computes_number_type_once(self):
+        with mock.patch.object(scanner, "number_type", wraps=scanner.number_type) as counted:
+            full = scan_number(self.parsed, enable_owner_lookup=False)
+        self.assertEqual(counted.call_count, 1)
+
+        with mock.patch.object(scanner, "lookup_owner_name") as lookup:
+            partial = scan_number(self.parsed, fields=resolve_fields("carrier,osint"))
+        lookup.assert_not_called()
+        self.assertEqual(set(partial.to_dict()), {"number", "carrier", "osint"})
+        self.assertEqual(partial.carrier, full.carrier)
+
+        with mock.patch.object(scanner, "number_type") as skipped:
+            scan_number(self.parsed, fields=("osint",))
+        skipped.assert_not_called()
+
+    def test_worker_tasks_honour_fields(self):
+        SCAN_RESULT_CACHE.purge()
+        task = {
+            "number": "+14155552671",
+            "enable_owner_lookup": False,
+            "render_output": True,
+            "fields": resolve_fields("risk"),
+        }
+        for name in ("threading", "hybrid"):
+            item = create_engine(name).run(scan_number_worker, [task], max_workers=1)[0]
+            self.assertEqual(
+                set(item["result"]),
+                {"number", "carrier", "line_type", "voip", "risk", "owner"},
+                msg=name,
+            )
+            self.assertNotIn("OSINT Links", item["output"], msg=name)
+        self.assertEqual(SCAN_RESULT_CACHE.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
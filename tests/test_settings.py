@@ -2,7 +2,7 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from core.settings import FrameworkSettings
+from core.settings import PROFILE_PRESETS, FrameworkSettings
 
 
 class TestFrameworkSettings(unittest.TestCase):
@@ -16,6 +16,14 @@ class TestFrameworkSettings(unittest.TestCase):
         self.assertEqual(settings.bulk_output_mode, "compact")
         self.assertTrue(settings.runbook_stop_on_error)
 
+    def test_owner_rate_limits_cover_profile_workers(self):
+        for name in PROFILE_PRESETS:
+            settings = FrameworkSettings()
+            settings.apply_profile(name)
+            with self.subTest(profile=name):
+                self.assertGreaterEqual(settings.owner_rate_burst, 2 * settings.max_workers)
+                self.assertGreaterEqual(settings.owner_rate_limit, settings.max_workers / 2)
+
     def test_save_and_load_roundtrip(self):
         settings = FrameworkSettings()
         settings.apply_profile("speed")
@@ -0,0 +1,54 @@
+import unittest
+
+from core.result_cache import SCAN_RESULT_CACHE
+from core.stage_metrics import StageTimingCollector
+from engines.factory import create_engine
+from engines.workers import scan_number_worker
+
+
+class TestStageMetrics(unittest.TestCase):
+    def test_percentiles_and_share(self):
+        collector = StageTimingCollector()
+        for index in range(1, 101):
+            collector.record({"geo": index / 1000.0, "carrier": 0.001})
+
+        summary = collector.summary()
+        self.assertEqual(summary["records"], 100)
+        geo = summary["stages"][0]
+        self.assertEqual(geo["stage"], "geo")
+        self.assertAlmostEqual(geo["p50"], 0.0505, places=4)
+        self.assertAlmostEqual(geo["p99"], 0.09901, places=4)
+        self.assertAlmostEqual(geo["share"] + summary["stages"][1]["share"], 1.0)
+
+        collector.clear()
+        self.assertEqual(collector.summary()["stages"], [])
+
+    def test_reservoir_stays_bounded(self):
+        collector = StageTimingCollector(sample_size=10, seed=1)
+        for _ in range(500):
+            collector.record({"owner": 0.5})
+        row = collector.summary()["stages"][0]
+        self.assertEqual(row["count"], 500)
+        self.assertAlmostEqual(row["total_seconds"], 250.0)
+        self.assertEqual(len(collector._samples["owner"]), 10)
+
+    def test_workers_return_stage_timings(self):
+        task = {
+            "number": "+14155552671",
+            "enable_owner_lookup": False,
+            "render_output": False,
+            "collect_timings": True,
+        }
+        for name in ("threading", "async"):
+            SCAN_RESULT_CACHE.purge()
+            result = create_engine(name).run(scan_number_worker, [task], max_workers=1)[0]
+            self.assertIn("geo", result["timings"], msg=name)
+            self.assertIn("risk", result["timings"], msg=name)
+            self.assertNotIn("owner", result["timings"], msg=name)
+
+        untimed = scan_number_worker(dict(task, collect_timings=False))
+        self.assertNotIn("timings", untimed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
-from core.validator import validate_number
+from core.validator import validate_number, validate_numbers, validation_summary
+from engines.workers import scan_number_worker
 
 
 class TestValidator(unittest.TestCase):
@@ -19,6 +20,50 @@ class TestValidator(unittest.TestCase):
         self.assertFalse(valid)
         self.assertIsNone(parsed)
 
+    def test_validate_with_default_region(self):
+        self.assertFalse(validate_number("020 7946 0000")[0])
+        valid, parsed = validate_number("020 7946 0000", "GB")
+        self.assertTrue(valid)
+        self.assertEqual(parsed.country_code, 44)
+
+    def test_batch_validation_prefilters_and_groups(self):
+        numbers = [
+            "+14155552671",
+            "N/A",
+            "",
+            "020 7946 0000",
+            "+1 415 555 2671",
+            "+1234",
+            "+14155552671",
+        ]
+        results = validate_numbers(numbers, default_region="GB")
+        self.assertEqual(
+            [item.reason for item in results],
+            ["", "junk", "empty", "", "", "invalid", ""],
+        )
+        self.assertIs(results[0].parsed, results[-1].parsed)
+
+        summary = validation_summary(results, samples=1)
+        self.assertEqual((summary["total"], summary["valid"]), (7, 4))
+        self.assertEqual(summary["rejected"], {"junk": 1, "empty": 1, "invalid": 1})
+        self.assertEqual(summary["rejected_samples"], [("N/A", "junk")])
+        self.assertEqual(
+            [(item["region"], item["count"]) for item in summary["countries"]],
+            [("US", 3), ("GB", 1)],
+        )
+
+    def test_workers_reuse_prevalidated_number(self):
+        (item,) = validate_numbers(["020 7946 0000"], default_region="GB")
+        task = {
+            "number": item.number,
+            "parsed": item.parsed,
+            "enable_owner_lookup": False,
+            "render_output": False,
+        }
+        result = scan_number_worker(task)
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["result"]["formats"]["E164"], "+442079460000")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -21,53 +21,65 @@ def format_output(result_or_number, geo=None, carrier=None, voip=None, risk=None
             osint=osint,
         )
 
+    selected = result.fields
+
+    def show(name):
+        return selected is None or name in selected
+
     out = []
     out.append(f"{CYAN}Scan Result for {result.number}{RESET}")
     out.append("-" * 40)
 
-    for k, v in result.geo.items():
-        out.append(f"{k:12}: {v}")
+    if show("geo"):
+        for k, v in result.geo.items():
+            out.append(f"{k:12}: {v}")
 
-    out.append(f"Carrier     : {result.carrier}")
-    out.append(f"Line Type   : {result.line_type}")
-    out.append(f"VoIP        : {'Yes' if result.voip else 'No'}")
-    out.append(f"Risk Level  : {result.risk}")
+    if show("carrier"):
+        out.append(f"Carrier     : {result.carrier}")
+    if show("line_type"):
+        out.append(f"Line Type   : {result.line_type}")
+    if show("voip"):
+        out.append(f"VoIP        : {'Yes' if result.voip else 'No'}")
+    if show("risk"):
+        out.append(f"Risk Level  : {result.risk}")
 
-    if result.formats:
+    if show("formats") and result.formats:
         out.append("\nNumber Formats:")
         for fmt, value in result.formats.items():
             out.append(f" {fmt:12}: {value}")
 
-    owner = result.owner or {}
-    out.append("\nOwner OSINT:")
-    out.append(f" Name       : {owner.get('name', 'Unknown')}")
-    out.append(f" Confidence : {owner.get('confidence', 'Low')}")
+    if show("owner"):
+        owner = result.owner or {}
+        out.append("\nOwner OSINT:")
+        out.append(f" Name       : {owner.get('name', 'Unknown')}")
+        out.append(f" Confidence : {owner.get('confidence', 'Low')}")
 
-    method = owner.get("method")
-    if method:
-        out.append(f" Method     : {method}")
+        method = owner.get("method")
+        if method:
+            out.append(f" Method     : {method}")
 
-    candidates = owner.get("candidates", [])
-    if candidates:
-        out.append(f" Candidates : {', '.join(candidates)}")
+        candidates = owner.get("candidates", [])
+        if candidates:
+            out.append(f" Candidates : {', '.join(candidates)}")
 
-    notes = owner.get("notes")
-    if notes:
-        out.append(f" Notes      : {notes}")
+        notes = owner.get("notes")
+        if notes:
+            out.append(f" Notes      : {notes}")
 
-    owner_sources = owner.get("sources", [])
-    if owner_sources:
-        out.append(" Sources:")
-        for source in owner_sources:
-            out.append(f"  - {source}")
+        owner_sources = owner.get("sources", [])
+        if owner_sources:
+            out.append(" Sources:")
+            for source in owner_sources:
+                out.append(f"  - {source}")
 
-    if result.reputation:
+    if show("reputation") and result.reputation:
         out.append("\nReputation Links:")
         for name, link in result.reputation.items():
             out.append(f" {name:10}: {link}")
 
-    out.append("\nOSINT Links:")
-    for name, link in result.osint.items():
-        out.append(f" {name:10}: {link}")
+    if show("osint"):
+        out.append("\nOSINT Links:")
+        for name, link in result.osint.items():
+            out.append(f" {name:10}: {link}")
 
     return "\n".join(out)
@@ -0,0 +1,281 @@
+import asyncio
+import base64
+import ssl
+import time
+import weakref
+from collections import deque
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+import requests
+
+from utils.http_session import get_session, http_pool_config
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_CLIENTS = weakref.WeakSet()
+
+
+class AsyncHTTPError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncResponse:
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode(self._charset(), errors="replace")
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise AsyncHTTPError(f"HTTP {self.status} for {self.url}", status=self.status)
+
+    def _charset(self):
+        content_type = self.headers.get("content-type", "")
+        for part in content_type.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip("\"'")
+        return "utf-8"
+
+
+def proxy_for(url):
+    # Same sources as requests: HTTP(S)_PROXY / ALL_PROXY and NO_PROXY.
+    parts = urlsplit(url)
+    proxies = getproxies()
+    proxy = proxies.get(parts.scheme) or proxies.get("all")
+    if not proxy or proxy_bypass(parts.hostname or ""):
+        return None
+    return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def _proxy_headers(proxy):
+    if not proxy.username:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+class AsyncHTTPClient:
+    def __init__(self, max_redirects=5):
+        self.max_redirects = max_redirects
+        self._ssl_context = None
+        # Idle keep-alive connections per event loop, keyed by (scheme, host, port).
+        self._pools = weakref.WeakKeyDictionary()
+        _CLIENTS.add(self)
+
+    async def get(self, url, headers=None, timeout=4):
+        proxy = proxy_for(url)
+        if proxy is not None and proxy.scheme != "http":
+            # SOCKS and TLS proxies go through requests on a worker thread.
+            return await self._get_with_requests(url, headers or {}, timeout)
+        try:
+            return await asyncio.wait_for(self._get(url, headers or {}), timeout)
+        except asyncio.TimeoutError as exc:
+            raise AsyncHTTPError(f"Timed out after {timeout}s: {url}") from exc
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            raise AsyncHTTPError(f"Request failed for {url}: {exc}") from exc
+
+    async def _get(self, url, headers):
+        for _ in range(self.max_redirects + 1):
+            response = await self._request(url, headers)
+            location = response.headers.get("location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+        raise AsyncHTTPError(f"Too many redirects for {url}")
+
+    async def _get_with_requests(self, url, headers, timeout):
+        loop = asyncio.get_running_loop()
+
+        def fetch():
+            return get_session().get(url, headers=headers, timeout=timeout)
+
+        try:
+            response = await loop.run_in_executor(None, fetch)
+        except requests.RequestException as exc:
+            raise AsyncHTTPError(f"Request failed for {url}: {exc}") from exc
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        return AsyncResponse(response.url, response.status_code, headers, response.content)
+
+    async def _request(self, url, headers):
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"}:
+            raise AsyncHTTPError(f"Unsupported URL scheme: {url}")
+
+        secure = parts.scheme == "https"
+        host = parts.hostname or ""
+        port = parts.port or (443 if secure else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        proxy = proxy_for(url)
+        if proxy is not None and not secure:
+            # Plain HTTP goes to the proxy with an absolute-form target.
+            target = f"http://{parts.netloc}{target}"
+            headers = {**_proxy_headers(proxy), **headers}
+        key = (parts.scheme, host, port, proxy.netloc if proxy else None)
+        request = self._build_request(parts.netloc, target, headers)
+
+        while True:
+            connection = self._checkout(key)
+            reused = connection is not None
+            if connection is None:
+                connection = await self._connect(host, port, secure, proxy)
+
+            reader, writer = connection
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, response_headers = await self._read_head(reader)
+                body, reusable = await self._read_body(reader, status, response_headers)
+            except (OSError, asyncio.IncompleteReadError, AsyncHTTPError):
+                writer.close()
+                if reused:
+                    # The server dropped an idle keep-alive socket; dial fresh.
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            if reusable and response_headers.get("connection", "").lower() != "close":
+                self._checkin(key, connection)
+            else:
+                await self._close(writer)
+            return AsyncResponse(url, status, response_headers, body)
+
+    async def _connect(self, host, port, secure, proxy):
+        if proxy is None:
+            return await asyncio.open_connection(
+                host,
+                port,
+                ssl=self._get_ssl_context() if secure else None,
+            )
+
+        reader, writer = await asyncio.open_connection(proxy.hostname, proxy.port or 80)
+        if not secure:
+            return reader, writer
+
+        try:
+            lines = [f"CONNECT {host}:{port} HTTP/1.1", f"Host: {host}:{port}"]
+            lines.extend(f"{key}: {value}" for key, value in _proxy_headers(proxy).items())
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            status, _ = await self._read_head(reader)
+            if status != 200:
+                raise AsyncHTTPError(
+                    f"Proxy CONNECT to {host}:{port} failed: HTTP {status}", status=status
+                )
+            await writer.start_tls(self._get_ssl_context(), server_hostname=host)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    def _loop_pool(self):
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = {}
+            self._pools[loop] = pool
+        return pool
+
+    def _checkout(self, key):
+        idle = self._loop_pool().get(key)
+        idle_timeout = http_pool_config()["idle_timeout"]
+        now = time.monotonic()
+        while idle:
+            reader, writer, last_used = idle.pop()
+            stale = idle_timeout > 0 and now - last_used > idle_timeout
+            if stale or writer.is_closing() or reader.at_eof():
+                writer.close()
+                continue
+            return reader, writer
+        return None
+
+    def _checkin(self, key, connection):
+        idle = self._loop_pool().setdefault(key, deque())
+        if len(idle) >= http_pool_config()["pool_size"]:
+            connection[1].close()
+            return
+        idle.append((*connection, time.monotonic()))
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        pool = self._pools.pop(loop, None) or {}
+        writers = [writer for idle in pool.values() for _, writer, _ in idle]
+        for writer in writers:
+            await self._close(writer)
+
+    @staticmethod
+    async def _close(writer):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+    def _get_ssl_context(self):
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    @staticmethod
+    def _build_request(netloc, target, headers):
+        lines = [f"GET {target} HTTP/1.1", f"Host: {netloc}"]
+        merged = {"Accept-Encoding": "identity", "Connection": "keep-alive"}
+        merged.update(headers)
+        for key, value in merged.items():
+            lines.append(f"{key}: {value}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    @staticmethod
+    async def _read_head(reader):
+        status_line = (await reader.readline()).decode("latin-1").strip()
+        pieces = status_line.split(" ", 2)
+        if len(pieces) < 2 or not pieces[0].startswith("HTTP/"):
+            raise AsyncHTTPError(f"Malformed status line: {status_line!r}")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in {"\r\n", "\n", ""}:
+                break
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return int(pieces[1]), headers
+
+    @staticmethod
+    async def _read_body(reader, status, headers):
+        if status in {204, 304}:
+            return b"", True
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = (await reader.readline()).decode("latin-1").strip()
+                size = int(size_line.split(";", 1)[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                        pass
+                    return b"".join(chunks), True
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+
+        length = headers.get("content-length")
+        if length is not None:
+            return await reader.readexactly(int(length)), True
+        return await reader.read(), False
+
+
+async def close_pooled_connections():
+    for client in list(_CLIENTS):
+        await client.aclose()
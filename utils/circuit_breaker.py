@@ -0,0 +1,129 @@
+import time
+
+from utils.shared_state import new_shared_state
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+STATES = (CLOSED, OPEN, HALF_OPEN)
+
+_MODE = 0
+_TRIPS = 1
+_SKIPPED = 2
+_OPENED_AT = 3
+_PROBE = 4
+_COUNT = 5
+_HEAD = 6
+_OUTCOMES = 7
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold=0.5,
+        window=20,
+        min_requests=6,
+        cooldown_seconds=30.0,
+        clock=time.monotonic,
+        state=None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.min_requests = max(1, int(min_requests))
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self.window = max(self.min_requests, int(window))
+        # Everything that changes lives in one flat array so pool workers can
+        # share a breaker the same way they share rate limiters.
+        self.state = state if state is not None else new_shared_state(_OUTCOMES + self.window)
+
+    def use_state(self, state):
+        self.state = state
+
+    def allow(self):
+        with self.state.get_lock():
+            mode = self._mode()
+            if mode == OPEN and self.clock() - self.state[_OPENED_AT] >= self.cooldown_seconds:
+                mode = self._set_mode(HALF_OPEN)
+                self.state[_PROBE] = 0
+
+            if mode == CLOSED:
+                return True
+            if mode == HALF_OPEN and not self.state[_PROBE]:
+                # Let exactly one probe through; its outcome decides the state.
+                self.state[_PROBE] = 1
+                return True
+
+            self.state[_SKIPPED] += 1
+            return False
+
+    def record(self, success):
+        with self.state.get_lock():
+            if self._mode() == HALF_OPEN:
+                self.state[_PROBE] = 0
+                if success:
+                    self._set_mode(CLOSED)
+                    self._clear_outcomes()
+                else:
+                    self._trip()
+                return
+
+            head = int(self.state[_HEAD])
+            self.state[_OUTCOMES + head] = 1.0 if success else 0.0
+            self.state[_HEAD] = (head + 1) % self.window
+            self.state[_COUNT] = min(self.window, self.state[_COUNT] + 1)
+            total = int(self.state[_COUNT])
+            if self._mode() == CLOSED and total >= self.min_requests:
+                if self._failures() / total >= self.failure_threshold:
+                    self._trip()
+
+    def release(self):
+        with self.state.get_lock():
+            if self._mode() == HALF_OPEN:
+                self.state[_PROBE] = 0
+
+    def reset(self):
+        with self.state.get_lock():
+            self._set_mode(CLOSED)
+            self.state[_TRIPS] = 0
+            self.state[_SKIPPED] = 0
+            self.state[_PROBE] = 0
+            self._clear_outcomes()
+
+    def snapshot(self):
+        with self.state.get_lock():
+            mode = self._mode()
+            total = int(self.state[_COUNT])
+            retry_in = 0.0
+            if mode == OPEN:
+                elapsed = self.clock() - self.state[_OPENED_AT]
+                retry_in = max(0.0, self.cooldown_seconds - elapsed)
+            return {
+                "state": mode,
+                "trips": int(self.state[_TRIPS]),
+                "skipped": int(self.state[_SKIPPED]),
+                "error_rate": self._failures() / total if total else 0.0,
+                "retry_in": retry_in,
+            }
+
+    def _mode(self):
+        return STATES[int(self.state[_MODE])]
+
+    def _set_mode(self, mode):
+        self.state[_MODE] = STATES.index(mode)
+        return mode
+
+    def _failures(self):
+        # Slots fill from zero after every clear, so the first COUNT slots
+        # always hold the current window.
+        total = int(self.state[_COUNT])
+        return sum(1 for index in range(total) if not self.state[_OUTCOMES + index])
+
+    def _clear_outcomes(self):
+        self.state[_COUNT] = 0
+        self.state[_HEAD] = 0
+
+    def _trip(self):
+        self._set_mode(OPEN)
+        self.state[_TRIPS] += 1
+        self.state[_OPENED_AT] = self.clock()
+        self._clear_outcomes()
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 32
+DEFAULT_IDLE_TIMEOUT = 30.0
+SWEEP_FLOOR = 0.05
+SWEEP_DISABLED_INTERVAL = 5.0
+
+_CONFIG_LOCK = threading.Lock()
+_CONFIG = {"pool_size": DEFAULT_POOL_SIZE, "idle_timeout": DEFAULT_IDLE_TIMEOUT}
+_GENERATION = 0
+_SESSION_LOCK = threading.Lock()
+_STATE = {"session": None, "pid": None, "generation": None, "last_used": 0.0, "sweeper": None}
+
+
+def configure_http_pool(pool_size=None, idle_timeout=None):
+    global _GENERATION
+
+    with _CONFIG_LOCK:
+        if pool_size is not None:
+            _CONFIG["pool_size"] = max(1, int(pool_size))
+        if idle_timeout is not None:
+            _CONFIG["idle_timeout"] = max(0.0, float(idle_timeout))
+        # The shared session is rebuilt with the new pool size on next use.
+        _GENERATION += 1
+
+
+def http_pool_config():
+    with _CONFIG_LOCK:
+        return dict(_CONFIG)
+
+
+def _new_session(pool_size):
+    session = requests.Session()
+    # pool_maxsize caps the keep-alive sockets kept per host; requests beyond
+    # it still run, on connections that are closed afterwards.
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    config = http_pool_config()
+    pid = os.getpid()
+
+    with _SESSION_LOCK:
+        session = _STATE["session"]
+        if _STATE["pid"] != pid:
+            # A forked child must not share sockets or the sweeper with its
+            # parent; the inherited session is dropped without closing it.
+            session = None
+            _STATE["sweeper"] = None
+        elif session is not None and _STATE["generation"] != _GENERATION:
+            session.close()
+            session = None
+
+        if session is None:
+            session = _new_session(config["pool_size"])
+            _STATE.update(session=session, pid=pid, generation=_GENERATION)
+        _STATE["last_used"] = time.monotonic()
+
+        if _STATE["sweeper"] is None:
+            sweeper = threading.Thread(target=_sweep, name="http-pool-sweeper", daemon=True)
+            _STATE["sweeper"] = sweeper
+            sweeper.start()
+    return session
+
+
+def _sweep():
+    # Keep-alive sockets are closed once the session has been idle for
+    # idle_timeout, whether or not any thread asks for it again.
+    while True:
+        idle_timeout = http_pool_config()["idle_timeout"]
+        if idle_timeout <= 0:
+            time.sleep(SWEEP_DISABLED_INTERVAL)
+            continue
+        time.sleep(max(SWEEP_FLOOR, idle_timeout / 2))
+
+        with _SESSION_LOCK:
+            if _STATE["sweeper"] is not threading.current_thread():
+                return
+            session = _STATE["session"]
+            if session is not None and time.monotonic() - _STATE["last_used"] > idle_timeout:
+                session.close()
+
+
+def close_http_sessions():
+    with _SESSION_LOCK:
+        session = _STATE["session"]
+        if session is not None and _STATE["pid"] == os.getpid():
+            session.close()
+        _STATE.update(session=None, pid=None, generation=None)
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+from utils.shared_state import new_shared_state
+
+_RATE = 0
+_CAPACITY = 1
+_TOKENS = 2
+_UPDATED = 3
+
+
+class TokenBucket:
+    def __init__(self, rate=0.0, capacity=1.0, state=None, clock=time.monotonic):
+        self.clock = clock
+        self.state = state if state is not None else new_shared_state(4)
+        if state is None:
+            self.configure(rate, capacity)
+
+    def configure(self, rate, capacity=None):
+        rate = max(0.0, float(rate or 0.0))
+        capacity = max(1.0, float(capacity or max(1.0, rate)))
+        with self.state.get_lock():
+            self.state[_RATE] = rate
+            self.state[_CAPACITY] = capacity
+            self.state[_TOKENS] = capacity
+            self.state[_UPDATED] = self.clock()
+
+    @property
+    def rate(self):
+        return self.state[_RATE]
+
+    @property
+    def capacity(self):
+        return self.state[_CAPACITY]
+
+    def reserve(self):
+        with self.state.get_lock():
+            rate = self.state[_RATE]
+            if rate <= 0:
+                return 0.0
+
+            now = self.clock()
+            elapsed = max(0.0, now - self.state[_UPDATED])
+            tokens = min(self.state[_CAPACITY], self.state[_TOKENS] + elapsed * rate)
+            tokens -= 1.0
+            self.state[_TOKENS] = tokens
+            self.state[_UPDATED] = now
+
+        if tokens >= 0:
+            return 0.0
+        return -tokens / rate
+
+    def refund(self):
+        with self.state.get_lock():
+            if self.state[_RATE] > 0:
+                self.state[_TOKENS] = min(self.state[_CAPACITY], self.state[_TOKENS] + 1.0)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # A cancelled waiter never sends its request; its token goes
+                # back so the debt does not carry over to later callers.
+                self.refund()
+                raise
+        return delay
+
+
+_REGISTRY_LOCK = threading.Lock()
+_LIMITERS = {}
+_STATE_VERSION = 0
+
+
+def _host_for(url_or_host):
+    value = str(url_or_host or "")
+    if "://" in value:
+        value = urlsplit(value).hostname or ""
+    return value.lower()
+
+
+def configure_rate_limit(url_or_host, rate, burst=None):
+    global _STATE_VERSION
+
+    host = _host_for(url_or_host)
+    with _REGISTRY_LOCK:
+        bucket = _LIMITERS.get(host)
+        if bucket is None:
+            # New hosts change the shared state handed to worker processes,
+            # so pools created before this point have to be recycled.
+            _LIMITERS[host] = TokenBucket(rate, burst)
+            _STATE_VERSION += 1
+            return _LIMITERS[host]
+    bucket.configure(rate, burst)
+    return bucket
+
+
+def get_rate_limiter(url_or_host):
+    host = _host_for(url_or_host)
+    with _REGISTRY_LOCK:
+        bucket = _LIMITERS.get(host)
+    if bucket is None or bucket.rate <= 0:
+        return None
+    return bucket
+
+
+def reserve_rate_limit(url):
+    bucket = get_rate_limiter(url)
+    if bucket is None:
+        return 0.0
+    return bucket.reserve()
+
+
+def refund_rate_limit(url):
+    bucket = get_rate_limiter(url)
+    if bucket is not None:
+        bucket.refund()
+
+
+def acquire_rate_limit(url):
+    bucket = get_rate_limiter(url)
+    if bucket is None:
+        return 0.0
+    return bucket.acquire()
+
+
+async def acquire_rate_limit_async(url):
+    bucket = get_rate_limiter(url)
+    if bucket is None:
+        return 0.0
+    return await bucket.acquire_async()
+
+
+def rate_limit_snapshot():
+    with _REGISTRY_LOCK:
+        return {host: (bucket.rate, bucket.capacity) for host, bucket in _LIMITERS.items()}
+
+
+def limiter_state_version():
+    return _STATE_VERSION
+
+
+def shared_limiter_state():
+    with _REGISTRY_LOCK:
+        return {host: bucket.state for host, bucket in _LIMITERS.items()}
+
+
+def install_shared_limiters(state):
+    with _REGISTRY_LOCK:
+        _LIMITERS.clear()
+        for host, shared in (state or {}).items():
+            _LIMITERS[host] = TokenBucket(state=shared)
@@ -0,0 +1,26 @@
+import multiprocessing
+import threading
+
+
+class LocalState:
+    def __init__(self, size):
+        self.values = [0.0] * size
+        self._lock = threading.RLock()
+
+    def get_lock(self):
+        return self._lock
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __setitem__(self, index, value):
+        self.values[index] = value
+
+
+def new_shared_state(size):
+    # Shared memory lets pool workers read and update the same values; where
+    # it is unavailable the state stays local to the process.
+    try:
+        return multiprocessing.Array("d", size)
+    except (ImportError, OSError):
+        return LocalState(size)
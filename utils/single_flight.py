@@ -0,0 +1,59 @@
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    def __init__(self):
+        self._reset()
+        # A lock held by another thread at fork time would never be released
+        # in the child.
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do(self, key, factory):
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = loop.create_task(factory())
+            calls[key] = task
+            task.add_done_callback(lambda _: calls.pop(key, None))
+
+        # Shield so one cancelled waiter does not cancel the lookup for all.
+        return await asyncio.shield(task), shared
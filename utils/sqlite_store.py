@@ -0,0 +1,50 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SQLiteConnections:
+    def __init__(self, path, schema):
+        self.path = str(path)
+        self.schema = schema
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._generation = 0
+
+    def set_path(self, path):
+        with self._lock:
+            if str(path) != self.path:
+                self.path = str(path)
+                self._generation += 1
+
+    def connection(self):
+        with self._lock:
+            # sqlite3 connections must never cross a fork or a thread.
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._local = threading.local()
+            local = self._local
+            generation = self._generation
+            path = self.path
+
+        connection = getattr(local, "connection", None)
+        if connection is not None and local.generation == generation:
+            return connection
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self.schema)
+        local.connection = connection
+        local.generation = generation
+        return connection
+
+    def execute(self, sql, params=(), commit=False):
+        connection = self.connection()
+        if not commit:
+            return connection.execute(sql, params)
+        with connection:
+            return connection.execute(sql, params)